@@ -2,8 +2,12 @@
 Entry point для запуска модуля через python -m src
 """
 
+import multiprocessing
+
 from .file_searcher import main
 
 if __name__ == "__main__":
+    # Процессы пула GPU движка в собранном PyInstaller exe запускаются через тот же exe
+    multiprocessing.freeze_support()
     main()
 
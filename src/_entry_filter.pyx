@@ -0,0 +1,117 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Предикаты имени и метаданных для FileSearchEngine, компилируемые Cython
+
+Собирается на лету через pyximport при импорте file_searcher.
+Если Cython недоступен - используются Python версии match_name и match_entry из file_searcher.
+"""
+
+import os
+from libc.errno cimport errno
+
+cdef extern from *:
+    """
+    #ifndef _WIN32
+    #include <sys/stat.h>
+    /* stat() без создания os.stat_result; mtime считается как в CPython: sec + nsec * 1e-9 */
+    static int entry_filter_stat(const char *path, long long *size, double *mtime) {
+        struct stat st;
+        if (stat(path, &st) != 0)
+            return -1;
+        *size = (long long)st.st_size;
+    #if defined(__APPLE__)
+        *mtime = (double)st.st_mtimespec.tv_sec + st.st_mtimespec.tv_nsec * 1e-9;
+    #else
+        *mtime = (double)st.st_mtim.tv_sec + st.st_mtim.tv_nsec * 1e-9;
+    #endif
+        return 0;
+    }
+    #define ENTRY_FILTER_NATIVE_STAT 1
+    #else
+    /* В Windows DirEntry.stat() берет данные из результатов чтения директории - он быстрее */
+    static int entry_filter_stat(const char *path, long long *size, double *mtime) {
+        return -1;
+    }
+    #define ENTRY_FILTER_NATIVE_STAT 0
+    #endif
+    """
+    int entry_filter_stat(const char *path, long long *size, double *mtime) nogil
+    int ENTRY_FILTER_NATIVE_STAT
+
+_DirEntry = os.DirEntry
+
+
+cpdef bint match_name(str filename, object name_filter, object name_regex,
+                      frozenset extensions):
+    """
+    Проверяет имя и расширение файла (без системных вызовов)
+
+    extensions - множество расширений в нижнем регистре без точки или None.
+    """
+    cdef str file_ext
+    cdef Py_ssize_t dot
+
+    # Проверка имени по regex
+    if name_regex is not None and name_regex.search(filename) is None:
+        return False
+
+    # Проверка wildcard имени
+    if name_filter is not None and name_filter.match(filename) is None:
+        return False
+
+    # Проверка расширения как в os.path.splitext: ведущие точки имени не считаются
+    if extensions is not None:
+        dot = filename.rfind('.')
+        if dot <= 0 or (filename[0] == '.' and not filename[:dot].lstrip('.')):
+            file_ext = ''
+        else:
+            file_ext = filename[dot + 1:].lower()
+        if file_ext not in extensions:
+            return False
+
+    return True
+
+
+cpdef object match_entry(object entry, object name_filter, object name_regex,
+                         frozenset extensions, double min_size, double max_size,
+                         double modified_after, double modified_before):
+    """
+    Проверяет имя, размер и дату файла
+
+    Границы без фильтра передаются как 0 / inf / -inf, даты - как timestamp,
+    extensions - множество расширений в нижнем регистре без точки или None.
+
+    Returns:
+        (размер, mtime) если файл подходит, иначе None
+    """
+    cdef long long file_size
+    cdef double mtime
+    cdef bytes path
+    cdef const char *c_path
+    cdef int status
+
+    if ((name_filter is not None or name_regex is not None or extensions is not None)
+            and not match_name(entry.name, name_filter, name_regex, extensions)):
+        return None
+
+    # Получение метаданных (имя и расширение уже проверены без системных вызовов).
+    # Для обычного DirEntry в POSIX - stat() из C без GIL и без объекта os.stat_result
+    if ENTRY_FILTER_NATIVE_STAT and type(entry) is _DirEntry:
+        path = os.fsencode(entry.path)
+        c_path = path
+        with nogil:
+            status = entry_filter_stat(c_path, &file_size, &mtime)
+        if status != 0:
+            raise OSError(errno, os.strerror(errno), entry.path)
+    else:
+        stat = entry.stat()
+        file_size = stat.st_size
+        mtime = stat.st_mtime
+
+    # Проверка размера и даты модификации
+    if file_size < min_size or file_size > max_size:
+        return None
+    if mtime < modified_after or mtime > modified_before:
+        return None
+
+    return (file_size, mtime)
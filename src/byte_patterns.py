@@ -0,0 +1,163 @@
+"""
+Общие проверки регулярок для поиска по UTF-8 байтам
+Используются FileSearchEngine и HybridSearchEngine: паттерн, который на байтах
+находит то же, что на тексте, ищется без декодирования файла
+"""
+
+import re
+import functools
+from typing import Optional
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+REPEAT_OPS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+# Якоря, которые на байтах и на тексте ведут себя одинаково
+BYTES_SAFE_ANCHORS = frozenset((sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING,
+                                sre_parse.AT_END, sre_parse.AT_END_STRING))
+# ASCII буквы, которые str паттерн с IGNORECASE сопоставляет и с не-ASCII символами
+UNICODE_FOLDED_ASCII = frozenset(map(ord, 'iksIKS'))
+
+
+@functools.lru_cache(maxsize=1024)
+def utf8_bytes_compatible(pattern: str, flags: int = 0) -> bool:
+    """
+    Можно ли искать паттерн re по UTF-8 байтам вместо декодированного текста
+
+    Да, если он собран только из литералов, групп, альтернатив, повторов
+    и якорей ^ $ \\A \\Z: классы, '.', \\w, \\b и т.п. на байтах совпадают
+    с одним байтом, а не с символом. Повтор одиночного не-ASCII символа
+    (я+) на байтах повторял бы только его последний байт.
+    Без учета регистра bytes паттерн сравнивает только ASCII буквы, поэтому
+    не-ASCII литералы и буквы i, k, s (в тексте совпадают с İ, ı, K, ſ) запрещены.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return False
+    ignore_case = bool(parsed.state.flags & re.IGNORECASE)
+
+    def compatible(nodes) -> bool:
+        for op, av in nodes:
+            if op is sre_parse.LITERAL:
+                if ignore_case and (av > 0x7F or av in UNICODE_FOLDED_ASCII):
+                    return False
+            elif op is sre_parse.AT:
+                if av not in BYTES_SAFE_ANCHORS:
+                    return False
+            elif op is sre_parse.BRANCH:
+                if not all(compatible(branch) for branch in av[1]):
+                    return False
+            elif op is sre_parse.SUBPATTERN:
+                # Группа с флагами (?i:...) меняет смысл литералов
+                if av[1] or av[2] or not compatible(av[3]):
+                    return False
+            elif op in REPEAT_OPS:
+                item = av[2]
+                if len(item) == 1 and item[0][0] is sre_parse.LITERAL and item[0][1] > 0x7F:
+                    return False
+                if not compatible(item):
+                    return False
+            else:
+                return False
+        return True
+
+    return compatible(parsed)
+
+
+_ANCHOR_SOURCE = {
+    sre_parse.AT_BEGINNING: b'^',
+    sre_parse.AT_BEGINNING_STRING: b'\\A',
+    sre_parse.AT_END: b'$',
+    sre_parse.AT_END_STRING: b'\\Z',
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def utf8_pattern_bytes(pattern: str, flags: int = 0) -> Optional[bytes]:
+    """
+    Исходник bytes паттерна для re, Hyperscan и PCRE2 или None (см. utf8_bytes_compatible)
+
+    Собирается из разобранного паттерна, а не через pattern.encode(): экранирования
+    \\u, \\U, \\N{...} в bytes паттерне недопустимы, а \\xe9 на байтах - байт 0xE9,
+    а не символ é. Литералы пишутся UTF-8 байтами, ASCII знаки - как \\xNN.
+    """
+    if not utf8_bytes_compatible(pattern, flags):
+        return None
+    parsed = sre_parse.parse(pattern, flags)
+
+    def source(nodes) -> bytes:
+        parts = []
+        for op, av in nodes:
+            if op is sre_parse.LITERAL:
+                char = chr(av)
+                if av > 0x7F or char.isalnum() or char == '_':
+                    parts.append(char.encode('utf-8'))
+                else:
+                    parts.append(b'\\x%02x' % av)
+            elif op is sre_parse.AT:
+                parts.append(_ANCHOR_SOURCE[av])
+            elif op is sre_parse.BRANCH:
+                parts.append(b'(?:' + b'|'.join(source(branch) for branch in av[1]) + b')')
+            elif op is sre_parse.SUBPATTERN:
+                # Номера групп сохраняются: группы идут в том же порядке
+                parts.append((b'(?:' if av[0] is None else b'(') + source(av[3]) + b')')
+            else:
+                min_count, max_count, item = av
+                if max_count == sre_parse.MAXREPEAT:
+                    quantifier = b'{%d,}' % min_count
+                else:
+                    quantifier = b'{%d,%d}' % (min_count, max_count)
+                if op is sre_parse.MIN_REPEAT:
+                    quantifier += b'?'
+                parts.append(b'(?:' + source(item) + b')' + quantifier)
+        return b''.join(parts)
+
+    # Флаги из самого паттерна ((?i), (?m)) переносятся в исходник
+    inline = b''.join(letter for flag, letter in ((re.IGNORECASE, b'i'), (re.MULTILINE, b'm'))
+                      if parsed.state.flags & flag and not flags & flag)
+    return (b'(?' + inline + b')' if inline else b'') + source(parsed)
+
+
+_POSITION_OPS = (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+
+
+def _subpatterns(av):
+    """Вложенные подпаттерны аргумента узла sre_parse (группы, ветви, тело повтора)"""
+    if isinstance(av, sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (tuple, list)):
+        for item in av:
+            yield from _subpatterns(item)
+
+
+@functools.lru_cache(maxsize=1024)
+def has_position_assertions(pattern, flags: int = 0) -> bool:
+    """
+    Есть ли в паттерне (str или bytes) якоря, \\b или lookaround
+
+    Они смотрят за пределы совпадения: на границе чанка или окна ^ \\A видят начало
+    строки, $ \\Z \\b и lookahead при endpos - ее конец. Такой паттерн нельзя искать
+    частями файла с перекрытием. Если паттерн не разбирается - True.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return True
+
+    def walk(nodes) -> bool:
+        for op, av in nodes:
+            if op in _POSITION_OPS:
+                return True
+            if any(walk(child) for child in _subpatterns(av)):
+                return True
+        return False
+
+    return walk(parsed)
+
+
+def hs_stop_on_match(*args) -> bool:
+    """Обработчик совпадения Hyperscan: останавливает сканирование на первом совпадении"""
+    return True
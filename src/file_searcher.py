@@ -8,9 +8,16 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import re
+import sys
+import string
 import mmap
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+import queue
+import itertools
+from collections import deque, defaultdict
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
 import json
@@ -19,52 +26,252 @@ from typing import List, Tuple, Optional
 import fnmatch
 from dataclasses import dataclass
 import subprocess
+import functools
+import atexit
+import multiprocessing
+import ctypes
 from PIL import Image, ImageTk
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Общие проверки паттернов для поиска по байтам (в пакете и при запуске файлом)
+try:
+    from .byte_patterns import (REPEAT_OPS, has_position_assertions, hs_stop_on_match,
+                                utf8_bytes_compatible, utf8_pattern_bytes)
+except ImportError:
+    from byte_patterns import (REPEAT_OPS, has_position_assertions, hs_stop_on_match,
+                               utf8_bytes_compatible, utf8_pattern_bytes)
+
+# Попытка импорта PCRE2 (JIT компиляция регулярок в машинный код)
+try:
+    import pcre2
+    PCRE2_AVAILABLE = True
+except ImportError:
+    PCRE2_AVAILABLE = False
+
+def _py_match_name(filename, name_filter, name_regex, extensions):
+    """Python версия предиката имени из _entry_filter.pyx"""
+    if name_regex is not None and name_regex.search(filename) is None:
+        return False
+    if name_filter is not None and name_filter.match(filename) is None:
+        return False
+    if extensions is not None:
+        # Расширение как в os.path.splitext: ведущие точки имени не считаются
+        dot = filename.rfind('.')
+        if dot <= 0 or (filename[0] == '.' and not filename[:dot].lstrip('.')):
+            file_ext = ''
+        else:
+            file_ext = filename[dot + 1:].lower()
+        if file_ext not in extensions:
+            return False
+    return True
+
+
+def _py_match_entry(entry, name_filter, name_regex, extensions, min_size, max_size,
+                    modified_after, modified_before):
+    """Python версия предиката из _entry_filter.pyx"""
+    if not _py_match_name(entry.name, name_filter, name_regex, extensions):
+        return None
+    stat = entry.stat()
+    file_size = stat.st_size
+    mtime = stat.st_mtime
+    if file_size < min_size or file_size > max_size:
+        return None
+    if mtime < modified_after or mtime > modified_before:
+        return None
+    return (file_size, mtime)
+
+
+# Попытка собрать Cython версию предикатов имени и метаданных
+try:
+    import pyximport
+    _pyx_importers = pyximport.install(language_level=3)
+    try:
+        from ._entry_filter import match_entry, match_name
+    finally:
+        pyximport.uninstall(*_pyx_importers)
+    CYTHON_FILTER_AVAILABLE = True
+except Exception:
+    CYTHON_FILTER_AVAILABLE = False
+    match_name, match_entry = _py_match_name, _py_match_entry
+
 # Попытка импорта GPU движка
 try:
     # Используем относительный импорт для модуля в той же папке
     from .gpu_search_engine import HybridSearchEngine, GPU_AVAILABLE
     GPU_SUPPORT = True
+except ImportError:
+    GPU_SUPPORT = False
+    GPU_AVAILABLE = False
+
+
+def _hidden_window_kwargs() -> dict:
+    """Аргументы subprocess, скрывающие консольное окно дочернего процесса в Windows"""
+    if os.name != 'nt':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = subprocess.SW_HIDE
+    return {'startupinfo': startupinfo, 'creationflags': subprocess.CREATE_NO_WINDOW}
+
+
+# Создается один раз и переиспользуется для всех запусков nvidia-smi
+_HIDDEN_WINDOW = _hidden_window_kwargs()
+
+# Прямой доступ к буферу обмена Windows (без Tk): свои экземпляры DLL с типами для 64 бит
+if os.name == 'nt':
+    from ctypes import wintypes
+    _user32 = ctypes.WinDLL('user32')
+    _kernel32 = ctypes.WinDLL('kernel32')
+    _user32.OpenClipboard.argtypes = [wintypes.HWND]
+    _user32.OpenClipboard.restype = wintypes.BOOL
+    _user32.GetClipboardData.argtypes = [wintypes.UINT]
+    _user32.GetClipboardData.restype = wintypes.HANDLE
+    _user32.CloseClipboard.restype = wintypes.BOOL
+    _kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalLock.restype = wintypes.LPVOID
+    _kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalUnlock.restype = wintypes.BOOL
+
+CF_UNICODETEXT = 13
+
+
+def _get_clipboard_text_win() -> Optional[str]:
+    """
+    Читает текст из буфера обмена Windows через WinAPI
+    
+    Returns:
+        Текст или None, если буфер занят другим процессом или в нем нет текста
+    """
+    if not _user32.OpenClipboard(None):
+        return None
+    try:
+        handle = _user32.GetClipboardData(CF_UNICODETEXT)
+        if not handle:
+            return None
+        pointer = _kernel32.GlobalLock(handle)
+        if not pointer:
+            return None
+        try:
+            return ctypes.wstring_at(pointer)
+        finally:
+            _kernel32.GlobalUnlock(handle)
+    finally:
+        _user32.CloseClipboard()
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_gpu() -> Tuple[Optional[str], Optional[float]]:
+    """
+    Определяет модель и объем памяти GPU (имя, ГБ)
     
-    # Получаем информацию о GPU
-    GPU_NAME = None
-    GPU_MEMORY = None
-    if GPU_AVAILABLE:
-        # Сначала пробуем через nvidia-smi (более надежно)
+    Вызывается лениво при первом использовании GPU: nvidia-smi и импорт numba
+    занимают до нескольких секунд и не должны задерживать импорт модуля.
+    """
+    if not GPU_AVAILABLE:
+        return None, None
+    
+    gpu_name = None
+    gpu_memory = None
+    
+    # Сначала пробуем через nvidia-smi (более надежно)
+    try:
+        result = subprocess.run(['nvidia-smi', '--query-gpu=name,memory.total', 
+                               '--format=csv,noheader,nounits'], 
+                              capture_output=True, text=True, timeout=2, check=False,
+                              **_HIDDEN_WINDOW)
+        if result.returncode == 0:
+            info = result.stdout.strip().split(',')
+            gpu_name = info[0].strip()
+            gpu_memory = float(info[1].strip()) / 1024  # МБ в ГБ
+            print(f"✅ GPU найдена через nvidia-smi: {gpu_name} ({gpu_memory:.1f} ГБ)")
+    except Exception as e:
+        print(f"⚠️ nvidia-smi не сработала: {e}")
+    
+    # Если не получилось, пробуем через numba
+    if not gpu_name:
         try:
-            result = subprocess.run(['nvidia-smi', '--query-gpu=name,memory.total', 
-                                   '--format=csv,noheader,nounits'], 
-                                  capture_output=True, text=True, timeout=2)
-            if result.returncode == 0:
-                info = result.stdout.strip().split(',')
-                GPU_NAME = info[0].strip()
-                GPU_MEMORY = float(info[1].strip()) / 1024  # МБ в ГБ
-                print(f"✅ GPU найдена через nvidia-smi: {GPU_NAME} ({GPU_MEMORY:.1f} ГБ)")
+            from numba import cuda
+            if cuda.is_available():
+                device = cuda.get_current_device()
+                gpu_name = device.name.decode()
+                gpu_memory = device.total_memory / (1024**3)
+                print(f"✅ GPU найдена через numba: {gpu_name} ({gpu_memory:.1f} ГБ)")
         except Exception as e:
-            print(f"⚠️ nvidia-smi не сработала: {e}")
-        
-        # Если не получилось, пробуем через numba
-        if not GPU_NAME:
-            try:
-                from numba import cuda
-                if cuda.is_available():
-                    device = cuda.get_current_device()
-                    GPU_NAME = device.name.decode()
-                    GPU_MEMORY = device.total_memory / (1024**3)
-                    print(f"✅ GPU найдена через numba: {GPU_NAME} ({GPU_MEMORY:.1f} ГБ)")
-            except Exception as e:
-                print(f"⚠️ numba cuda не сработала: {e}")
-        
-        # Если всё еще не получилось, ставим дефолтное значение
-        if not GPU_NAME:
-            GPU_NAME = "NVIDIA GPU (модель неизвестна)"
-            print("⚠️ Не удалось определить модель GPU, используется дефолтное имя")
+            print(f"⚠️ numba cuda не сработала: {e}")
+    
+    # Если всё еще не получилось, ставим дефолтное значение
+    if not gpu_name:
+        gpu_name = "NVIDIA GPU (модель неизвестна)"
+        print("⚠️ Не удалось определить модель GPU, используется дефолтное имя")
+    
+    return gpu_name, gpu_memory
+
+
+def __getattr__(name: str):
+    """GPU_NAME и GPU_MEMORY вычисляются при первом обращении"""
+    if name == 'GPU_NAME':
+        return _detect_gpu()[0]
+    if name == 'GPU_MEMORY':
+        return _detect_gpu()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Попытка импорта модуля regex (отпускает GIL, поддерживает таймаут поиска)
+try:
+    import regex
+    REGEX_MODULE_AVAILABLE = True
 except ImportError:
-    GPU_SUPPORT = False
-    GPU_AVAILABLE = False
-    GPU_NAME = None
-    GPU_MEMORY = None
+    REGEX_MODULE_AVAILABLE = False
+
+# Попытка импорта RE2 (DFA движок Google: линейное время, без катастрофического backtracking)
+try:
+    import re2
+    RE2_AVAILABLE = True
+    # Класс скомпилированного паттерна RE2 (в публичном API модуля его нет)
+    _RE2_PATTERN_TYPE = type(re2.compile(''))
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Максимальное время поиска regex модулем в одном буфере (секунды)
+REGEX_TIMEOUT = 5.0
+
+# Попытка импорта orjson (быстрая сериализация JSON при экспорте)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Попытка импорта pynvml (мониторинг загрузки GPU через NVML без запуска nvidia-smi)
+try:
+    import pynvml
+    PYNVML_AVAILABLE = True
+except ImportError:
+    PYNVML_AVAILABLE = False
+
+# Батчевые системные вызовы через io_uring (Linux)
+try:
+    from .io_uring_backend import IOUringBatcher, IO_URING_AVAILABLE
+except ImportError:
+    IO_URING_AVAILABLE = False
+
+# Попытка импорта Hyperscan (DFA движок для поиска в содержимом)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+# Попытка импорта StringZilla (SIMD поиск подстрок)
+try:
+    import stringzilla
+    STRINGZILLA_AVAILABLE = True
+except ImportError:
+    STRINGZILLA_AVAILABLE = False
 
 
 @dataclass
@@ -72,24 +279,148 @@ class SearchResult:
     """Результат поиска файла"""
     path: str
     size: int
-    modified: datetime
+    mtime: float  # timestamp, форматируется только при выводе
     match_reason: str
 
 
+# Формат даты изменения в таблице и экспорте
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Единицы размера файла: индекс = степень 1024
+_SIZE_UNITS = ('Б', 'КБ', 'МБ', 'ГБ', 'ТБ', 'ПБ')
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_size(size_bytes: int) -> str:
+    """Форматирует размер файла (многие файлы имеют одинаковый размер - результат кэшируется)"""
+    # Единица выбирается по числу бит, а не циклом делений
+    exponent = min((size_bytes.bit_length() - 1) // 10, 5) if size_bytes > 0 else 0
+    return f"{size_bytes / (1 << 10 * exponent):.2f} {_SIZE_UNITS[exponent]}"
+
+
+# Коды причины совпадения (индексы в MATCH_REASONS)
+MATCH_BY_NAME = 0
+MATCH_BY_CONTENT = 1
+MATCH_REASONS = ("Имя файла", "Содержимое файла")
+
+
+class SearchResults:
+    """
+    Результаты поиска в колоночном виде (Struct-of-Arrays)
+    
+    Размеры, даты и причины хранятся в компактных массивах array, а не
+    в отдельном объекте на каждый файл. SearchResult создается
+    только при обращении к конкретной строке.
+    """
+    __slots__ = ('paths', 'sizes', 'mtimes', 'reasons')
+    
+    def __init__(self):
+        self.paths: List[str] = []
+        self.sizes = array('q')
+        self.mtimes = array('d')  # timestamp
+        self.reasons = array('b')  # MATCH_BY_NAME / MATCH_BY_CONTENT
+    
+    def append(self, path: str, size: int, mtime: float, reason: int):
+        self.paths.append(path)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.reasons.append(reason)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def __getitem__(self, index: int) -> SearchResult:
+        return SearchResult(
+            path=self.paths[index],
+            size=self.sizes[index],
+            mtime=self.mtimes[index],
+            match_reason=MATCH_REASONS[self.reasons[index]]
+        )
+    
+    def __iter__(self):
+        for index in range(len(self.paths)):
+            yield self[index]
+    
+    def argsort(self, column: str, reverse: bool = False) -> List[int]:
+        """Порядок строк по колонке (paths/sizes/mtimes) без создания SearchResult"""
+        return sorted(range(len(self.paths)), key=getattr(self, column).__getitem__,
+                      reverse=reverse)
+
+
+class _PrefetchedEntry:
+    """DirEntry с метаданными (и, для небольших файлов, содержимым), заранее полученными через io_uring"""
+    __slots__ = ('path', 'name', '_stat', 'contents')
+    
+    def __init__(self, entry: os.DirEntry, stat):
+        self.path = entry.path
+        self.name = entry.name
+        self._stat = stat
+        self.contents = None
+    
+    def stat(self):
+        return self._stat
+
+
 class FileSearchEngine:
     """Ядро поисковой системы с многопоточностью и GPU ускорением"""
     
-    def __init__(self, max_workers: Optional[int] = None, use_gpu: bool = False):
+    def __init__(self, max_workers: Optional[int] = None, use_gpu: bool = False,
+                 use_io_uring: bool = False, gpu_engine=None):
         self.max_workers = max_workers or os.cpu_count() or 4
         self.stop_flag = threading.Event()
         self.use_gpu = use_gpu and GPU_SUPPORT
+        # Батчевый statx через io_uring выгоден на холодном кэше и сетевых ФС
+        self.use_io_uring = use_io_uring and IO_URING_AVAILABLE
+        # Файлы до этого размера при поиске в содержимом читаются через io_uring
+        # батчами (openat + read + close) еще в потоке обхода
+        self.uring_read_max_size = 64 * 1024
         
-        # Инициализация GPU движка если доступен
+        # Инициализация GPU движка если доступен (переданный движок живет дольше поиска)
         if self.use_gpu:
-            self.gpu_engine = HybridSearchEngine(use_gpu=True)
+            _detect_gpu()
+            self.gpu_engine = gpu_engine or HybridSearchEngine(use_gpu=True)
         else:
             self.gpu_engine = None
         
+        # База Hyperscan компилируется один раз на поиск, scratch - свой у каждого потока
+        self._hs_db = None
+        self._hs_local = threading.local()
+        
+        # Копии паттерна RE2 / regex - свои у каждого потока
+        self._pattern_local = threading.local()
+        
+        # Если регулярка - просто строка, ищем ее как подстроку без regex движка
+        self._literal_needle = None
+        
+        # PCRE2 паттерн с JIT (задается в search())
+        self._pcre2_pattern = None
+        
+        # Литералы из паттерна вида alt1|alt2|...|altN для GPU поиска
+        self._literal_alternatives = None
+        
+        # Обязательная подстрока паттерна для предфильтра по байтам
+        self._prefilter_needle = None
+        
+        # Лимиты CPU поиска для текущего паттерна (задаются в search())
+        self._safe_limit = 5 * 1024 * 1024
+        self._chunk_size = 5 * 1024 * 1024
+        
+        # Файлы больше порога сканируются параллельно шардами с перекрытием
+        self.parallel_scan_threshold = 32 * 1024 * 1024
+        self._scan_overlap = 1024
+        self._shard_executor = None
+        self._shard_lock = threading.Lock()
+        
+        # Подсказки ядру о чтении: последовательный readahead с 1 МБ,
+        # вытеснение из кэша страниц после сканирования с 256 МБ
+        self.fadvise_min_size = 1 * 1024 * 1024
+        self.fadvise_dontneed_size = 256 * 1024 * 1024
+        
+        # Число файлов, найденных обходом дерева в текущем поиске
+        self._files_found = 0
+        # Размер пачки файлов в очереди к обработчикам (задается в search())
+        self._queue_batch = 256
+        
     def search(self, root_path: str, 
                name_pattern: str = "*",
                extensions: List[str] = None,
@@ -100,7 +431,8 @@ class FileSearchEngine:
                modified_before: datetime = None,
                case_sensitive: bool = False,
                use_regex_name: bool = False,
-               callback=None) -> List[SearchResult]:
+               callback=None,
+               content_regex_obj=None) -> SearchResults:
         """
         Выполняет многопоточный поиск файлов
         
@@ -116,18 +448,77 @@ class FileSearchEngine:
             case_sensitive: Учитывать регистр при поиске
             use_regex_name: Использовать regex вместо wildcard для имени
             callback: Функция обратного вызова для обновления прогресса
+            content_regex_obj: Уже скомпилированный паттерн содержимого (например, модулем regex),
+                               используется вместо компиляции content_regex
         """
         self.stop_flag.clear()
-        results = []
+        if self.gpu_engine is not None:
+            self.gpu_engine.reset_stats()
         
         # Компиляция регулярных выражений
         content_pattern = None
-        if content_regex:
+        if content_regex_obj is not None:
+            content_pattern = content_regex_obj
+            content_regex = content_regex or content_regex_obj.pattern
+        elif content_regex:
             flags = 0 if case_sensitive else re.IGNORECASE
             try:
-                content_pattern = re.compile(content_regex, flags)
+                # Паттерн, который в UTF-8 байтах совпадает с тем же текстом, компилируем
+                # в bytes - поиск идет по байтам без декодирования. Классы, \w, '.' и т.п.
+                # остаются str: на байтах они не видят кириллицу и другие не-ASCII символы.
+                # GPU движок работает со str паттернами
+                pattern_bytes = None if self.use_gpu else utf8_pattern_bytes(content_regex, flags)
+                content_pattern = re.compile(pattern_bytes if pattern_bytes is not None else content_regex,
+                                             flags)
             except re.error as e:
                 raise ValueError(f"Ошибка в регулярном выражении: {e}")
+        # Явно переданный паттерн выполняется своим движком, без Hyperscan и PCRE2
+        use_fast_engines = content_pattern is not None and content_regex_obj is None
+        self._hs_db = self._compile_hyperscan(content_regex, case_sensitive) if use_fast_engines else None
+        self._hs_local = threading.local()
+        self._pattern_local = threading.local()
+        # Если Hyperscan не взял паттерн - пробуем JIT компиляцию PCRE2
+        self._pcre2_pattern = (self._compile_pcre2(content_regex, case_sensitive)
+                               if use_fast_engines and self._hs_db is None else None)
+        self._literal_needle = self._extract_literal(content_regex, case_sensitive) if content_pattern else None
+        # Regex движок (re/regex/PCRE2) запускается, только если memmem нашел в байтах
+        # обязательный литерал. Поиску литерала и Hyperscan предфильтр не нужен
+        self._prefilter_needle = (self._required_literal(content_regex, case_sensitive)
+                                  if content_pattern and self._literal_needle is None
+                                  and self._hs_db is None else None)
+        # Альтернатива литералов (alt1|alt2|...) на GPU ищется PFAC ядром
+        self._literal_alternatives = (self._extract_literal_alternatives(content_regex, case_sensitive)
+                                      if content_pattern and self.use_gpu else None)
+        
+        # Лимиты CPU поиска зависят от сложности regex - вычисляем один раз на поиск
+        if content_regex and self._is_dangerous_pattern(content_regex):
+            self._safe_limit = 1 * 1024 * 1024  # 1 МБ для опасных
+            self._chunk_size = 512 * 1024  # 512 КБ для опасных regex
+        else:
+            self._safe_limit = 5 * 1024 * 1024  # 5 МБ для обычных регулярок
+            self._chunk_size = 5 * 1024 * 1024  # 5 МБ для обычных
+            # bytes паттерн re сканирует mmap на месте (без копии и декодирования чанка) -
+            # крупные чанки реже перечитывают перекрытие
+            if (content_pattern is not None and self._pcre2_pattern is None
+                    and isinstance(content_pattern.pattern, bytes)):
+                self._chunk_size = 16 * 1024 * 1024
+        
+        # Перекрытие чанков не меньше максимальной длины совпадения, но не больше половины чанка -
+        # иначе каждый байт сканируется несколько раз. Если совпадение длиннее или паттерн
+        # с якорями и lookaround (endpos чанка для $ \Z \b - конец строки), bytes паттерн
+        # (re/RE2 по mmap без копии) ищется одним проходом по всему файлу (None)
+        if content_pattern:
+            width = self._pattern_max_width(content_pattern)
+            whole_file = self._pcre2_pattern is None and isinstance(content_pattern.pattern, bytes)
+            if whole_file and has_position_assertions(content_pattern.pattern,
+                                                      getattr(content_pattern, 'flags', 0)):
+                self._scan_overlap = None
+            elif width <= self._chunk_size // 2:
+                self._scan_overlap = max(width, 1024)
+            elif whole_file:
+                self._scan_overlap = None
+            else:
+                self._scan_overlap = self._chunk_size // 2
         
         name_regex = None
         if use_regex_name and name_pattern != "*":
@@ -137,140 +528,318 @@ class FileSearchEngine:
             except re.error as e:
                 raise ValueError(f"Ошибка в регулярном выражении имени: {e}")
         
-        # Нормализация расширений
+        # Нормализация расширений: множество для проверки за O(1)
         if extensions:
-            extensions = [ext.lower().strip('.') for ext in extensions if ext.strip()]
+            extensions = frozenset(ext.lower().strip('.') for ext in extensions if ext.strip()) or None
+        else:
+            extensions = None
+        
+        # Wildcard имени компилируется один раз
+        name_filter = self._build_name_filter(
+            name_pattern if not use_regex_name else "*", case_sensitive
+        )
         
-        # Сбор всех файлов для обработки
-        files_to_check = []
+        # Границы фильтров в числах: без фильтра - бесконечность, даты - timestamp
+        size_min = float(min_size or 0)
+        size_max = float(max_size) if max_size else float('inf')
+        time_after = modified_after.timestamp() if modified_after else float('-inf')
+        time_before = modified_before.timestamp() if modified_before else float('inf')
+        
+        # Обход дерева и проверка файлов идут одновременно: производитель кладет
+        # DirEntry в ограниченную очередь, обработчики сразу их проверяют
+        # Файлы передаются пачками: одна блокировка очереди на пачку, а не на файл.
+        # При поиске в содержимом файл дорогой - пачки мелкие, чтобы нагрузка делилась между потоками
+        self._queue_batch = 256 if content_pattern is None else 4
+        file_queue = queue.Queue(maxsize=max(1, 10_000 // self._queue_batch))
+        # Имя и расширение проверяет производитель при обходе - в очередь (и в прогресс)
+        # попадают только подходящие по имени файлы, обработчикам остаются stat и содержимое
+        name_args = (name_filter, name_regex, extensions)
+        check_args = (None, None, None, content_pattern,
+                      size_min, size_max, time_after, time_before)
+        self._files_found = 0
+        
+        producer = threading.Thread(
+            target=self._produce_files,
+            args=(root_path, file_queue, self.max_workers, name_args, check_args),
+            daemon=True
+        )
+        producer.start()
+        
+        # Фиксированный набор потоков-обработчиков: без Future на каждый файл.
+        # Совпадения собираются в deque, счетчик прогресса - itertools.count
+        found = deque()
+        progress = itertools.count(1)
+        workers = [
+            threading.Thread(
+                target=self._consume_files,
+                args=(file_queue, found, progress, check_args, callback),
+                daemon=True
+            )
+            for _ in range(self.max_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        producer.join()
+        
+        # Пул шардов живет только в рамках одного поиска
+        with self._shard_lock:
+            if self._shard_executor is not None:
+                self._shard_executor.shutdown(wait=True)
+                self._shard_executor = None
+        
+        # Совпадения упаковываются в колонки
+        results = SearchResults()
+        for row in found:
+            results.append(*row)
+        return results
+    
+    def _iter_files(self, root_path: str):
+        """
+        Рекурсивно обходит дерево через os.scandir и выдает DirEntry файлов
+        
+        DirEntry берет тип файла из результатов чтения директории и кэширует stat,
+        поэтому отдельные isfile/stat для каждого файла не нужны.
+        """
+        stack = [root_path]
+        stop_is_set = self.stop_flag.is_set
+        while stack:
+            if stop_is_set():
+                return
+            
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Фильтрация скрытых директорий для ускорения
+                                if not entry.name.startswith('.'):
+                                    subdirs.append(entry.path)
+                            elif entry.is_file():
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            
+            stack.extend(reversed(subdirs))
+    
+    def _produce_files(self, root_path: str, file_queue: queue.Queue, consumers: int,
+                       name_args: tuple, check_args: tuple):
+        """
+        Поток-производитель: обходит дерево и передает обработчикам DirEntry,
+        прошедшие проверку имени и расширения (name_args для match_name)
+        
+        Очередь (списков по _queue_batch файлов) ограничена, поэтому память
+        не зависит от размера дерева. В конце кладет по одному None на каждого обработчика.
+        """
+        uring = None
         try:
-            for root, dirs, files in os.walk(root_path):
-                if self.stop_flag.is_set():
-                    break
-                    
-                # Фильтрация скрытых директорий для ускорения
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                
-                for file in files:
-                    if self.stop_flag.is_set():
-                        break
-                    files_to_check.append(os.path.join(root, file))
-                    
-        except PermissionError:
-            pass
+            # На Linux метаданные запрашиваются батчами через io_uring
+            if self.use_io_uring:
+                try:
+                    uring = IOUringBatcher()
+                except OSError:
+                    uring = None
+            
+            batch_size = uring.depth if uring is not None else self._queue_batch
+            filter_names = any(arg is not None for arg in name_args)
+            batch = []
+            for entry in self._iter_files(root_path):
+                # Проверка имени не требует системных вызовов - отсеянные файлы
+                # не доходят ни до io_uring, ни до очереди
+                if filter_names and not match_name(entry.name, *name_args):
+                    continue
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    self._put_files(file_queue, batch, uring, check_args)
+                    batch = []
+            self._put_files(file_queue, batch, uring, check_args)
+        finally:
+            if uring is not None:
+                uring.close()
+            for _ in range(consumers):
+                file_queue.put(None)
+    
+    def _put_files(self, file_queue: queue.Queue, entries: list, uring: Optional['IOUringBatcher'],
+                   check_args: tuple):
+        """Кладет файлы в очередь пачками, предварительно запросив stat (и содержимое) через io_uring"""
+        if not entries:
+            return
+        if uring is not None:
+            entries = self._prefetch_stats(entries, uring)
+            # content_pattern задан - небольшие подходящие по метаданным файлы читаются сразу
+            if check_args[3] is not None and not self.use_gpu:
+                self._prefetch_contents(entries, uring, check_args)
+        step = self._queue_batch
+        for start in range(0, len(entries), step):
+            chunk = entries[start:start + step]
+            self._files_found += len(chunk)
+            file_queue.put(chunk)
+    
+    def _consume_files(self, file_queue: queue.Queue, found: deque,
+                       progress: itertools.count, check_args: tuple, callback):
+        """
+        Поток-обработчик: берет пачки файлов из очереди, совпадения (кортежи) складывает в found
         
-        total_files = len(files_to_check)
-        processed = 0
-        
-        # Многопоточная обработка файлов
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self._check_file,
-                    file_path,
-                    name_pattern,
-                    name_regex,
-                    extensions,
-                    content_pattern,
-                    min_size,
-                    max_size,
-                    modified_after,
-                    modified_before,
-                    case_sensitive,
-                    use_regex_name
-                ): file_path
-                for file_path in files_to_check
-            }
+        Всего файлов заранее неизвестно - прогресс в callback считается
+        от найденных обходом на данный момент.
+        """
+        # Методы, вызываемые на каждый файл, связываются с локальными переменными один раз
+        get = file_queue.get
+        stop_is_set = self.stop_flag.is_set
+        check_file = self._make_check_file(check_args)
+        found_append = found.append
+        while True:
+            entries = get()
+            if entries is None:
+                return
             
-            for future in as_completed(futures):
-                if self.stop_flag.is_set():
+            for entry in entries:
+                # После остановки очередь только вычерпывается, чтобы производитель не завис на put
+                if stop_is_set():
                     break
-                    
+                
                 try:
-                    result = future.result()
+                    result = check_file(entry)
+                    processed = next(progress)
                     if result:
-                        results.append(result)
+                        found_append(result)
                         if callback:
-                            callback(result, processed, total_files)
+                            path, size, mtime, reason = result
+                            callback(SearchResult(path, size, mtime, MATCH_REASONS[reason]),
+                                     processed, self._files_found)
+                    if callback and processed % 100 == 0:
+                        callback(None, processed, self._files_found)
                 except Exception:
                     pass  # Игнорируем ошибки отдельных файлов
-                
-                processed += 1
-                if callback and processed % 100 == 0:
-                    callback(None, processed, total_files)
+    
+    def _prefetch_stats(self, entries: List[os.DirEntry], uring: 'IOUringBatcher') -> list:
+        """
+        Получает stat для батча файлов через io_uring
         
-        return results
+        Вместо отдельного stat на каждый файл в ядро уходит один вызов
+        на батч. При ошибке io_uring возвращает entries без изменений.
+        """
+        try:
+            stats = uring.statx_many([entry.path for entry in entries])
+        except OSError:
+            return entries
+        
+        # Файлы с ошибкой statx остаются обычными DirEntry
+        return [
+            _PrefetchedEntry(entry, stat) if stat is not None else entry
+            for entry, stat in zip(entries, stats)
+        ]
     
-    def _check_file(self, file_path: str, name_pattern: str, name_regex,
-                   extensions, content_pattern, min_size, max_size,
-                   modified_after, modified_before, case_sensitive,
-                   use_regex_name) -> Optional[SearchResult]:
-        """Проверяет один файл на соответствие критериям"""
+    def _prefetch_contents(self, entries: list, uring: 'IOUringBatcher', check_args: tuple):
+        """
+        Читает через io_uring содержимое небольших файлов, проходящих фильтр метаданных
+        
+        Вместо open/fstat/mmap/close на каждый файл в обработчике - один (или, без
+        прямых дескрипторов, три) вызов io_uring_submit на батч. Файлы с ошибкой
+        чтения обработчик откроет сам.
+        """
+        # Имя уже проверено производителем - остаются размер и дата
+        _, _, _, _, min_size, max_size, after, before = check_args
+        wanted = []
+        for entry in entries:
+            if type(entry) is not _PrefetchedEntry:
+                continue
+            size = entry.stat().st_size
+            if (0 < size <= self.uring_read_max_size and
+                    match_entry(entry, None, None, None,
+                                min_size, max_size, after, before) is not None):
+                wanted.append(entry)
+        if not wanted:
+            return
+        
         try:
-            # Проверка на остановку
-            if self.stop_flag.is_set():
-                return None
-            # Проверка существования
-            if not os.path.isfile(file_path):
-                return None
-            
-            filename = os.path.basename(file_path)
-            
-            # Проверка имени
-            if use_regex_name and name_regex:
-                if not name_regex.search(filename):
+            contents = uring.read_many([entry.path for entry in wanted],
+                                       [entry.stat().st_size for entry in wanted])
+        except OSError:
+            return
+        for entry, data in zip(wanted, contents):
+            entry.contents = data
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _build_name_filter(name_pattern: str, case_sensitive: bool) -> Optional[re.Pattern]:
+        """
+        Компилирует wildcard имени в регулярку
+        
+        Результат кэшируется - повторный поиск с тем же паттерном
+        не транслирует и не компилирует glob заново.
+        
+        Returns:
+            Скомпилированный паттерн или None, если фильтровать нечего
+        """
+        if name_pattern == "*":
+            return None
+        
+        # Как fnmatch.fnmatch: на Windows (normcase) wildcard всегда без учета регистра
+        case_sensitive = case_sensitive and os.path.normcase("A") == "A"
+        return re.compile(fnmatch.translate(name_pattern), 0 if case_sensitive else re.IGNORECASE)
+    
+    def _make_check_file(self, check_args: tuple):
+        """
+        Собирает проверку одного файла для текущего поиска (даты в check_args - timestamp)
+        
+        Замыкание держит аргументы поиска в ячейках и содержит только нужные шаги:
+        без поиска в содержимом (большинство поисков) - один вызов match_entry.
+        Остановку проверяет _consume_files перед каждым файлом.
+        
+        Returns:
+            Функция entry -> (путь, размер, mtime, код причины) или None
+        """
+        (name_filter, name_regex, extensions, content_pattern,
+         min_size, max_size, modified_after, modified_before) = check_args
+        
+        if not content_pattern:
+            def check_file(entry):
+                # Имя, размер и дата проверяются одним вызовом (Cython если доступен)
+                try:
+                    matched = match_entry(entry, name_filter, name_regex, extensions,
+                                          min_size, max_size, modified_after, modified_before)
+                except OSError:
                     return None
-            elif name_pattern != "*":
-                if case_sensitive:
-                    if not fnmatch.fnmatch(filename, name_pattern):
-                        return None
-                else:
-                    if not fnmatch.fnmatch(filename.lower(), name_pattern.lower()):
-                        return None
-            
-            # Проверка расширения
-            if extensions:
-                file_ext = os.path.splitext(filename)[1].lower().strip('.')
-                if file_ext not in extensions:
+                if matched is None:
                     return None
-            
-            # Получение метаданных
-            stat = os.stat(file_path)
-            file_size = stat.st_size
-            file_modified = datetime.fromtimestamp(stat.st_mtime)
-            
-            # Проверка размера
-            if min_size and file_size < min_size:
-                return None
-            if max_size and file_size > max_size:
-                return None
-            
-            # Проверка даты модификации
-            if modified_after and file_modified < modified_after:
-                return None
-            if modified_before and file_modified > modified_before:
-                return None
-            
-            match_reason = "Имя файла"
-            
-            # Проверка содержимого (самая затратная операция)
-            if content_pattern:
-                if not self._search_in_file(file_path, content_pattern):
+                return (entry.path, matched[0], matched[1], MATCH_BY_NAME)
+            return check_file
+        
+        search_in_file = self._search_in_file
+        
+        def check_file(entry):
+            try:
+                matched = match_entry(entry, name_filter, name_regex, extensions,
+                                      min_size, max_size, modified_after, modified_before)
+                if matched is None:
                     return None
-                match_reason = "Содержимое файла"
-            
-            return SearchResult(
-                path=file_path,
-                size=file_size,
-                modified=file_modified,
-                match_reason=match_reason
-            )
-            
-        except (PermissionError, OSError):
-            return None
+                
+                # Проверка содержимого (самая затратная операция)
+                file_path = entry.path
+                contents = entry.contents if type(entry) is _PrefetchedEntry else None
+                if not search_in_file(file_path, content_pattern, contents, matched[0]):
+                    return None
+            except OSError:
+                return None
+            return (file_path, matched[0], matched[1], MATCH_BY_CONTENT)
+        return check_file
     
-    def _search_in_file(self, file_path: str, pattern: re.Pattern) -> bool:
-        """Быстрый поиск в файле с использованием memory-mapped I/O или GPU"""
+    def _search_in_file(self, file_path: str, pattern: re.Pattern,
+                        contents: Optional[bytes] = None,
+                        file_size: Optional[int] = None) -> bool:
+        """
+        Быстрый поиск в файле с использованием memory-mapped I/O или GPU
+        
+        contents - уже прочитанное через io_uring содержимое небольшого файла
+        (тогда файл не открывается), file_size - размер из stat при обходе
+        (передается GPU движку вместо повторного stat).
+        """
         try:
             # Проверка на остановку
             if self.stop_flag.is_set():
@@ -278,83 +847,48 @@ class FileSearchEngine:
             
             # Если GPU доступна, используем гибридный движок
             if self.use_gpu and self.gpu_engine:
-                return self.gpu_engine.search_in_file(file_path, pattern)
-            
-            # Иначе стандартный CPU поиск
-            file_size = os.path.getsize(file_path)
+                if self._literal_alternatives is not None:
+                    return self.gpu_engine.multi_literal_search(file_path, self._literal_alternatives)
+                return self.gpu_engine.search_in_file(file_path, pattern, file_size)
             
-            # Ограничение размера файла для поиска в содержимом (100 МБ)
-            if file_size > 100 * 1024 * 1024:
-                return False
+            if contents is not None:
+                if contents.find(b'\x00', 0, 8192) != -1:  # Бинарный файл
+                    return False
+                return self._match_buffer(file_path, contents, len(contents), pattern)
             
-            # Пытаемся определить, является ли файл текстовым
+            # Файл открывается один раз: размер, проверка на бинарность и поиск идут по одному mmap
             with open(file_path, 'rb') as f:
-                chunk = f.read(8192)
-                if b'\x00' in chunk:  # Бинарный файл
+                file_size = os.fstat(f.fileno()).st_size
+                
+                # Ограничение размера файла для поиска в содержимом (100 МБ).
+                # Поиск подстроки и Hyperscan не подвержены зависаниям, для них ограничения нет
+                linear_scan = self._literal_needle is not None or self._hs_db is not None
+                if not linear_scan and file_size > 100 * 1024 * 1024:
                     return False
                 
-                # Для небольших файлов (<8KB)
-                if len(chunk) < 8192:
-                    try:
-                        text = chunk.decode('utf-8', errors='ignore')
-                        return bool(pattern.search(text))
-                    except:
+                # Пустой файл нельзя отобразить в память
+                if file_size == 0:
+                    if self._literal_needle is not None:
                         return False
-            
-            # Для средних файлов (до 5 МБ) читаем полностью
-            # Но ограничиваем еще сильнее если regex сложный
-            safe_limit = 5 * 1024 * 1024  # 5 МБ для обычных регулярок
-            if self._is_dangerous_pattern(pattern):
-                safe_limit = 1 * 1024 * 1024  # 1 МБ для опасных
-            
-            if file_size <= safe_limit:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                    text = content.decode('utf-8', errors='ignore')
-                    
-                    # Проверка на остановку перед regex
-                    if self.stop_flag.is_set():
+                    if self._hs_db is not None:
+                        return self._hyperscan_match(b'')
+                    return self._search_buffer(self._pcre2_pattern or pattern, b'')
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped:
+                    # Пытаемся определить, является ли файл текстовым (memchr по первым 8 КБ)
+                    if mmapped.find(b'\x00', 0, 8192) != -1:  # Бинарный файл
                         return False
                     
-                    # Применяем regex к небольшому тексту
-                    try:
-                        return bool(pattern.search(text))
-                    except Exception as e:
-                        print(f"⚠️ Regex ошибка в {os.path.basename(file_path)}: {e}")
-                        return False
-            
-            # Для больших файлов используем mmap и чанки
-            with open(file_path, 'rb') as f:
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped:
-                    # Размер чанка зависит от сложности regex
-                    if self._is_dangerous_pattern(pattern):
-                        chunk_size = 512 * 1024  # 512 КБ для опасных regex
-                    else:
-                        chunk_size = 5 * 1024 * 1024  # 5 МБ для обычных
+                    # Большие файлы читаются последовательно - подсказываем ядру расширить readahead
+                    if file_size >= self.fadvise_min_size:
+                        self._advise_sequential(f.fileno(), mmapped, file_size)
                     
-                    for offset in range(0, file_size, chunk_size):
-                        # Проверка на остановку
-                        if self.stop_flag.is_set():
-                            return False
-                        
-                        # Читаем чанк с перекрытием (чтобы не пропустить совпадения на границе)
-                        overlap = 1024  # 1KB перекрытие
-                        start = max(0, offset - overlap)
-                        end = min(file_size, offset + chunk_size)
-                        
-                        chunk_bytes = mmapped[start:end]
-                        text = chunk_bytes.decode('utf-8', errors='ignore')
-                        
-                        # Применяем regex к чанку с защитой от ошибок
-                        try:
-                            if pattern.search(text):
-                                return True
-                        except Exception as e:
-                            print(f"⚠️ Regex timeout/error в чанке {offset//chunk_size}: {e}")
-                            # Пропускаем проблемный чанк
-                            continue
-                    
-                    return False
+                    try:
+                        return self._match_buffer(file_path, mmapped, file_size, pattern)
+                    finally:
+                        # Очень большие файлы повторно не читаются - не вытесняем ими кэш страниц
+                        if file_size >= self.fadvise_dontneed_size:
+                            self._advise_dontneed(f.fileno(), file_size)
                     
         except (PermissionError, OSError, UnicodeDecodeError, ValueError):
             return False
@@ -363,9 +897,394 @@ class FileSearchEngine:
             print(f"⚠️ Ошибка при поиске в {file_path}: {e}")
             return False
     
-    def _is_dangerous_pattern(self, pattern: re.Pattern) -> bool:
-        """Проверяет, является ли скомпилированный паттерн опасным"""
-        pattern_str = pattern.pattern
+    def _match_buffer(self, file_path: str, data, file_size: int, pattern: re.Pattern) -> bool:
+        """Выбирает движок и ищет в содержимом файла (mmap или bytes)"""
+        # Литерал ищем SIMD поиском подстроки прямо по буферу
+        if self._literal_needle is not None:
+            return self._find_literal(data)
+        
+        # Hyperscan сканирует байты напрямую, без декодирования и ограничений размера
+        if self._hs_db is not None:
+            return self._hyperscan_match(data)
+        
+        # PCRE2 JIT вместо интерпретатора re
+        if self._pcre2_pattern is not None:
+            pattern = self._pcre2_pattern
+        
+        # Двухступенчатый поиск: без обязательной подстроки в байтах запускать regex незачем
+        if (self._prefilter_needle is not None
+                and not self._find_literal(data, self._prefilter_needle)):
+            return False
+        
+        return self._search_mmap(file_path, data, file_size, pattern)
+    
+    @staticmethod
+    def _advise_sequential(fd: int, mmapped: mmap.mmap, file_size: int):
+        """Сообщает ядру о последовательном чтении файла (только POSIX)"""
+        try:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, file_size, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mmapped.madvise(mmap.MADV_SEQUENTIAL)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _advise_dontneed(fd: int, file_size: int):
+        """Освобождает страницы просканированного файла из кэша (только POSIX)"""
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(fd, 0, file_size, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+    
+    def _search_mmap(self, file_path: str, mmapped, file_size: int, pattern: re.Pattern) -> bool:
+        """Стандартный CPU поиск regex по отображенному в память файлу"""
+        # Небольшие и средние файлы (до 5 МБ, 1 МБ для опасных regex) проверяем целиком
+        if file_size <= self._safe_limit:
+            # Проверка на остановку перед regex
+            if self.stop_flag.is_set():
+                return False
+            
+            # Применяем regex к небольшому тексту
+            try:
+                return self._search_buffer(self._thread_pattern(pattern), mmapped)
+            except Exception as e:
+                print(f"⚠️ Regex ошибка в {os.path.basename(file_path)}: {e}")
+                return False
+        
+        # Совпадение не помещается в перекрытие чанков - один проход по всему файлу
+        if self._scan_overlap is None:
+            return self._scan_mmap_range(mmapped, 0, file_size, pattern, file_size)
+        
+        # Для больших файлов - чанки, размер зависит от сложности regex
+        chunk_size = self._chunk_size
+        
+        # Очень большие файлы сканируем параллельно несколькими шардами
+        if file_size >= self.parallel_scan_threshold and self.max_workers > 1:
+            return self._search_mmap_parallel(mmapped, file_size, pattern, chunk_size)
+        
+        return self._scan_mmap_range(mmapped, 0, file_size, pattern, chunk_size)
+    
+    def _scan_mmap_range(self, mmapped, range_start: int, range_end: int,
+                         pattern: re.Pattern, chunk_size: int,
+                         cancel: Optional[threading.Event] = None) -> bool:
+        """Последовательно сканирует диапазон [range_start, range_end) mmap чанками"""
+        overlap = self._scan_overlap or 0
+        pattern = self._thread_pattern(pattern)
+        stop_is_set = self.stop_flag.is_set
+        cancel_is_set = cancel.is_set if cancel is not None else None
+        
+        for offset in range(range_start, range_end, chunk_size):
+            # Проверка на остановку
+            if stop_is_set() or (cancel_is_set is not None and cancel_is_set()):
+                return False
+            
+            # Читаем чанк с перекрытием (чтобы не пропустить совпадения на границе)
+            start = max(0, offset - overlap)
+            end = min(range_end, offset + chunk_size)
+            
+            # Применяем regex к чанку с защитой от ошибок
+            try:
+                if self._search_buffer(pattern, mmapped, start, end):
+                    return True
+            except Exception as e:
+                print(f"⚠️ Regex timeout/error в чанке {offset//chunk_size}: {e}")
+                # Пропускаем проблемный чанк
+                continue
+        
+        return False
+    
+    def _search_mmap_parallel(self, mmapped, file_size: int, pattern: re.Pattern,
+                              chunk_size: int) -> bool:
+        """
+        Делит файл на max_workers шардов с перекрытием и сканирует их параллельно
+        
+        Возвращает True на первом найденном совпадении, остальные шарды
+        останавливаются через общий Event.
+        """
+        cancel = threading.Event()
+        shard_size = -(-file_size // self.max_workers)
+        executor = self._get_shard_executor()
+        
+        futures = [
+            executor.submit(self._scan_mmap_range, mmapped, start,
+                            min(file_size, start + shard_size), pattern, chunk_size, cancel)
+            for start in range(0, file_size, shard_size)
+        ]
+        
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if any(future.result() for future in done):
+                    return True
+            return False
+        finally:
+            # mmap закрывается вызывающим кодом - дожидаемся остановки всех шардов
+            cancel.set()
+            wait(futures)
+    
+    def _get_shard_executor(self) -> ThreadPoolExecutor:
+        """Возвращает (создавая при первом обращении) пул для шардов больших файлов"""
+        with self._shard_lock:
+            if self._shard_executor is None:
+                self._shard_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._shard_executor
+    
+    def _thread_pattern(self, pattern):
+        """
+        Копия паттерна RE2 или модуля regex для текущего потока
+        
+        Объект RE2 защищает свой кэш DFA мьютексом, модуль regex переиспользует
+        буферы паттерна под блокировкой - общий для всех потоков паттерн
+        сериализует их поиск. Паттерны re и PCRE2 общего состояния не имеют.
+        """
+        is_re2 = RE2_AVAILABLE and isinstance(pattern, _RE2_PATTERN_TYPE)
+        if not is_re2 and not (REGEX_MODULE_AVAILABLE and isinstance(pattern, regex.Pattern)):
+            return pattern
+        
+        # Паттерн содержимого один на поиск, _pattern_local пересоздается в search()
+        copy = getattr(self._pattern_local, 'pattern', None)
+        if copy is None:
+            if is_re2:
+                # re2.compile вернул бы тот же объект из кэша - создаем через конструктор
+                copy = type(pattern)(pattern.pattern, pattern.options)
+            else:
+                # Без cache_pattern=False regex.compile вернул бы тот же объект из кэша
+                copy = regex.compile(pattern.pattern, pattern.flags, cache_pattern=False)
+            self._pattern_local.pattern = copy
+        return copy
+    
+    @staticmethod
+    def _search_buffer(pattern: re.Pattern, data, start: int = 0, end: Optional[int] = None) -> bool:
+        """
+        Ищет паттерн в буфере (bytes/mmap)
+        
+        bytes паттерн применяется к буферу напрямую, без копирования,
+        str паттерн - к декодированному тексту. Биндинг PCRE2 принимает только bytes
+        (остальное копирует целиком): bytes ищутся по смещениям, из mmap копируется только
+        диапазон (паттерны PCRE2 без якорей - см. _compile_pcre2).
+        """
+        if end is None:
+            end = len(data)
+        if PCRE2_AVAILABLE and isinstance(pattern, pcre2.Pattern):
+            if isinstance(data, bytes):
+                return pattern.search(data, start, end) is not None
+            return pattern.search(data[start:end]) is not None
+        if isinstance(pattern.pattern, bytes):
+            return pattern.search(data, start, end) is not None
+        # Декодируем прямо из среза memoryview, без промежуточной копии bytes
+        with memoryview(data) as view:
+            text = str(view[start:end], 'utf-8', 'ignore')
+        if REGEX_MODULE_AVAILABLE and isinstance(pattern, regex.Pattern):
+            # Модуль regex ищет без GIL и прерывает поиск по таймауту (TimeoutError)
+            return pattern.search(text, concurrent=True, timeout=REGEX_TIMEOUT) is not None
+        return pattern.search(text) is not None
+    
+    @staticmethod
+    def _pattern_max_width(pattern: re.Pattern) -> int:
+        """Максимальная длина совпадения паттерна в байтах (MAXREPEAT если не ограничена)"""
+        try:
+            width = sre_parse.parse(pattern.pattern, pattern.flags).getwidth()[1]
+        except Exception:
+            return sre_parse.MAXREPEAT
+        # Символ в UTF-8 занимает до 4 байт
+        return width * 4
+    
+    @staticmethod
+    def _utf8_bytes_compatible(content_regex: str, ignore_case: bool = False) -> bool:
+        """Можно ли искать паттерн по UTF-8 байтам вместо текста (см. byte_patterns)"""
+        return utf8_bytes_compatible(content_regex, re.IGNORECASE if ignore_case else 0)
+    
+    @staticmethod
+    def _extract_literal(content_regex: str, case_sensitive: bool) -> Optional[bytes]:
+        """
+        Возвращает искомую строку в UTF-8, если регулярка состоит только из литералов
+        
+        Поиск без учета регистра возможен только для строк без букв
+        (цифры, знаки), иначе нужен regex движок.
+        """
+        try:
+            parsed = sre_parse.parse(content_regex)
+        except Exception:
+            return None
+        
+        if not parsed or any(op is not sre_parse.LITERAL for op, _ in parsed):
+            return None
+        
+        literal = ''.join(chr(value) for _, value in parsed)
+        ignore_case = not case_sensitive or parsed.state.flags & re.IGNORECASE
+        if ignore_case and literal.lower() != literal.upper():
+            return None
+        
+        return literal.encode('utf-8')
+    
+    @staticmethod
+    def _extract_literal_alternatives(content_regex: str, case_sensitive: bool,
+                                      max_alternatives: int = 1000) -> Optional[List[bytes]]:
+        """
+        Раскрывает паттерн из литералов, альтернатив и классов символов
+        (alt1|alt2|...|altN) в список строк UTF-8
+        
+        Возвращает None, если в паттерне есть другие конструкции,
+        вариантов слишком много или нужен поиск без учета регистра по буквам.
+        """
+        try:
+            parsed = sre_parse.parse(content_regex)
+        except Exception:
+            return None
+        
+        def expand(nodes) -> Optional[List[str]]:
+            variants = ['']
+            for op, av in nodes:
+                if op is sre_parse.LITERAL:
+                    options = [chr(av)]
+                elif op is sre_parse.BRANCH:
+                    options = []
+                    for branch in av[1]:
+                        branch_variants = expand(branch)
+                        if branch_variants is None:
+                            return None
+                        options.extend(branch_variants)
+                elif op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+                    # Группа без флагов
+                    options = expand(av[3])
+                    if options is None:
+                        return None
+                elif op is sre_parse.IN and all(item_op is sre_parse.LITERAL for item_op, _ in av):
+                    options = [chr(value) for _, value in av]
+                else:
+                    return None
+                
+                variants = [prefix + option for prefix in variants for option in options]
+                if len(variants) > max_alternatives:
+                    return None
+            return variants
+        
+        alternatives = expand(parsed)
+        if not alternatives or '' in alternatives:
+            return None
+        
+        ignore_case = not case_sensitive or parsed.state.flags & re.IGNORECASE
+        if ignore_case and any(alt.lower() != alt.upper() for alt in alternatives):
+            return None
+        
+        return list(dict.fromkeys(alt.encode('utf-8') for alt in alternatives))
+    
+    @staticmethod
+    def _required_literal(content_regex: str, case_sensitive: bool) -> Optional[bytes]:
+        """
+        Самая длинная цепочка литералов верхнего уровня паттерна в UTF-8
+        
+        Любое совпадение паттерна содержит эту подстроку, поэтому ее отсутствие
+        в байтах файла позволяет пропустить декодирование и regex.
+        При поиске без учета регистра подходят только строки без букв.
+        """
+        try:
+            parsed = sre_parse.parse(content_regex)
+        except Exception:
+            return None
+        
+        ignore_case = not case_sensitive or parsed.state.flags & re.IGNORECASE
+        best = ''
+        run = []
+        for op, av in list(parsed) + [(None, None)]:
+            if op is sre_parse.LITERAL and not (ignore_case and chr(av).lower() != chr(av).upper()):
+                run.append(chr(av))
+                continue
+            if len(run) > len(best):
+                best = ''.join(run)
+            run = []
+        
+        return best.encode('utf-8') if best else None
+    
+    def _find_literal(self, data, needle: Optional[bytes] = None) -> bool:
+        """Ищет литерал в буфере (StringZilla если установлен, иначе memmem в CPython)"""
+        if needle is None:
+            needle = self._literal_needle
+        if not STRINGZILLA_AVAILABLE:
+            return data.find(needle) != -1
+        
+        # Str держит буфер только внутри выражения, view освобождается до закрытия mmap
+        with memoryview(data) as view:
+            return stringzilla.Str(view).find(needle) != -1
+    
+    def _compile_hyperscan(self, content_regex: str, case_sensitive: bool):
+        """
+        Компилирует регулярку в базу Hyperscan
+        
+        Returns:
+            hyperscan.Database или None, если Hyperscan недоступен
+            или паттерн им не поддерживается (backreferences, lookaround и т.п.)
+        """
+        # Hyperscan сравнивает байты (caseless - только ASCII): берем паттерны, которые
+        # на UTF-8 байтах находят то же, что re на тексте. \w, '.', классы и т.п.
+        # остаются на стандартном re
+        if not HYPERSCAN_AVAILABLE:
+            return None
+        pattern_bytes = utf8_pattern_bytes(content_regex, 0 if case_sensitive else re.IGNORECASE)
+        # \Z в Hyperscan совпадает и перед завершающим переводом строки, в re - только в конце
+        if pattern_bytes is None or b'\\Z' in pattern_bytes:
+            return None
+        
+        # ALLOWEMPTY: паттерн, совпадающий с пустой строкой, находится в каждом
+        # текстовом файле - как re.search
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY
+        if not case_sensitive:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(expressions=[pattern_bytes], flags=[flags])
+            return db
+        except hyperscan.error:
+            return None
+    
+    @classmethod
+    def _compile_pcre2(cls, content_regex: str, case_sensitive: bool):
+        """
+        Компилирует регулярку PCRE2 с JIT
+        
+        Returns:
+            pcre2.Pattern или None, если PCRE2 недоступен или синтаксис
+            паттерна трактуется PCRE2 иначе, чем модулем re
+        """
+        # Работаем по байтам без PCRE2_UTF: в режиме UTF невалидный UTF-8 в файле - ошибка
+        # поиска, а не пропуск. Берем только паттерны, которые на байтах находят то же,
+        # что re на тексте. POSIX классы [: :] в PCRE2 означают другое.
+        # Биндинг ищет только по bytes: большой mmap сканируется копиями чанков, в которых
+        # ^ \A совпали бы в начале, а $ \Z в конце каждого чанка - паттерны с якорями
+        # и lookaround остаются на re, который ищет по mmap со смещениями
+        if (not PCRE2_AVAILABLE or '[:' in content_regex
+                or has_position_assertions(content_regex, 0 if case_sensitive else re.IGNORECASE)):
+            return None
+        pattern_bytes = utf8_pattern_bytes(content_regex, 0 if case_sensitive else re.IGNORECASE)
+        if pattern_bytes is None:
+            return None
+        
+        flags = 0 if case_sensitive else pcre2.IGNORECASE
+        try:
+            return pcre2.compile(pattern_bytes, flags=flags, jit=True)
+        except pcre2.LibraryError:
+            return None
+    
+    def _hyperscan_match(self, data) -> bool:
+        """Сканирует буфер (bytes/mmap) базой Hyperscan"""
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(self._hs_db)
+            self._hs_local.scratch = scratch
+        
+        try:
+            self._hs_db.scan(data, match_event_handler=hs_stop_on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+    
+    def _is_dangerous_pattern(self, pattern_str: str) -> bool:
+        """Проверяет, является ли паттерн опасным"""
         
         # Опасные конструкции
         dangerous = [
@@ -392,9 +1311,262 @@ class FileSearchEngine:
         return None
 
 
+# Символы классов \d, \s, \w (ASCII часть - для проверки пересечения достаточно)
+_CATEGORY_CHARS = {
+    sre_parse.CATEGORY_DIGIT: frozenset(map(ord, string.digits)),
+    sre_parse.CATEGORY_SPACE: frozenset(map(ord, string.whitespace)),
+    sre_parse.CATEGORY_WORD: frozenset(map(ord, string.ascii_letters + string.digits + '_')),
+    sre_parse.CATEGORY_LINEBREAK: frozenset((ord('\n'),)),
+}
+
+
+def _class_chars(items) -> Optional[set]:
+    """Символы класса [...] (None - любой символ)"""
+    chars = set()
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.add(av)
+        elif op is sre_parse.RANGE and av[1] - av[0] <= 1024:
+            chars.update(range(av[0], av[1] + 1))
+        elif op is sre_parse.CATEGORY and av in _CATEGORY_CHARS:
+            chars |= _CATEGORY_CHARS[av]
+        else:
+            return None  # NEGATE, широкие диапазоны и \D, \S, \W
+    return chars
+
+
+def _first_chars(nodes) -> Tuple[Optional[set], bool]:
+    """
+    Символы, с которых может начаться совпадение последовательности
+    
+    Returns:
+        (множество кодов символов или None - любой символ, может ли совпадение быть пустым)
+    """
+    first = set()
+    for op, av in nodes:
+        if op is sre_parse.LITERAL:
+            chars, nullable = {av}, False
+        elif op is sre_parse.IN:
+            chars, nullable = _class_chars(av), False
+        elif op is sre_parse.SUBPATTERN:
+            chars, nullable = _first_chars(av[3])
+        elif op is sre_parse.BRANCH:
+            chars, nullable = set(), False
+            for branch in av[1]:
+                branch_chars, branch_nullable = _first_chars(branch)
+                chars = None if chars is None or branch_chars is None else chars | branch_chars
+                nullable = nullable or branch_nullable
+        elif op in REPEAT_OPS or op is getattr(sre_parse, 'POSSESSIVE_REPEAT', None):
+            chars, nullable = _first_chars(av[2])
+            nullable = nullable or av[0] == 0
+        elif op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            chars, nullable = _first_chars(av)
+        elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            chars, nullable = set(), True
+        else:
+            chars, nullable = None, False  # ., [^x], обратные ссылки
+        
+        first = None if first is None or chars is None else first | chars
+        if not nullable:
+            return first, False
+    return first, True
+
+
+def _chars_overlap(a: Optional[set], b: Optional[set]) -> bool:
+    """Пересекаются ли множества символов (None - любой символ)"""
+    if a is None:
+        return b is None or bool(b)
+    if b is None:
+        return bool(a)
+    return not a.isdisjoint(b)
+
+
+def _trailing_repeats(nodes):
+    """Символы неограниченных повторов, которыми может заканчиваться последовательность"""
+    for op, av in reversed(nodes):
+        if op in REPEAT_OPS and av[1] == sre_parse.MAXREPEAT:
+            yield _first_chars(av[2])[0]
+        elif op is sre_parse.SUBPATTERN:
+            yield from _trailing_repeats(av[3])
+        elif op is sre_parse.BRANCH:
+            for branch in av[1]:
+                yield from _trailing_repeats(branch)
+        
+        if not _first_chars([(op, av)])[1]:
+            return
+
+
+def _flatten_groups(nodes) -> list:
+    """Последовательность узлов, в которой содержимое групп (...) раскрыто на месте"""
+    flat = []
+    for op, av in nodes:
+        if op is sre_parse.SUBPATTERN:
+            flat.extend(_flatten_groups(av[3]))
+        else:
+            flat.append((op, av))
+    return flat
+
+
+def _ambiguous_branch(alternatives, follow: Optional[set]) -> bool:
+    """
+    Может ли одна и та же строка пройти через разные альтернативы
+    
+    sre_parse выносит общий префикс альтернатив: (a|a) разбирается как a(?:|),
+    (a|aa) - как a(?:|a). Пустая альтернатива начинается с того, что идет после
+    нее (follow), поэтому две пустые альтернативы неоднозначны всегда, а пустая
+    и непустая - если follow пересекается с началом непустой.
+    """
+    firsts = []
+    nullable_count = 0
+    for alternative in alternatives:
+        chars, nullable = _first_chars(alternative)
+        if nullable:
+            nullable_count += 1
+            chars = None if chars is None or follow is None else chars | follow
+        firsts.append(chars)
+    if nullable_count > 1:
+        return True
+    return any(_chars_overlap(a, b) for i, a in enumerate(firsts) for b in firsts[i + 1:])
+
+
+def _has_ambiguous_repeat(nodes) -> bool:
+    """
+    Ищет неоднозначные неограниченные повторы (экспоненциальный backtracking)
+    
+    Повтор (...)+ / (...)* опасен, если внутри его тела одну и ту же строку
+    можно разбить на итерации несколькими способами:
+    - тело заканчивается повтором, символы которого пересекаются с началом тела: (a+)+, (\w+\s?)*
+    - в теле подряд идут повторы с пересекающимися символами: (x+x+)+
+    - альтернативы тела совпадают или начинаются с общих символов (с учетом
+      вынесенного sre_parse префикса): (a|a)*, (ab|ab)*, (a|aa)*
+    Атомарные группы и possessive квантификаторы не откатываются и пропускаются.
+    """
+    for op, av in nodes:
+        if op in REPEAT_OPS:
+            body = av[2]
+            if av[1] == sre_parse.MAXREPEAT:
+                body_first = _first_chars(body)[0]
+                if any(_chars_overlap(chars, body_first) for chars in _trailing_repeats(body)):
+                    return True
+                
+                # Группы раскрываются: ((x+)(x+))+ и (a|a)* проверяются как x+x+ и a(?:|)
+                flat_body = _flatten_groups(body)
+                previous = None
+                for body_op, body_av in flat_body:
+                    if body_op in REPEAT_OPS and body_av[1] == sre_parse.MAXREPEAT:
+                        chars = _first_chars(body_av[2])[0]
+                        if previous is not None and _chars_overlap(previous, chars):
+                            return True
+                        previous = chars
+                    elif not _first_chars([(body_op, body_av)])[1]:
+                        previous = None
+                
+                for index, (body_op, body_av) in enumerate(flat_body):
+                    if body_op is sre_parse.BRANCH:
+                        # После альтернативы идет остаток тела, за ним - следующая итерация
+                        follow, rest_nullable = _first_chars(flat_body[index + 1:])
+                        if rest_nullable:
+                            follow = None if follow is None or body_first is None else follow | body_first
+                        if _ambiguous_branch(body_av[1], follow):
+                            return True
+            
+            if _has_ambiguous_repeat(body):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            if _has_ambiguous_repeat(av[3]):
+                return True
+        elif op is sre_parse.BRANCH:
+            if any(_has_ambiguous_repeat(branch) for branch in av[1]):
+                return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _has_ambiguous_repeat(av[1]):
+                return True
+    return False
+
+
+@functools.lru_cache(maxsize=256)
+def _is_catastrophic_regex(regex_str: str) -> bool:
+    """Структурная проверка регулярки на катастрофический backtracking (по дереву sre_parse)"""
+    try:
+        return _has_ambiguous_repeat(sre_parse.parse(regex_str))
+    except Exception:
+        # Синтаксические ошибки сообщит компиляция в FileSearchEngine
+        return False
+
+
+# Содержимое классов \w, \d, \s модуля re (Unicode) в синтаксисе RE2
+_RE2_CLASS_ITEMS = {
+    'w': r'\p{L}\p{N}_',
+    'd': r'\p{Nd}',
+    's': r'\t\n\v\f\r\x1c-\x1f\x85\p{Z}',
+}
+
+
+def _re2_unicode_pattern(regex_str: str) -> Optional[str]:
+    """
+    Переписывает \w, \d, \s (и \W, \D, \S) паттерна re в Unicode классы RE2
+    
+    В RE2 эти классы только ASCII, в re (str) - Unicode: без замены RE2 не находит
+    кириллицу по \w. None, если точной замены нет: \b и \B (в RE2 тоже ASCII)
+    и \W, \D, \S внутри [...].
+    """
+    out = []
+    in_class = False
+    i = 0
+    n = len(regex_str)
+    while i < n:
+        char = regex_str[i]
+        if char == '\\' and i + 1 < n:
+            escaped = regex_str[i + 1]
+            i += 2
+            items = _RE2_CLASS_ITEMS.get(escaped.lower())
+            if items is not None:
+                negated = escaped.isupper()
+                if in_class:
+                    if negated:
+                        return None
+                    out.append(items)
+                else:
+                    out.append(('[^%s]' if negated else '[%s]') % items)
+            elif escaped in 'bB' and not in_class:
+                return None
+            else:
+                out.append(char + escaped)
+            continue
+        out.append(char)
+        i += 1
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # ^ и ] сразу после [ - часть класса, а не его конец
+            if regex_str.startswith('^', i):
+                out.append('^')
+                i += 1
+            if regex_str.startswith(']', i):
+                out.append(']')
+                i += 1
+    return ''.join(out)
+
+
 class FileSearcherApp(ctk.CTk):
     """Главное окно приложения"""
     
+    # Число подряд неудачных опросов GPU, после которого мониторинг отключается
+    GPU_MAX_FAIL_STREAK = 10
+    # nvidia-smi без новых замеров дольше этого (с) считается зависшим и перезапускается с паузой
+    SMI_STALL_TIMEOUT = 2.0
+    SMI_RETRY_DELAY_MS = 30000
+    # Вставка найденных файлов в таблицу: период таймера и размер пачки
+    RESULTS_FLUSH_INTERVAL_MS = 50
+    RESULTS_FLUSH_BATCH = 500
+    # Колонка таблицы -> индекс колонки-ключа сортировки в _sort_columns()
+    SORT_FIELDS = {"size": 0, "modified": 1, "filename": 2, "path": 3}
+    # Задержка фильтра после последнего нажатия клавиши
+    FILTER_DEBOUNCE_MS = 150
+    # Число строк, одновременно вставленных в таблицу (Treeview не виртуализирован)
+    RENDER_WINDOW = 500
+    
     def __init__(self):
         super().__init__()
         
@@ -432,13 +1604,57 @@ class FileSearcherApp(ctk.CTk):
         
         # Переменные
         self.search_engine = FileSearchEngine()
+        # GPU движок один на все время работы: его пул процессов и кэши живут между поисками
+        self._gpu_engine = None
+        self._nvml_handle = self._init_nvml() if GPU_AVAILABLE else None
         self.search_thread = None
-        self.results = []
-        self.filtered_results = []
+        # Найденные файлы в колонках (номер строки = iid в таблице) и имена в нижнем регистре
+        # для фильтра. Удаленные строки остаются в колонках, но убираются из _row_by_path
+        self._results = SearchResults()
+        self._result_names = []
+        # Путь -> номер строки для найденных и не удаленных файлов
+        self._row_by_path = {}
+        # Строки, прошедшие фильтр: множество и список в порядке отображения.
+        # В таблицу вставлено только окно RENDER_WINDOW строк списка, начиная с _window_start
+        self._visible_rows = set()
+        self._view_rows = []
+        self._window_start = 0
+        self._filter_after_id = None
+        # Триграммный индекс имен для фильтра: триграмма -> множество номеров строк
+        self._name_trigrams = defaultdict(set)
+        # Фильтр и сортировка считаются в отдельном потоке, в GUI потоке - только вызовы Tk.
+        # Номер запроса отбрасывает устаревшие результаты при быстрых повторных вызовах
+        self._ui_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-compute")
+        self._filter_generation = 0
+        self._sort_generation = 0
+        # Последний примененный фильтр: (текст, подошедшие строки, известные на тот момент строки).
+        # При дописывании текста новый результат - подмножество старого
+        self._last_filter = ("", None, None)
+        # Результаты из потоков поиска, вставляемые в таблицу пачками по таймеру
+        self._pending_results = queue.SimpleQueue()
+        # Последний прогресс (обработано, всего) от потоков поиска - применяется тем же таймером
+        self._pending_progress = None
+        self._last_found_name = ""
+        self._results_flush_id = None
         self.is_searching = False
         self.sort_column = None
         self.sort_reverse = False
         self.gpu_monitor_active = False
+        # Фоновый nvidia-smi в режиме -lms (если pynvml недоступен) и его последний замер
+        self._smi_process = None
+        self._latest_gpu_load = (-1.0, -1.0)
+        self._latest_gpu_load_time = 0.0
+        self._smi_failure_logged = False
+        # Состояние цикла опроса GPU: отложенный вызов, серия ошибок, последнее действие пользователя
+        self._gpu_monitor_after_id = None
+        self._gpu_fail_streak = 0
+        self._last_activity = time.monotonic()
+        # Необязательные виджеты (создаются в _create_widgets только при наличии GPU и т.п.)
+        self.gpu_model_label = None
+        self.gpu_load_label = None
+        self.gpu_check = None
+        self.io_uring_check = None
+        self.filter_entry = None
         
         # Создаем интерфейс
         self._create_widgets()
@@ -450,6 +1666,21 @@ class FileSearcherApp(ctk.CTk):
         if GPU_AVAILABLE:
             self._start_gpu_monitoring()
         
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+    
+    def _on_close(self):
+        """Останавливает фоновый мониторинг и закрывает окно"""
+        self._stop_gpu_monitoring()
+        # cancel_futures появился в Python 3.9
+        if sys.version_info >= (3, 9):
+            self._ui_exec.shutdown(wait=False, cancel_futures=True)
+        else:
+            self._ui_exec.shutdown(wait=False)
+        # Пул процессов GPU движка живет между поисками - останавливается с приложением
+        if self._gpu_engine is not None:
+            self._gpu_engine.close()
+        self.destroy()
+        
     def _create_widgets(self):
         """Создает все виджеты интерфейса"""
         
@@ -553,6 +1784,12 @@ class FileSearcherApp(ctk.CTk):
         
         self.threads_slider.configure(command=self._update_threads_label)
         
+        # Батчевые системные вызовы (Linux): выгодны на холодном кэше и сетевых ФС
+        if IO_URING_AVAILABLE:
+            self.io_uring_check = ctk.CTkCheckBox(threads_frame,
+                                                  text="Пакетный обход через io_uring")
+            self.io_uring_check.pack(anchor="w", padx=5, pady=2)
+        
         # GPU ускорение
         gpu_frame = ctk.CTkFrame(left_panel)
         gpu_frame.pack(fill="x", padx=10, pady=5)
@@ -574,13 +1811,9 @@ class FileSearcherApp(ctk.CTk):
         
         # Информация о GPU - показываем если GPU доступна
         if GPU_AVAILABLE:
-            # Модель GPU
-            if GPU_NAME:
-                gpu_model_text = f"🎮 {GPU_NAME}"
-                if GPU_MEMORY:
-                    gpu_model_text += f" ({GPU_MEMORY:.1f} ГБ)"
-            else:
-                gpu_model_text = "🎮 GPU обнаружена (модель определяется...)"
+            # Модель GPU определяется в фоне, метку обновит цикл мониторинга
+            gpu_model_text = "🎮 GPU обнаружена (модель определяется...)"
+            threading.Thread(target=_detect_gpu, daemon=True).start()
             
             self.gpu_model_label = ctk.CTkLabel(gpu_frame, 
                                                text=gpu_model_text,
@@ -678,7 +1911,7 @@ class FileSearcherApp(ctk.CTk):
         
         self.filter_entry = ctk.CTkEntry(filter_frame, placeholder_text="Фильтр по имени файла...")
         self.filter_entry.pack(side="left", fill="x", expand=True, padx=5)
-        self.filter_entry.bind("<KeyRelease>", lambda e: self._apply_filter())
+        self.filter_entry.bind("<KeyRelease>", lambda e: self._schedule_filter())
         
         ctk.CTkButton(filter_frame, text="❌", width=40,
                      command=self._clear_filter).pack(side="right", padx=5)
@@ -714,11 +1947,13 @@ class FileSearcherApp(ctk.CTk):
         self.results_tree = ttk.Treeview(table_frame,
                                         columns=columns,
                                         show="headings",
-                                        yscrollcommand=scrollbar_y.set,
+                                        yscrollcommand=self._on_tree_yscroll,
                                         xscrollcommand=scrollbar_x.set,
-                                        selectmode="browse")
+                                        selectmode="extended")
         
-        scrollbar_y.config(command=self.results_tree.yview)
+        # Вертикальный скроллбар показывает позицию во всем списке, а не в окне таблицы
+        self._scrollbar_y = scrollbar_y
+        scrollbar_y.config(command=self._on_scrollbar_y)
         scrollbar_x.config(command=self.results_tree.xview)
         
         # Настройка колонок
@@ -750,6 +1985,7 @@ class FileSearcherApp(ctk.CTk):
         # Биндинги для таблицы
         self.results_tree.bind("<Double-1>", lambda e: self._open_selected_file())
         self.results_tree.bind("<Button-3>", self._show_context_menu)
+        self.results_tree.bind("<Delete>", lambda e: self._remove_selected())
         
         # Footer с авторством
         footer_frame = ctk.CTkFrame(right_panel, height=30)
@@ -765,40 +2001,56 @@ class FileSearcherApp(ctk.CTk):
         """Обновляет метку количества потоков"""
         self.threads_label.configure(text=f"Потоков: {int(value)}")
     
+    @staticmethod
+    def _init_nvml():
+        """
+        Инициализирует NVML один раз за время работы приложения
+        
+        Returns:
+            Дескриптор первой GPU или None, если pynvml/драйвер недоступны
+        """
+        if not PYNVML_AVAILABLE:
+            return None
+        try:
+            pynvml.nvmlInit()
+            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        except pynvml.NVMLError:
+            return None
+        atexit.register(pynvml.nvmlShutdown)
+        return handle
+    
     def _get_gpu_load(self) -> Tuple[float, float]:
         """
-        Получает загрузку GPU и использование памяти
+        Получает загрузку GPU и использование памяти через NVML
+        (без pynvml - последний замер потокового nvidia-smi)
         Returns: (gpu_utilization%, memory_used%)
         """
+        if self._nvml_handle is None:
+            if (self._smi_process is not None and
+                    time.monotonic() - self._latest_gpu_load_time > self.SMI_STALL_TIMEOUT):
+                # nvidia-smi завис (драйвер не отвечает) - убиваем и делаем паузу
+                self._suspend_smi_stream()
+                return -1.0, -1.0
+            return self._latest_gpu_load  # -1 означает "недоступно"
         try:
-            result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,memory.total',
-                 '--format=csv,noheader,nounits'],
-                capture_output=True, text=True, timeout=1,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                values = result.stdout.strip().split(',')
-                if len(values) >= 3:
-                    gpu_util = float(values[0].strip())
-                    mem_used = float(values[1].strip())
-                    mem_total = float(values[2].strip())
-                    mem_percent = (mem_used / mem_total) * 100 if mem_total > 0 else 0
-                    return gpu_util, mem_percent
-        except Exception as e:
+            util = pynvml.nvmlDeviceGetUtilizationRates(self._nvml_handle)
+            mem = pynvml.nvmlDeviceGetMemoryInfo(self._nvml_handle)
+            mem_percent = (mem.used / mem.total) * 100 if mem.total > 0 else 0
+            return float(util.gpu), mem_percent
+        except pynvml.NVMLError:
             # Тихо игнорируем ошибки мониторинга
-            pass
-        return -1.0, -1.0  # -1 означает "недоступно"
+            return -1.0, -1.0
     
-    def _update_gpu_load_display(self):
-        """Обновляет отображение загрузки GPU"""
-        if not GPU_AVAILABLE or not hasattr(self, 'gpu_load_label'):
-            return
+    def _update_gpu_load_display(self) -> bool:
+        """Обновляет отображение загрузки GPU (False если данные недоступны)"""
+        if not GPU_AVAILABLE or self.gpu_load_label is None:
+            return False
         
         gpu_util, mem_percent = self._get_gpu_load()
+        available = gpu_util >= 0 and mem_percent >= 0
         
         # Проверяем доступность данных
-        if gpu_util < 0 or mem_percent < 0:
+        if not available:
             # Данные недоступны
             text = "⚡ Загрузка GPU: -- | Память: --"
             color = "gray"
@@ -817,6 +2069,7 @@ class FileSearcherApp(ctk.CTk):
             text = f"⚡ Загрузка GPU: {gpu_util:.0f}% | Память: {mem_percent:.0f}%"
         
         self.gpu_load_label.configure(text=text, text_color=color)
+        return available
     
     def _start_gpu_monitoring(self):
         """Запускает периодический мониторинг GPU"""
@@ -824,70 +2077,181 @@ class FileSearcherApp(ctk.CTk):
             return
         
         self.gpu_monitor_active = True
+        if self._nvml_handle is None:
+            self._start_smi_stream()
+        
+        # Свернутое окно не опрашивает GPU
+        self.bind("<Unmap>", self._on_window_unmap, add="+")
+        self.bind("<Map>", self._on_window_map, add="+")
+        # Любое действие пользователя сбрасывает таймер простоя
+        for sequence in ("<Key>", "<Button>", "<Motion>"):
+            self.bind(sequence, self._on_user_activity, add="+")
+        
         self._gpu_monitor_loop()
     
+    def _on_user_activity(self, event=None):
+        """Запоминает время последнего действия пользователя"""
+        self._last_activity = time.monotonic()
+    
+    def _on_window_unmap(self, event):
+        """Приостанавливает опрос GPU при сворачивании окна"""
+        if event.widget is self and self._gpu_monitor_after_id is not None:
+            self.after_cancel(self._gpu_monitor_after_id)
+            self._gpu_monitor_after_id = None
+    
+    def _on_window_map(self, event):
+        """Возобновляет опрос GPU при разворачивании окна"""
+        if event.widget is self and self.gpu_monitor_active and self._gpu_monitor_after_id is None:
+            self._gpu_monitor_loop()
+    
+    def _start_smi_stream(self):
+        """
+        Запускает один долгоживущий nvidia-smi, печатающий замер каждые 500 мс
+        
+        Поток-читатель сохраняет последний замер в _latest_gpu_load,
+        поэтому опрос из GUI - просто чтение атрибута.
+        """
+        if not self.gpu_monitor_active or self._smi_process is not None:
+            return
+        try:
+            self._smi_process = subprocess.Popen(
+                ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,memory.total',
+                 '--format=csv,noheader,nounits', '-lms', '500'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=1, text=True,
+                **_HIDDEN_WINDOW
+            )
+        except OSError:
+            self._smi_process = None
+            return
+        # Отсчет простоя потока начинается с запуска процесса
+        self._latest_gpu_load_time = time.monotonic()
+        
+        threading.Thread(target=self._read_smi_stream, args=(self._smi_process,),
+                         daemon=True).start()
+    
+    def _read_smi_stream(self, process: subprocess.Popen):
+        """Читает строки nvidia-smi -lms до завершения процесса"""
+        for line in process.stdout:
+            values = line.split(',')
+            if len(values) < 3:
+                continue
+            try:
+                gpu_util = float(values[0])
+                mem_used = float(values[1])
+                mem_total = float(values[2])
+            except ValueError:
+                # Тихо игнорируем ошибки мониторинга
+                continue
+            mem_percent = (mem_used / mem_total) * 100 if mem_total > 0 else 0
+            self._latest_gpu_load = (gpu_util, mem_percent)
+            self._latest_gpu_load_time = time.monotonic()
+    
+    def _stop_gpu_monitoring(self):
+        """Останавливает мониторинг GPU и фоновый nvidia-smi"""
+        self.gpu_monitor_active = False
+        if self._gpu_monitor_after_id is not None:
+            self.after_cancel(self._gpu_monitor_after_id)
+            self._gpu_monitor_after_id = None
+        self._kill_smi_process()
+    
+    @staticmethod
+    def _reap_process(process: subprocess.Popen):
+        """Завершает дочерний процесс и дожидается его, чтобы не оставлять зомби"""
+        process.kill()
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+    
+    def _kill_smi_process(self):
+        """Останавливает фоновый nvidia-smi, если он запущен"""
+        if self._smi_process is not None:
+            self._reap_process(self._smi_process)
+            self._smi_process = None
+        self._latest_gpu_load = (-1.0, -1.0)
+    
+    def _suspend_smi_stream(self):
+        """Убивает зависший nvidia-smi и перезапускает его через SMI_RETRY_DELAY_MS"""
+        self._kill_smi_process()
+        if not self._smi_failure_logged:
+            # Сообщаем только о первом сбое, чтобы не засорять консоль
+            print("⚠️ nvidia-smi не отвечает, мониторинг GPU приостановлен")
+            self._smi_failure_logged = True
+        self.after(self.SMI_RETRY_DELAY_MS, self._start_smi_stream)
+    
     def _gpu_monitor_loop(self):
         """Цикл мониторинга GPU"""
-        if not self.gpu_monitor_active:
+        self._gpu_monitor_after_id = None
+        if not self.gpu_monitor_active or self.state() == 'iconic':
             return
         
+        available = False
         try:
             # Обновляем загрузку
-            self._update_gpu_load_display()
+            available = self._update_gpu_load_display()
             
-            # Пытаемся определить модель если еще не определена
-            if hasattr(self, 'gpu_model_label') and GPU_NAME and "определяется" in self.gpu_model_label.cget("text"):
-                gpu_model_text = f"🎮 {GPU_NAME}"
-                if GPU_MEMORY:
-                    gpu_model_text += f" ({GPU_MEMORY:.1f} ГБ)"
+            # Показываем модель, когда фоновое определение завершилось
+            if (self.gpu_model_label is not None and _detect_gpu.cache_info().currsize
+                    and "определяется" in self.gpu_model_label.cget("text")):
+                gpu_name, gpu_memory = _detect_gpu()
+                gpu_model_text = f"🎮 {gpu_name}"
+                if gpu_memory:
+                    gpu_model_text += f" ({gpu_memory:.1f} ГБ)"
                 self.gpu_model_label.configure(text=gpu_model_text)
         except Exception as e:
             pass
         
-        # Обновляем каждые 500мс во время поиска, 2 сек в простое
-        interval = 500 if self.is_searching else 2000
-        self.after(interval, self._gpu_monitor_loop)
+        # При ошибках опроса - экспоненциальная задержка 1с -> 60с, после серии ошибок опрос прекращается
+        self._gpu_fail_streak = 0 if available else self._gpu_fail_streak + 1
+        if self._gpu_fail_streak >= self.GPU_MAX_FAIL_STREAK:
+            self._stop_gpu_monitoring()
+            return
+        
+        if self._gpu_fail_streak:
+            interval = min(1000 * 2 ** (self._gpu_fail_streak - 1), 60000)
+        elif self.is_searching:
+            interval = 500
+        elif time.monotonic() - self._last_activity > 10:
+            interval = 5000  # Пользователь бездействует
+        else:
+            interval = 2000
+        self._gpu_monitor_after_id = self.after(interval, self._gpu_monitor_loop)
         
     def _is_complex_regex(self, regex_str: str) -> bool:
         """Определяет, является ли регулярка потенциально опасной (может зависнуть)"""
-        # Признаки сложных регулярок, которые могут вызвать катастрофический backtracking
-        dangerous_patterns = [
-            r'\*\s*\)',      # *)  - вложенные квантификаторы
-            r'\+\s*\)',      # +)
-            r'\*\s*\*',      # ** 
-            r'\+\s*\+',      # ++
-            r'\*\s*\+',      # *+
-            r'\+\s*\*',      # +*
-            r'\(\?\:.*\)\*', # (?:...)* - необязательная группа с *
-            r'\(\?\:.*\)\+', # (?:...)+
-            r'\[\\s\\S\]\*', # [\s\S]* - очень опасно!
-            r'\[\\s\\S\]\+', # [\s\S]+ - тоже опасно
-            r'\[\\w\\W\]\*', # [\w\W]* - аналогично
-            r'\[\\w\\W\]\+', # [\w\W]+
-            r'\[\\d\\D\]\*', # [\d\D]*
-            r'\[\\d\\D\]\+', # [\d\D]+
-            r'\.\*\?',       # .*? - ленивый квантификатор может зависнуть
-            r'\.\+\?',       # .+?
-        ]
-        
-        # Проверяем наличие опасных паттернов
-        for pattern in dangerous_patterns:
-            if re.search(pattern, regex_str):
-                return True
+        return _is_catastrophic_regex(regex_str)
+    
+    @staticmethod
+    def _compile_re2(regex_str: str, case_sensitive: bool, use_gpu: bool):
+        """
+        Компилирует регулярку RE2
         
-        # Подсчет вложенных групп и квантификаторов
-        nested_groups = regex_str.count('(')
-        quantifiers = regex_str.count('*') + regex_str.count('+') + regex_str.count('{')
+        Returns:
+            Паттерн RE2 или None, если RE2 недоступен или паттерн им не поддерживается
+            (обратные ссылки, lookaround)
+        """
+        if not RE2_AVAILABLE:
+            return None
         
-        # Если много вложенности и квантификаторов - это подозрительно
-        if nested_groups > 8 and quantifiers > 10:  # Сделал строже
-            return True
+        # \w, \d, \s в RE2 только ASCII - подставляем Unicode классы, как в re
+        regex_str = _re2_unicode_pattern(regex_str)
+        if regex_str is None:
+            return None
         
-        # Очень длинная регулярка тоже подозрительна
-        if len(regex_str) > 150:  # Сделал строже
-            return True
+        options = re2.Options()
+        options.case_sensitive = case_sensitive
+        options.never_capture = True  # Нужен только факт совпадения
+        options.log_errors = False
+        # Паттерн и текст - UTF-8: '.' и классы совпадают с символом, а не с байтом
+        options.encoding = re2.Options.Encoding.UTF8
         
-        return False
+        # В режиме UTF-8 bytes паттерн ищет по байтам файла то же, что str по тексту.
+        # GPU движок работает со str
+        pattern = regex_str if use_gpu else regex_str.encode('utf-8')
+        try:
+            return re2.compile(pattern, options)
+        except re2.error:
+            return None
     
     def _browse_directory(self):
         """Открывает диалог выбора директории"""
@@ -913,14 +2277,31 @@ class FileSearcherApp(ctk.CTk):
             extensions = [e.strip() for e in self.ext_entry.get().split(",") if e.strip()]
             content_regex = self.content_entry.get().strip() or None
             
+            case_sensitive = self.case_sensitive_check.get()
+            use_gpu = self.gpu_check.get() if self.gpu_check is not None else False
+            use_io_uring = self.io_uring_check.get() if self.io_uring_check is not None else False
+            
+            # Сложную регулярку выполняем RE2 (линейное время), предупреждение нужно
+            # только для паттернов, которые RE2 не поддерживает
+            content_regex_obj = None
+            is_complex = bool(content_regex) and self._is_complex_regex(content_regex)
+            if is_complex:
+                content_regex_obj = self._compile_re2(content_regex, case_sensitive, use_gpu)
+            
             # Предупреждение о сложных регулярках
-            if content_regex and self._is_complex_regex(content_regex):
+            if is_complex and content_regex_obj is None:
+                engine_note = (
+                    "Поиск будет выполнен модулем regex с ограничением времени на файл.\n\n"
+                    if REGEX_MODULE_AVAILABLE else ""
+                )
                 result = messagebox.askokcancel(
                     "⚠️ Сложная регулярка",
                     "Обнаружена очень сложная регулярка!\n\n"
                     "Она может работать очень медленно или зависнуть на больших файлах.\n\n"
+                    f"{engine_note}"
                     "Рекомендации:\n"
                     "• Упростите регулярку\n"
+                    "• Используйте атомарные группы (?>...) или possessive квантификаторы *+\n"
                     "• Ограничьте расширения файлов\n"
                     "• Уменьшите область поиска\n\n"
                     "Продолжить поиск?",
@@ -928,6 +2309,15 @@ class FileSearcherApp(ctk.CTk):
                 )
                 if not result:
                     return
+                
+                if REGEX_MODULE_AVAILABLE:
+                    try:
+                        content_regex_obj = regex.compile(
+                            content_regex, 0 if case_sensitive else regex.IGNORECASE
+                        )
+                    except regex.error as e:
+                        messagebox.showerror("Ошибка", f"Ошибка в регулярном выражении: {e}")
+                        return
             
             min_size_str = self.min_size_entry.get().strip()
             min_size = int(float(min_size_str) * 1024) if min_size_str else 0
@@ -935,10 +2325,8 @@ class FileSearcherApp(ctk.CTk):
             max_size_str = self.max_size_entry.get().strip()
             max_size = int(float(max_size_str) * 1024) if max_size_str else None
             
-            case_sensitive = self.case_sensitive_check.get()
             use_regex_name = self.regex_name_check.get()
             max_workers = int(self.threads_slider.get())
-            use_gpu = self.gpu_check.get() if hasattr(self, 'gpu_check') else False
             
         except ValueError as e:
             messagebox.showerror("Ошибка", f"Некорректные параметры: {e}")
@@ -949,6 +2337,7 @@ class FileSearcherApp(ctk.CTk):
         
         # Обновление UI
         self.is_searching = True
+        self._results_flush_id = self.after(self.RESULTS_FLUSH_INTERVAL_MS, self._flush_pending_results)
         self.search_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
         self.progress_bar.set(0)
@@ -957,20 +2346,25 @@ class FileSearcherApp(ctk.CTk):
         gpu_status = " (GPU включена)" if use_gpu and GPU_AVAILABLE else ""
         self.status_label.configure(text=f"Поиск...{gpu_status}")
         
-        # Создаем новый search engine с нужным количеством потоков и GPU
-        self.search_engine = FileSearchEngine(max_workers=max_workers, use_gpu=use_gpu)
+        # Создаем новый search engine с нужным количеством потоков и GPU.
+        # GPU движок (с пулом процессов для регулярок) создается один раз и переиспользуется
+        if use_gpu and GPU_SUPPORT and self._gpu_engine is None:
+            self._gpu_engine = HybridSearchEngine(use_gpu=True, process_workers=os.cpu_count() or 1)
+        self.search_engine = FileSearchEngine(max_workers=max_workers, use_gpu=use_gpu,
+                                              use_io_uring=use_io_uring, gpu_engine=self._gpu_engine)
         
         # Запуск в отдельном потоке
         self.search_thread = threading.Thread(
             target=self._search_worker,
             args=(root_path, name_pattern, extensions, content_regex,
-                  min_size, max_size, case_sensitive, use_regex_name),
+                  min_size, max_size, case_sensitive, use_regex_name, content_regex_obj),
             daemon=True
         )
         self.search_thread.start()
     
     def _search_worker(self, root_path, name_pattern, extensions, content_regex,
-                      min_size, max_size, case_sensitive, use_regex_name):
+                      min_size, max_size, case_sensitive, use_regex_name,
+                      content_regex_obj=None):
         """Рабочий поток для поиска"""
         try:
             results = self.search_engine.search(
@@ -982,60 +2376,103 @@ class FileSearcherApp(ctk.CTk):
                 max_size=max_size,
                 case_sensitive=case_sensitive,
                 use_regex_name=use_regex_name,
-                callback=self._search_callback
+                callback=self._search_callback,
+                content_regex_obj=content_regex_obj
             )
             
             self.after(0, self._search_complete, results)
             
         except Exception as e:
-            self.after(0, lambda: messagebox.showerror("Ошибка поиска", str(e)))
+            # Аргументы передаются в after напрямую: замыкание на e сломалось бы,
+            # т.к. имя исключения удаляется при выходе из блока except
+            self.after(0, messagebox.showerror, "Ошибка поиска", str(e))
             self.after(0, self._search_complete, [])
     
     def _search_callback(self, result, processed, total):
         """Обратный вызов для обновления прогресса"""
+        # Без обращений к Tk: таблицу, статус и прогресс раз в 50 мс обновляет _flush_pending_results
         if result:
-            self.after(0, self._add_result, result)
-            # Обновляем статус с именем файла
-            filename = os.path.basename(result.path)
-            self.after(0, lambda: self.status_label.configure(
-                text=f"Найдено: {len(self.results)} | Обработано: {processed}/{total} | ✓ {filename}"
-            ))
-        
+            self._pending_results.put(result)
+        self._pending_progress = (processed, total)
+    
+    def _flush_pending_results(self, limit=RESULTS_FLUSH_BATCH):
+        """Переносит накопленные результаты в список и таблицу (не более limit за вызов, None - все)"""
+        self._results_flush_id = None
+        last = None
+        # Имена, используемые на каждой строке, связываются с локальными переменными
+        insert = self.results_tree.insert
+        view = self._view_rows
+        window_end = self._window_start + self.RENDER_WINDOW
+        get_nowait = self._pending_results.get_nowait
+        append_result = self._results.append
+        append_name = self._result_names.append
+        row_by_path = self._row_by_path
+        visible_add = self._visible_rows.add
+        name_trigrams = self._name_trigrams
+        trigrams = self._trigrams
+        basename = os.path.basename
+        strftime, localtime = time.strftime, time.localtime
+        # Номер следующей строки в колонках - он же iid строки в таблице
+        row = len(self._result_names)
+        for _ in (range(limit) if limit else itertools.count()):
+            try:
+                last = result = get_nowait()
+            except queue.Empty:
+                break
+            path = result.path
+            if path in row_by_path:
+                continue
+            row_by_path[path] = row
+            filename = basename(path)
+            # В таблицу - только пока не заполнено окно, остальное вставит прокрутка
+            if len(view) < window_end:
+                insert("", "end", iid=row, values=(
+                    filename,
+                    _format_size(result.size),
+                    strftime(DATE_FORMAT, localtime(result.mtime)),
+                    path
+                ))
+            view.append(row)
+            name_lower = filename.lower()
+            append_result(path, result.size, result.mtime, MATCH_REASONS.index(result.match_reason))
+            append_name(name_lower)
+            visible_add(row)
+            for trigram in trigrams(name_lower):
+                name_trigrams[trigram].add(row)
+            row += 1
+        
+        # Счетчик, статус и прогресс обновляются один раз на пачку последними значениями
+        if last is not None:
+            self._last_found_name = os.path.basename(last.path)
+            self.results_count_label.configure(text=f"Найдено: {len(self._row_by_path)}")
+            self._update_scrollbar()
+        progress = self._pending_progress
+        if progress is not None:
+            self._pending_progress = None
+            self._update_progress(*progress)
+        
+        if self.is_searching or not self._pending_results.empty():
+            self._results_flush_id = self.after(self.RESULTS_FLUSH_INTERVAL_MS,
+                                                self._flush_pending_results)
+    
+    def _update_progress(self, processed, total):
+        """Обновляет прогресс-бар и строку статуса"""
         if total > 0:
-            progress = processed / total
-            self.after(0, self._update_progress, progress, processed, total)
-    
-    def _add_result(self, result: SearchResult):
-        """Добавляет результат в список и таблицу"""
-        self.results.append(result)
-        self.filtered_results.append(result)
-        
-        # Форматирование данных
-        filename = os.path.basename(result.path)
-        size_str = self._format_size(result.size)
-        date_str = result.modified.strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Добавление в таблицу
-        self.results_tree.insert("", "end", values=(
-            filename,
-            size_str,
-            date_str,
-            result.path
-        ))
-        
-        self.results_count_label.configure(text=f"Найдено: {len(self.results)}")
-    
-    def _update_progress(self, progress, processed, total):
-        """Обновляет прогресс-бар"""
-        self.progress_bar.set(progress)
-        # Не обновляем статус если он уже содержит информацию о найденных файлах
-        current_text = self.status_label.cget("text")
-        if "Найдено:" not in current_text:
-            self.status_label.configure(text=f"Обработано: {processed} / {total}")
+            self.progress_bar.set(processed / total)
+        if self._row_by_path:
+            text = (f"Найдено: {len(self._row_by_path)} | Обработано: {processed}/{total} | "
+                    f"✓ {self._last_found_name}")
+        else:
+            text = f"Обработано: {processed} / {total}"
+        self.status_label.configure(text=text)
     
     def _search_complete(self, results):
         """Вызывается после завершения поиска"""
         self.is_searching = False
+        # Дописываем в таблицу все, что не успел забрать таймер
+        if self._results_flush_id is not None:
+            self.after_cancel(self._results_flush_id)
+        self._flush_pending_results(limit=None)
         self.search_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
         self.progress_bar.set(1)
@@ -1076,18 +2513,27 @@ class FileSearcherApp(ctk.CTk):
     
     def _clear_results(self):
         """Очищает результаты"""
-        self.results.clear()
-        self.filtered_results.clear()
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        # Колонки заменяются новыми: фоновые фильтр/сортировка могут еще читать старые
+        self._results = SearchResults()
+        self._result_names = []
+        self._row_by_path.clear()
+        self._visible_rows.clear()
+        self._view_rows = []
+        self._window_start = 0
+        self._name_trigrams.clear()
+        # Номера строк начинаются заново - кэш и незавершенный фильтр устарели
+        self._last_filter = ("", None, None)
+        self._filter_generation += 1
+        self.results_tree.delete(*self.results_tree.get_children())
+        self._update_scrollbar()
         self.results_count_label.configure(text="Найдено: 0")
         self.progress_bar.set(0)
-        if hasattr(self, 'filter_entry'):
+        if self.filter_entry is not None:
             self.filter_entry.delete(0, "end")
     
     def _export_results(self, format_type):
         """Экспортирует результаты"""
-        if not self.results:
+        if not self._row_by_path:
             messagebox.showwarning("Предупреждение", "Нет результатов для экспорта")
             return
         
@@ -1114,13 +2560,15 @@ class FileSearcherApp(ctk.CTk):
                 writer = csv.writer(f)
                 writer.writerow(["Путь", "Размер (байт)", "Дата изменения", "Причина"])
                 
-                for result in self.results:
-                    writer.writerow([
-                        result.path,
-                        result.size,
-                        result.modified.strftime("%Y-%m-%d %H:%M:%S"),
-                        result.match_reason
-                    ])
+                # Строки пишутся потоком из генератора по колонкам, без промежуточного списка
+                strftime, localtime = time.strftime, time.localtime
+                results = self._results
+                writer.writerows(
+                    (path, results.sizes[row],
+                     strftime(DATE_FORMAT, localtime(results.mtimes[row])),
+                     MATCH_REASONS[results.reasons[row]])
+                    for path, row in self._row_by_path.items()
+                )
             
             messagebox.showinfo("Успех", f"Результаты экспортированы в {file_path}")
         except Exception as e:
@@ -1129,18 +2577,25 @@ class FileSearcherApp(ctk.CTk):
     def _export_to_json(self, file_path):
         """Экспорт в JSON"""
         try:
+            strftime, localtime = time.strftime, time.localtime
+            results = self._results
             data = [
                 {
-                    "path": result.path,
-                    "size": result.size,
-                    "modified": result.modified.strftime("%Y-%m-%d %H:%M:%S"),
-                    "match_reason": result.match_reason
+                    "path": path,
+                    "size": results.sizes[row],
+                    "modified": strftime(DATE_FORMAT, localtime(results.mtimes[row])),
+                    "match_reason": MATCH_REASONS[results.reasons[row]]
                 }
-                for result in self.results
+                for path, row in self._row_by_path.items()
             ]
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Компактный JSON без отступов; orjson сериализует в C сразу в UTF-8 байты
+            if ORJSON_AVAILABLE:
+                with open(file_path, 'wb') as f:
+                    f.write(orjson.dumps(data))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
             
             messagebox.showinfo("Успех", f"Результаты экспортированы в {file_path}")
         except Exception as e:
@@ -1172,12 +2627,12 @@ class FileSearcherApp(ctk.CTk):
         file_path = item['values'][3]  # Путь в 4-й колонке
         
         try:
-            # Нормализуем путь для Windows и добавляем кавычки
+            # Нормализуем путь для Windows
             normalized_path = os.path.normpath(file_path)
             
-            # Открываем Explorer с выделением файла
-            # Используем /select, с кавычками вокруг пути для поддержки пробелов
-            subprocess.run(f'explorer /select,"{normalized_path}"', shell=True)
+            # Открываем Explorer с выделением файла напрямую, без cmd.exe:
+            # путь - отдельный аргумент, кавычки для пробелов расставляет subprocess
+            subprocess.run(['explorer', '/select,', normalized_path], shell=False)
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось открыть директорию: {e}")
     
@@ -1195,66 +2650,150 @@ class FileSearcherApp(ctk.CTk):
         self.status_label.configure(text=f"Путь скопирован: {os.path.basename(file_path)}")
     
     def _remove_selected(self):
-        """Удаляет выбранный элемент из списка"""
-        selection = self.results_tree.selection()
+        """Удаляет выбранные элементы из списка"""
+        tree = self.results_tree
+        selection = tree.selection()
         if not selection:
             return
         
-        item = self.results_tree.item(selection[0])
-        file_path = item['values'][3]
-        
-        # Удаляем из списков
-        self.results = [r for r in self.results if r.path != file_path]
-        self.filtered_results = [r for r in self.filtered_results if r.path != file_path]
-        
-        # Удаляем из таблицы
-        self.results_tree.delete(selection[0])
-        self.results_count_label.configure(text=f"Найдено: {len(self.results)}")
+        # Позиции в _view_rows - по индексу строки в окне таблицы, без поиска по списку
+        start = self._window_start
+        removed = {start + tree.index(iid) for iid in selection}
+        
+        # Удаляем из индексов (строки в колонках остаются)
+        paths = self._results.paths
+        for iid in selection:
+            row = int(iid)
+            self._visible_rows.discard(row)
+            if self._row_by_path.get(paths[row]) == row:
+                del self._row_by_path[paths[row]]
+                for trigram in self._trigrams(self._result_names[row]):
+                    postings = self._name_trigrams.get(trigram)
+                    if postings is not None:
+                        postings.discard(row)
+        
+        # Список сжимается один раз: удаленные позиции лежат в окне, пересобирается только
+        # участок от первой до последней из них
+        view = self._view_rows
+        first, last = min(removed), max(removed)
+        view[first:last + 1] = [row for position, row in enumerate(view[first:last + 1], first)
+                                if position not in removed]
+        
+        tree.delete(*selection)
+        if start > 0 and start + self.RENDER_WINDOW > len(view):
+            # У конца списка окно сдвигается назад - перерисовываем его
+            self._render_view()
+        else:
+            # В окно сдвигаются следующие строки - дописываем только их
+            shown = len(tree.get_children())
+            self._insert_rows(view[start + shown:start + self.RENDER_WINDOW])
+            self._update_scrollbar()
+        self.results_count_label.configure(text=f"Найдено: {len(self._row_by_path)}")
     
     def _show_context_menu(self, event):
         """Показывает контекстное меню"""
         # Выбираем элемент под курсором
         item = self.results_tree.identify_row(event.y)
         if item:
-            self.results_tree.selection_set(item)
+            # Выделение нескольких строк сохраняется, если меню открыто на одной из них
+            if item not in self.results_tree.selection():
+                self.results_tree.selection_set(item)
             self.context_menu.post(event.x_root, event.y_root)
     
+    @staticmethod
+    def _trigrams(text):
+        """Множество триграмм строки"""
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    def _schedule_filter(self):
+        """Откладывает фильтрацию, чтобы быстрый ввод схлопнулся в одно обновление"""
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(self.FILTER_DEBOUNCE_MS, self._apply_filter)
+    
     def _apply_filter(self):
-        """Применяет фильтр к результатам"""
+        """Применяет фильтр к результатам (вычисление - в потоке _ui_exec)"""
+        self._filter_after_id = None
         filter_text = self.filter_entry.get().strip().lower()
+        self._filter_generation += 1
+        
+        # Если текст содержит предыдущий фильтр, проверяются только подошедшие под него строки
+        last_text, last_visible, last_known = self._last_filter
+        narrow = (last_visible, last_known) if last_text and last_text in filter_text else None
+        
+        # Снимок строк: потоки поиска продолжают добавлять строки через _flush_pending_results
+        future = self._ui_exec.submit(self._compute_filter, filter_text,
+                                      set(self._row_by_path.values()), self._result_names,
+                                      self._name_trigrams, narrow)
+        future.add_done_callback(functools.partial(
+            self._marshal_result, self._apply_filter_result, self._filter_generation, filter_text))
+    
+    def _marshal_result(self, apply, generation, *args):
+        """Передает результат фонового вычисления в GUI поток (вызывается из done_callback)"""
+        future = args[-1]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.after(0, apply, generation, *args[:-1], future.result())
+    
+    @classmethod
+    def _compute_filter(cls, filter_text, rows, names, name_trigrams, narrow=None):
+        """
+        Отбирает строки из rows, имя которых (names[строка]) содержит filter_text
         
-        # Очищаем таблицу
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        narrow - (подошедшие строки, известные строки) фильтра, текст которого входит
+        в filter_text: кандидаты - подошедшие строки и строки, появившиеся после него.
         
-        # Фильтруем результаты
-        self.filtered_results = []
-        for result in self.results:
-            filename = os.path.basename(result.path).lower()
-            if not filter_text or filter_text in filename:
-                self.filtered_results.append(result)
-                
-                size_str = self._format_size(result.size)
-                date_str = result.modified.strftime("%Y-%m-%d %H:%M:%S")
-                
-                self.results_tree.insert("", "end", values=(
-                    os.path.basename(result.path),
-                    size_str,
-                    date_str,
-                    result.path
-                ))
+        Returns:
+            (множество подходящих строк, rows)
+        """
+        candidates = rows
+        if narrow is not None:
+            last_visible, last_known = narrow
+            candidates = last_visible | (rows - last_known)
+        if len(filter_text) >= 3:
+            # Пересечение списков триграмм запроса (и кандидатов), затем точная проверка подстроки
+            postings = [name_trigrams.get(trigram, set())
+                        for trigram in cls._trigrams(filter_text)]
+            postings.append(candidates)
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        visible = {row for row in candidates if row in rows and filter_text in names[row]}
+        return visible, rows
+    
+    def _apply_filter_result(self, generation, filter_text, computed):
+        """Прикрепляет/отцепляет строки по результату _compute_filter"""
+        if generation != self._filter_generation:
+            return
+        visible, known = computed
+        self._last_filter = (filter_text, visible, known)
+        row_by_path, paths = self._row_by_path, self._results.paths
+        
+        # Строки, добавленные после снимка, не трогаем; удаленные за это время - пропускаем
+        hidden = (self._visible_rows - visible) & known
+        shown = {row for row in visible - self._visible_rows
+                 if row_by_path.get(paths[row]) == row}
+        
+        # Порядок остальных строк сохраняется, возвращаемые строки дописываются
+        # в конец в порядке поступления (= номеру строки); таблица перерисовывается с начала
+        if hidden or shown:
+            self._view_rows = [row for row in self._view_rows if row not in hidden]
+            self._view_rows.extend(sorted(shown))
+            self._render_view(0)
+        self._visible_rows = (self._visible_rows - hidden) | shown
         
         # Обновляем счетчик
         if filter_text:
             self.results_count_label.configure(
-                text=f"Найдено: {len(self.results)} (показано: {len(self.filtered_results)})"
+                text=f"Найдено: {len(self._row_by_path)} (показано: {len(self._visible_rows)})"
             )
         else:
-            self.results_count_label.configure(text=f"Найдено: {len(self.results)}")
+            self.results_count_label.configure(text=f"Найдено: {len(self._row_by_path)}")
     
     def _clear_filter(self):
         """Очищает фильтр"""
         self.filter_entry.delete(0, "end")
+        if self._filter_after_id is not None:
+            self.after_cancel(self._filter_after_id)
         self._apply_filter()
     
     def _sort_results(self, column):
@@ -1266,30 +2805,13 @@ class FileSearcherApp(ctk.CTk):
             self.sort_column = column
             self.sort_reverse = False
         
-        # Получаем все элементы
-        items = [(self.results_tree.set(item, column), item) 
-                 for item in self.results_tree.get_children('')]
-        
-        # Сортируем
-        if column == "size":
-            # Для размера конвертируем обратно в байты
-            def size_to_bytes(size_str):
-                if 'ГБ' in size_str:
-                    return float(size_str.split()[0]) * 1024 * 1024 * 1024
-                elif 'МБ' in size_str:
-                    return float(size_str.split()[0]) * 1024 * 1024
-                elif 'КБ' in size_str:
-                    return float(size_str.split()[0]) * 1024
-                else:
-                    return float(size_str.split()[0])
-            
-            items.sort(key=lambda x: size_to_bytes(x[0]), reverse=self.sort_reverse)
-        else:
-            items.sort(key=lambda x: x[0], reverse=self.sort_reverse)
-        
-        # Переставляем элементы
-        for index, (val, item) in enumerate(items):
-            self.results_tree.move(item, '', index)
+        # Видимые строки сортируются в потоке _ui_exec по колонке (байты, timestamp, имя, путь)
+        self._sort_generation += 1
+        future = self._ui_exec.submit(self._compute_sort, list(self._view_rows),
+                                      self._sort_columns()[self.SORT_FIELDS[column]],
+                                      self.sort_reverse)
+        future.add_done_callback(functools.partial(
+            self._marshal_result, self._apply_sort_result, self._sort_generation))
         
         # Обновляем заголовок
         for col in ("filename", "size", "modified", "path"):
@@ -1304,6 +2826,105 @@ class FileSearcherApp(ctk.CTk):
                 if "▼" in text or "▲" in text:
                     self.results_tree.heading(col, text=text.replace(" ▼", "").replace(" ▲", ""))
     
+    def _sort_columns(self):
+        """Колонки-ключи сортировки в порядке индексов SORT_FIELDS"""
+        results = self._results
+        return (results.sizes, results.mtimes, self._result_names, results.paths)
+    
+    @staticmethod
+    def _compute_sort(rows, column, reverse):
+        """Возвращает номера строк rows, упорядоченные по колонке column"""
+        return sorted(rows, key=column.__getitem__, reverse=reverse)
+    
+    def _apply_sort_result(self, generation, items):
+        """Переставляет строки таблицы в порядке, вычисленном _compute_sort"""
+        if generation != self._sort_generation:
+            return
+        # Строки, скрытые фильтром или удаленные за время сортировки, не возвращаем;
+        # добавленные за это время остаются в конце
+        visible = self._visible_rows
+        view = [row for row in items if row in visible]
+        sorted_rows = set(items)
+        view.extend(row for row in self._view_rows if row not in sorted_rows)
+        self._view_rows = view
+        self._render_view(0)
+    
+    def _render_view(self, start=None):
+        """Вставляет в таблицу окно из RENDER_WINDOW строк _view_rows, начиная с start"""
+        view = self._view_rows
+        window = self.RENDER_WINDOW
+        if start is None:
+            start = self._window_start
+        start = max(0, min(start, len(view) - window))
+        self._window_start = start
+        
+        tree = self.results_tree
+        selection = tree.selection()
+        tree.delete(*tree.get_children())
+        self._insert_rows(view[start:start + window])
+        # Выделение и фокус клавиатуры сохраняются, если строка осталась в окне
+        if selection and tree.exists(selection[0]):
+            tree.selection_set(selection[0])
+            tree.focus(selection[0])
+        self._update_scrollbar()
+    
+    def _insert_rows(self, rows):
+        """Дописывает строки результатов (индексы в колонках _results) в конец таблицы"""
+        results = self._results
+        sizes, mtimes, paths = results.sizes, results.mtimes, results.paths
+        insert = self.results_tree.insert
+        basename = os.path.basename
+        strftime, localtime = time.strftime, time.localtime
+        for row in rows:
+            path = paths[row]
+            insert("", "end", iid=row, values=(
+                basename(path),
+                _format_size(sizes[row]),
+                strftime(DATE_FORMAT, localtime(mtimes[row])),
+                path
+            ))
+    
+    def _update_scrollbar(self):
+        """Пересчитывает ползунок по текущему положению таблицы (без сдвига окна)"""
+        self._on_tree_yscroll(*self.results_tree.yview(), recenter=False)
+    
+    def _on_tree_yscroll(self, first, last, recenter=True):
+        """
+        yscrollcommand таблицы: у края окна (колесо мыши, клавиши) окно сдвигается
+        так, чтобы текущие строки оказались в его середине; ползунок скроллбара
+        выставляется по позиции во всем списке
+        """
+        total = len(self._view_rows)
+        shown = min(self.RENDER_WINDOW, total - self._window_start)
+        if shown <= 0:
+            self._scrollbar_y.set(0, 1)
+            return
+        start = self._window_start
+        top = start + float(first) * shown
+        bottom = start + float(last) * shown
+        margin = self.RENDER_WINDOW // 5
+        if recenter and ((top - start < margin and start > 0) or
+                         (start + shown - bottom < margin and start + shown < total)):
+            self._scroll_view_to(top, (self.RENDER_WINDOW - (bottom - top)) / 2)
+            return
+        self._scrollbar_y.set(top / total, bottom / total)
+    
+    def _on_scrollbar_y(self, *args):
+        """Команда скроллбара: перетаскивание ползунка переносит окно в нужное место списка"""
+        if args[0] == "moveto":
+            top = max(0.0, min(float(args[1]), 1.0)) * len(self._view_rows)
+            self._scroll_view_to(top, self.RENDER_WINDOW / 2)
+        else:
+            # Прокрутка на строки / страницы - в пределах окна, у края его сдвинет _on_tree_yscroll
+            self.results_tree.yview(*args)
+    
+    def _scroll_view_to(self, top, before):
+        """Перерисовывает окно с отступом before строк до строки top и прокручивает к ней"""
+        self._render_view(int(top - before))
+        shown = len(self.results_tree.get_children())
+        if shown:
+            self.results_tree.yview_moveto((top - self._window_start) / shown)
+    
     def _bind_paste_events(self):
         """Биндинг Ctrl+V для всех Entry виджетов (фикс CustomTkinter)"""
         # Сначала собираем список всех Entry виджетов
@@ -1317,7 +2938,7 @@ class FileSearcherApp(ctk.CTk):
         ]
         
         # Добавляем filter_entry если он существует
-        if hasattr(self, 'filter_entry'):
+        if self.filter_entry is not None:
             entry_widgets.append(self.filter_entry)
         
         # Определяем обработчик вставки
@@ -1339,8 +2960,10 @@ class FileSearcherApp(ctk.CTk):
                 if not ctk_widget:
                     return "break"
                 
-                # Получаем текст из буфера
-                clipboard_text = self.clipboard_get()
+                # Получаем текст из буфера: в Windows напрямую через WinAPI, иначе через Tk
+                clipboard_text = _get_clipboard_text_win() if os.name == 'nt' else None
+                if clipboard_text is None:
+                    clipboard_text = self.clipboard_get()
                 
                 # Вставляем через метод CTkEntry
                 if hasattr(ctk_widget, '_entry'):
@@ -1377,15 +3000,6 @@ class FileSearcherApp(ctk.CTk):
                 if hasattr(widget, '_entry'):
                     widget._entry.bind("<Control-v>", paste_handler)
                     widget._entry.bind("<Control-V>", paste_handler)
-    
-    @staticmethod
-    def _format_size(size_bytes):
-        """Форматирует размер файла"""
-        for unit in ['Б', 'КБ', 'МБ', 'ГБ', 'ТБ']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} ПБ"
 
 
 def main():
@@ -1395,5 +3009,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Процессы пула GPU движка в собранном PyInstaller exe запускаются через тот же exe
+    multiprocessing.freeze_support()
     main()
 
@@ -5,11 +5,29 @@ GPU-ускоренный движок поиска с гибридной CPU/GPU
 
 import os
 import re
+import sys
 import mmap
+import threading
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Tuple
 from dataclasses import dataclass
 import numpy as np
 
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Общие проверки паттернов для поиска по байтам (в пакете и при запуске файлом)
+try:
+    from .byte_patterns import (has_position_assertions, hs_stop_on_match, utf8_bytes_compatible,
+                                utf8_pattern_bytes)
+except ImportError:
+    from byte_patterns import (has_position_assertions, hs_stop_on_match, utf8_bytes_compatible,
+                               utf8_pattern_bytes)
+
 # Проверка доступности GPU библиотек
 GPU_AVAILABLE = False
 USE_CUPY = False
@@ -32,6 +50,20 @@ try:
 except ImportError:
     print("⚠️ Numba CUDA не доступна")
 
+# Hyperscan для альтернатив литералов на CPU (опционально)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Aho–Corasick для альтернатив литералов, когда Hyperscan нет (опционально, есть сборки под Windows)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 @dataclass
 class GPUSearchConfig:
@@ -41,8 +73,84 @@ class GPUSearchConfig:
     max_pattern_complexity: int = 10  # Максимальная сложность regex для GPU
     use_gpu: bool = GPU_AVAILABLE
     threads_per_block: int = 256
+    pfac_tile_size: int = 8 * 1024 * 1024  # 8 МБ тайлы для PFAC
+    max_compare_bytes: int = 256 * 1024 * 1024  # Лимит матрицы сравнения окон в CuPy поиске
+    min_file_size_for_pfac: int = 10 * 1024 * 1024  # 10 МБ минимум для PFAC на GPU
+    # Литералы на GPU: по умолчанию выключено - поиск подстроки на CPU (memmem)
+    # быстрее, чем копирование буфера по PCIe и запуск ядра
+    literals_on_gpu: bool = False
+    scan_window_size: int = 16 * 1024 * 1024  # 16 МБ окна при поиске регулярки по большому файлу
+    min_literals_for_ahocorasick: int = 4  # Меньше литералов быстрее найти отдельными find
+    # Регулярки re по файлам от min_file_size_for_process ищутся в пуле процессов (обход GIL);
+    # 0 процессов - пул выключен. Мелкие файлы дешевле найти в потоке, чем передать в процесс
+    # (файлы до 1 МБ читаются целиком и в пул не уходят).
+    # По умолчанию выключен: процессы spawn требуют защиты if __name__ == "__main__" у вызывающего
+    process_workers: int = 0
+    min_file_size_for_process: int = 1024 * 1024  # 1 МБ
     
 
+def _ignores_case(pattern) -> bool:
+    """Проверяет IGNORECASE у паттерна re / regex или RE2 (у RE2 регистр задается в options)"""
+    options = getattr(pattern, 'options', None)
+    if options is not None and hasattr(options, 'case_sensitive'):
+        return not options.case_sensitive
+    return bool(pattern.flags & re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_literal_pattern(pattern: str) -> bool:
+    """Проверяет, является ли паттерн литеральной строкой (кэшируется по строке паттерна)"""
+    special_chars = r'.*+?[]{}()^$|\\'
+    return not any(c in pattern for c in special_chars)
+
+
+@functools.lru_cache(maxsize=1024)
+def _pattern_complexity(pattern: str) -> int:
+    """Сложность паттерна для GPU (примитивная метрика), -1 для неподдерживаемых конструкций"""
+    # Проверка на сложные конструкции
+    if any(x in pattern for x in [r'\1', r'\2', '(?=', '(?!', '(?<', '(?(', r'\g<']):
+        return -1
+    
+    return (
+        pattern.count('(') + 
+        pattern.count('[') + 
+        pattern.count('{') +
+        pattern.count('\\') // 2
+    )
+
+
+# Литералы до этой длины ищутся ядром, специализированным под длину (развернутый цикл).
+# Ядра поиска литералов работают только при GPUSearchConfig.literals_on_gpu=True
+UNROLLED_PATTERN_MAX_LEN = 16
+
+
+def build_pfac_table(patterns: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Строит таблицу переходов PFAC (Aho-Corasick без failure-переходов)
+    
+    Каждый поток GPU стартует со своей позиции и идет по бору, пока есть переход,
+    поэтому failure-ссылки не нужны.
+    
+    Returns:
+        (table, final): table[state, byte] - следующее состояние или -1,
+        final[state] - 1 если в состоянии заканчивается один из литералов
+    """
+    transitions = [[-1] * 256]
+    final = [0]
+    
+    for literal in patterns:
+        state = 0
+        for byte in literal:
+            if transitions[state][byte] < 0:
+                transitions[state][byte] = len(transitions)
+                transitions.append([-1] * 256)
+                final.append(0)
+            state = transitions[state][byte]
+        final[state] = 1
+    
+    return np.array(transitions, dtype=np.int32), np.array(final, dtype=np.uint8)
+
+
 class GPUPatternMatcher:
     """GPU-ускоренный поиск паттернов"""
     
@@ -50,6 +158,20 @@ class GPUPatternMatcher:
         self.config = config or GPUSearchConfig()
         self.gpu_available = GPU_AVAILABLE and self.config.use_gpu
         
+        # Таблица PFAC на GPU для последнего набора литералов: (patterns, d_table, d_final)
+        self._pfac_cache = None
+        
+        # Базы Hyperscan для альтернатив литералов: (литералы, IGNORECASE) -> Database.
+        # Scratch не потокобезопасен - свой у каждого потока
+        self._hs_cache = {}
+        self._hs_local = threading.local()
+        # Автоматы Aho–Corasick: литералы -> Automaton (после make_automaton только читаются)
+        self._ac_cache = {}
+        
+        # Разбор паттерна на литералы и литерал-префильтр: паттерн -> результат
+        self._literals_cache = {}
+        self._prefilter_cache = {}
+        
         if self.gpu_available:
             self._init_gpu()
     
@@ -63,6 +185,17 @@ class GPUPatternMatcher:
                 self.gpu_compute_capability = device.compute_capability
                 print(f"🚀 GPU инициализирован: {self.gpu_name}")
                 print(f"   Compute Capability: {self.gpu_compute_capability}")
+                
+                # Буферы ядра поиска подстроки выделяются при первом запуске ядра и
+                # переиспользуются: текст идет через pinned буфер в постоянный буфер на GPU
+                # батчами по batch_size. Ядро работает только при literals_on_gpu=True -
+                # без него 2 x batch_size памяти не занимаются
+                self._h_pinned = None
+                self._d_text = None
+                self._d_result = None
+                self._d_patterns = {}  # Байты литерала -> массив на GPU
+                self._kernels = {}  # Длина литерала -> ядро с развернутым циклом сравнения
+                self._cuda_lock = threading.Lock()  # Буферы общие для потоков поиска
             except Exception as e:
                 print(f"⚠️ Ошибка инициализации GPU: {e}")
                 self.gpu_available = False
@@ -83,19 +216,8 @@ class GPUPatternMatcher:
         - Рекурсивные паттерны
         - Условные выражения
         """
-        # Проверка на сложные конструкции
-        if any(x in pattern for x in [r'\1', r'\2', '(?=', '(?!', '(?<', '(?(', r'\g<']):
-            return False
-        
-        # Подсчет сложности (примитивная метрика)
-        complexity = (
-            pattern.count('(') + 
-            pattern.count('[') + 
-            pattern.count('{') +
-            pattern.count('\\') // 2
-        )
-        
-        return complexity <= self.config.max_pattern_complexity
+        complexity = _pattern_complexity(pattern)
+        return 0 <= complexity <= self.config.max_pattern_complexity
     
     def search_in_text_gpu(self, text: bytes, pattern: re.Pattern) -> bool:
         """
@@ -108,6 +230,12 @@ class GPUPatternMatcher:
         Returns:
             True если найдено совпадение
         """
+        # Литералы и альтернативы литералов ищутся на CPU по байтам без декодирования
+        if not self.config.literals_on_gpu:
+            literals = self.literal_alternatives(pattern)
+            if literals is not None:
+                return self.search_literals_cpu(text, pattern, literals)
+        
         if not self.gpu_available or len(text) < self.config.min_file_size_for_gpu:
             # Fallback на CPU для мелких файлов
             return self._search_cpu(text, pattern)
@@ -131,6 +259,157 @@ class GPUPatternMatcher:
             print(f"⚠️ GPU search failed, fallback to CPU: {e}")
             return self._search_cpu(text, pattern)
     
+    def literal_alternatives(self, pattern: re.Pattern) -> Optional[List[bytes]]:
+        """
+        UTF-8 байты литералов паттерна вида lit или alt1|alt2|...|altN
+        
+        Returns:
+            Список литералов или None, если паттерн не из литералов или без учета
+            регистра по байтам его не найти (нужен Hyperscan, а caseless Hyperscan
+            сравнивает только ASCII - см. utf8_bytes_compatible)
+        """
+        pattern_str = pattern.pattern
+        if not isinstance(pattern_str, str):
+            return None
+        ignore_case = _ignores_case(pattern)
+        key = (pattern_str, ignore_case)
+        if key in self._literals_cache:
+            return self._literals_cache[key]
+        
+        literals = None
+        parts = pattern_str.split('|')
+        if (all(_is_literal_pattern(part) for part in parts) and
+                (not ignore_case or (HYPERSCAN_AVAILABLE and
+                                     utf8_bytes_compatible(pattern_str, re.IGNORECASE)))):
+            literals = [part.encode('utf-8') for part in parts]
+        self._literals_cache[key] = literals
+        return literals
+    
+    def extract_literal_prefilter(self, pattern) -> Optional[bytes]:
+        """
+        Самый длинный литерал, который обязан входить в любое совпадение паттерна
+        (например, b'error' для error.*code)
+        
+        Берутся подряд идущие символы верхнего уровня разобранной регулярки:
+        группы, классы, квантификаторы и якоря разрывают литерал, альтернатива
+        верхнего уровня и IGNORECASE - префильтра нет. Разбор синтаксисом re, поэтому
+        только для паттернов re и RE2 (у модуля regex другой синтаксис, например {e<=1}).
+        
+        Returns:
+            UTF-8 байты литерала (от 3 байт) или None
+        """
+        pattern_str = pattern.pattern
+        is_re = isinstance(pattern, re.Pattern)
+        if not (is_re or hasattr(pattern, 'options')):
+            return None
+        if not isinstance(pattern_str, str) or _ignores_case(pattern):
+            return None
+        
+        key = (pattern_str, type(pattern))
+        if key in self._prefilter_cache:
+            return self._prefilter_cache[key]
+        
+        try:
+            parsed = sre_parse.parse(pattern_str, pattern.flags if is_re else 0)
+        except (re.error, RecursionError):
+            parsed = None
+        
+        best = ''
+        if parsed is not None and not parsed.state.flags & re.IGNORECASE:
+            run = []
+            for op, av in parsed:
+                if op is sre_parse.LITERAL:
+                    run.append(chr(av))
+                    continue
+                if len(run) > len(best):
+                    best = ''.join(run)
+                run = []
+            if len(run) > len(best):
+                best = ''.join(run)
+        
+        prefilter = best.encode('utf-8')
+        prefilter = prefilter if len(prefilter) >= 3 else None
+        self._prefilter_cache[key] = prefilter
+        return prefilter
+    
+    def search_literals_cpu(self, data, pattern: re.Pattern, literals: List[bytes]) -> bool:
+        """
+        Ищет литералы из literal_alternatives в буфере (bytes/mmap) на CPU
+        
+        Без учета регистра - база Hyperscan, с учетом - find_any_literal.
+        """
+        if b'' in literals:
+            return True  # Пустая альтернатива совпадает везде
+        if _ignores_case(pattern):
+            return self._hyperscan_match(data, literals, True)
+        return self.find_any_literal(data, literals)
+    
+    def find_any_literal(self, data, literals: List[bytes]) -> bool:
+        """
+        Ищет в буфере (bytes/mmap) любой из литералов с учетом регистра
+        
+        Один литерал - find (memmem), несколько - база Hyperscan, без него от
+        min_literals_for_ahocorasick литералов - автомат Aho–Corasick (один проход
+        вместо прохода на каждый литерал). База и автомат строятся один раз на набор.
+        """
+        if b'' in literals:
+            return True
+        if len(literals) > 1 and HYPERSCAN_AVAILABLE:
+            return self._hyperscan_match(data, literals, False)
+        if AHOCORASICK_AVAILABLE and len(literals) >= self.config.min_literals_for_ahocorasick:
+            return self._ahocorasick_match(data, literals)
+        return any(data.find(literal) != -1 for literal in literals)
+    
+    def _ahocorasick_match(self, data, literals: List[bytes]) -> bool:
+        """Ищет литералы автоматом Aho–Corasick окнами по scan_window_size"""
+        key = tuple(literals)
+        automaton = self._ac_cache.get(key)
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for literal in literals:
+                # Автомат работает со str: байты переводятся в символы 1:1 через latin-1
+                word = literal.decode('latin-1')
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            self._ac_cache[key] = automaton
+        
+        # Окна перекрываются на длину литерала - совпадение на границе не теряется
+        window = self.config.scan_window_size
+        overlap = max(map(len, literals)) - 1
+        size = len(data)
+        with memoryview(data) as view:
+            for offset in range(0, size, window):
+                start = max(0, offset - overlap)
+                text = str(view[start:min(size, offset + window)], 'latin-1')
+                if next(automaton.iter(text), None) is not None:
+                    return True
+        return False
+    
+    def _hyperscan_match(self, data, literals: List[bytes], ignore_case: bool) -> bool:
+        """Сканирует буфер базой Hyperscan из литералов (кэш по набору литералов)"""
+        key = (tuple(literals), ignore_case)
+        db = self._hs_cache.get(key)
+        if db is None:
+            flags = hyperscan.HS_FLAG_SINGLEMATCH
+            if ignore_case:
+                flags |= hyperscan.HS_FLAG_CASELESS
+            # Каждый байт экранируется как \xNN - литерал не разбирается как regex
+            expressions = [b''.join(b'\\x%02x' % byte for byte in literal) for literal in literals]
+            db = hyperscan.Database()
+            db.compile(expressions=expressions, flags=[flags] * len(expressions))
+            self._hs_cache[key] = db
+        
+        local = self._hs_local
+        if getattr(local, 'db', None) is not db:
+            local.scratch = hyperscan.Scratch(db)
+            local.db = db
+        
+        try:
+            db.scan(data, match_event_handler=hs_stop_on_match, scratch=local.scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+    
     def _search_cpu(self, text: bytes, pattern: re.Pattern) -> bool:
         """Fallback поиск на CPU"""
         try:
@@ -151,7 +430,7 @@ class GPUPatternMatcher:
             # Для очень простых паттернов (литеральные строки)
             pattern_str = pattern.pattern
             
-            if self._is_literal_pattern(pattern_str):
+            if _is_literal_pattern(pattern_str) and not _ignores_case(pattern):
                 # Простой поиск подстроки на GPU
                 return self._literal_search_gpu(text_str, pattern_str)
             else:
@@ -162,47 +441,36 @@ class GPUPatternMatcher:
         except Exception as e:
             return self._search_cpu(text, pattern)
     
-    def _is_literal_pattern(self, pattern: str) -> bool:
-        """Проверяет, является ли паттерн литеральной строкой"""
-        special_chars = r'.*+?[]{}()^$|\\'
-        return not any(c in pattern for c in special_chars)
-    
     def _literal_search_gpu(self, text: str, substring: str) -> bool:
         """
         Быстрый поиск подстроки на GPU
-        Использует CuPy для параллельного поиска
+        Все позиции сравниваются векторной операцией CuPy над скользящими окнами:
+        несколько запусков ядер на файл вместо одного на каждую позицию
         """
         try:
             # Конвертируем в numpy массив символов
             text_array = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
             pattern_array = np.frombuffer(substring.encode('utf-8'), dtype=np.uint8)
             
-            # Копируем на GPU
-            text_gpu = cp.asarray(text_array)
-            pattern_gpu = cp.asarray(pattern_array)
-            
             pattern_len = len(pattern_array)
             text_len = len(text_array)
             
             if pattern_len > text_len:
                 return False
             
-            # Создаем скользящие окна на GPU
-            # Это эквивалентно проверке всех возможных позиций параллельно
-            num_positions = text_len - pattern_len + 1
+            # Копируем на GPU
+            text_gpu = cp.asarray(text_array)
+            pattern_gpu = cp.asarray(pattern_array)
             
-            # Батчинг для больших текстов
-            batch_size = 10_000_000  # 10M позиций за раз
+            # Окна (позиция x байт паттерна) - view над text_gpu без копирования
+            windows = cp.lib.stride_tricks.sliding_window_view(text_gpu, pattern_len)
             
-            for start_pos in range(0, num_positions, batch_size):
-                end_pos = min(start_pos + batch_size, num_positions)
-                
-                # Проверяем батч позиций параллельно
-                found = self._check_positions_batch(
-                    text_gpu, pattern_gpu, start_pos, end_pos, pattern_len
-                )
-                
-                if found:
+            # Матрица сравнения занимает позиции * pattern_len байт -
+            # большие тексты сравниваются частями не больше max_compare_bytes
+            step = max(1, self.config.max_compare_bytes // pattern_len)
+            for start_pos in range(0, len(windows), step):
+                batch = windows[start_pos:start_pos + step]
+                if bool((batch == pattern_gpu).all(axis=1).any()):
                     return True
             
             return False
@@ -211,20 +479,6 @@ class GPUPatternMatcher:
             print(f"⚠️ GPU literal search error: {e}")
             return substring in text
     
-    def _check_positions_batch(self, text_gpu, pattern_gpu, start_pos, end_pos, pattern_len):
-        """Проверяет батч позиций параллельно на GPU"""
-        try:
-            # Для каждой позиции проверяем совпадение
-            for i in range(start_pos, end_pos):
-                window = text_gpu[i:i+pattern_len]
-                if len(window) == pattern_len:
-                    # Сравнение на GPU
-                    if cp.all(window == pattern_gpu):
-                        return True
-            return False
-        except Exception:
-            return False
-    
     def _search_numba(self, text: bytes, pattern: re.Pattern) -> bool:
         """
         Поиск с использованием Numba CUDA
@@ -234,7 +488,7 @@ class GPUPatternMatcher:
             text_str = text.decode('utf-8', errors='ignore')
             pattern_str = pattern.pattern
             
-            if self._is_literal_pattern(pattern_str):
+            if _is_literal_pattern(pattern_str) and not _ignores_case(pattern):
                 return self._literal_search_numba(text_str, pattern_str)
             else:
                 # Сложные паттерны на CPU
@@ -259,7 +513,15 @@ class GPUPatternMatcher:
             return substring in text
     
     def _run_cuda_kernel(self, text: np.ndarray, pattern: np.ndarray) -> bool:
-        """Запускает CUDA ядро для параллельного поиска"""
+        """
+        Запускает CUDA ядро для параллельного поиска
+        
+        Текст копируется через переиспользуемые pinned и GPU буферы (выделяются
+        при первом вызове) батчами по batch_size с перекрытием на длину литерала, литерал загружается
+        на GPU один раз. Ядро компилируется Numba при первом запуске.
+        Вызывается только при literals_on_gpu=True и без CuPy: по умолчанию
+        литералы ищутся на CPU (search_literals_cpu).
+        """
         if not USE_NUMBA:
             return False
         
@@ -270,33 +532,126 @@ class GPUPatternMatcher:
             if pattern_len > text_len:
                 return False
             
-            num_positions = text_len - pattern_len + 1
+            batch_size = self.config.batch_size
+            step = batch_size - pattern_len + 1
+            if step <= 0:
+                # Литерал не помещается в буфер
+                return text.tobytes().find(pattern.tobytes()) != -1
             
             # Результат на CPU
             result = np.zeros(1, dtype=np.int32)
+            threads_per_block = self.config.threads_per_block
             
-            # Копируем на GPU
-            d_text = cuda.to_device(text)
-            d_pattern = cuda.to_device(pattern)
-            d_result = cuda.to_device(result)
+            with self._cuda_lock:
+                if self._d_text is None:
+                    self._h_pinned = cuda.pinned_array(batch_size, dtype=np.uint8)
+                    self._d_text = cuda.device_array(batch_size, dtype=np.uint8)
+                    self._d_result = cuda.device_array(1, dtype=np.int32)
+                
+                key = pattern.tobytes()
+                d_pattern = self._d_patterns.get(key)
+                if d_pattern is None:
+                    d_pattern = cuda.to_device(pattern)
+                    self._d_patterns[key] = d_pattern
+                
+                # Короткие литералы - ядром, скомпилированным под их длину (один раз на длину)
+                kernel = None
+                if pattern_len <= UNROLLED_PATTERN_MAX_LEN:
+                    kernel = self._kernels.get(pattern_len)
+                    if kernel is None:
+                        kernel = self._make_fixed_length_kernel(pattern_len)
+                        self._kernels[pattern_len] = kernel
+                
+                d_text = self._d_text
+                d_result = self._d_result
+                d_result[:] = 0
+                
+                for offset in range(0, text_len - pattern_len + 1, step):
+                    end = min(text_len, offset + batch_size)
+                    chunk_len = end - offset
+                    
+                    # Копируем на GPU через pinned буфер
+                    self._h_pinned[:chunk_len] = text[offset:end]
+                    d_text[:chunk_len].copy_to_device(self._h_pinned[:chunk_len])
+                    
+                    # Настройка блоков и потоков
+                    num_positions = chunk_len - pattern_len + 1
+                    blocks_per_grid = (num_positions + threads_per_block - 1) // threads_per_block
+                    
+                    # Запускаем ядро
+                    if kernel is not None:
+                        kernel[blocks_per_grid, threads_per_block](
+                            d_text, d_pattern, d_result, chunk_len
+                        )
+                    else:
+                        self._cuda_search_kernel[blocks_per_grid, threads_per_block](
+                            d_text, d_pattern, d_result, chunk_len, pattern_len
+                        )
+                    
+                    # Копируем результат обратно
+                    d_result.copy_to_host(result)
+                    if result[0] > 0:
+                        return True
+            
+            return False
             
-            # Настройка блоков и потоков
+        except Exception as e:
+            print(f"⚠️ CUDA kernel error: {e}")
+            return False
+    
+    def multi_literal_search(self, data, patterns: List[bytes]) -> bool:
+        """
+        Ищет любой из литералов в буфере (bytes/mmap) PFAC ядром на GPU
+        
+        Буфер копируется на GPU тайлами по pfac_tile_size с перекрытием
+        на длину самого длинного литерала. Без Numba CUDA - поиск на CPU.
+        """
+        if not patterns:
+            return False
+        if not (self.gpu_available and USE_NUMBA):
+            return self.find_any_literal(data, patterns)
+        
+        try:
+            d_table, d_final = self._get_pfac_table(patterns)
+            text = np.frombuffer(data, dtype=np.uint8)
+            text_len = len(text)
+            overlap = max(len(literal) for literal in patterns) - 1
+            tile_size = self.config.pfac_tile_size
             threads_per_block = self.config.threads_per_block
-            blocks_per_grid = (num_positions + threads_per_block - 1) // threads_per_block
             
-            # Запускаем ядро
-            self._cuda_search_kernel[blocks_per_grid, threads_per_block](
-                d_text, d_pattern, d_result, text_len, pattern_len
-            )
+            result = np.zeros(1, dtype=np.int32)
+            d_result = cuda.to_device(result)
             
-            # Копируем результат обратно
-            d_result.copy_to_host(result)
+            for offset in range(0, text_len, tile_size):
+                # Совпадение, начавшееся в тайле, может заканчиваться в следующем
+                end = min(text_len, offset + tile_size + overlap)
+                d_text = cuda.to_device(text[offset:end])
+                tile_positions = min(tile_size, text_len - offset)
+                blocks_per_grid = (tile_positions + threads_per_block - 1) // threads_per_block
+                
+                self._pfac_kernel[blocks_per_grid, threads_per_block](
+                    d_text, d_table, d_final, d_result, tile_positions, end - offset
+                )
+                
+                d_result.copy_to_host(result)
+                if result[0] > 0:
+                    return True
             
-            return result[0] > 0
+            return False
             
         except Exception as e:
-            print(f"⚠️ CUDA kernel error: {e}")
-            return False
+            print(f"⚠️ PFAC GPU search error: {e}")
+            return self.find_any_literal(data, patterns)
+    
+    def _get_pfac_table(self, patterns: List[bytes]):
+        """Возвращает таблицу PFAC на GPU (загружается один раз на набор литералов)"""
+        key = tuple(patterns)
+        cache = self._pfac_cache
+        if cache is None or cache[0] != key:
+            table, final = build_pfac_table(patterns)
+            cache = (key, cuda.to_device(table), cuda.to_device(final))
+            self._pfac_cache = cache
+        return cache[1], cache[2]
     
     @staticmethod
     def _cuda_search_kernel_stub(text, pattern, result, text_len, pattern_len):
@@ -310,26 +665,81 @@ if USE_NUMBA:
     def _cuda_search_kernel_impl(text, pattern, result, text_len, pattern_len):
         """
         CUDA ядро для параллельного поиска подстроки
-        Каждый поток проверяет одну позицию в тексте
+        Каждый поток проверяет одну позицию в тексте и выходит сразу,
+        если совпадение уже найдено другим потоком
         """
         pos = cuda.grid(1)
         
-        if pos < text_len - pattern_len + 1:
-            # Проверяем совпадение с этой позиции
-            match = True
-            for i in range(pattern_len):
+        if pos >= text_len - pattern_len + 1 or result[0] > 0:
+            return
+        
+        # Первый байт совпадает редко - большинство потоков выходит здесь
+        if text[pos] != pattern[0]:
+            return
+        
+        # Проверяем совпадение с этой позиции, периодически проверяя флаг
+        for i in range(1, pattern_len):
+            if (i & 15) == 0 and result[0] > 0:
+                return
+            if text[pos + i] != pattern[i]:
+                return
+        
+        # Флаг найдено - обычная запись: все потоки пишут одно значение, атомарность не нужна
+        result[0] = 1
+    
+    def _make_fixed_length_kernel_impl(pattern_len):
+        """
+        Вариант ядра поиска подстроки для литерала длины pattern_len
+        
+        Длина - константа замыкания, Numba компилирует ее как литерал:
+        цикл сравнения разворачивается, без счетчика и проверки границы.
+        """
+        @cuda.jit
+        def kernel(text, pattern, result, text_len):
+            pos = cuda.grid(1)
+            
+            if pos >= text_len - pattern_len + 1 or result[0] > 0:
+                return
+            
+            if text[pos] != pattern[0]:
+                return
+            
+            for i in range(1, pattern_len):
                 if text[pos + i] != pattern[i]:
-                    match = False
-                    break
+                    return
             
-            if match:
-                # Атомарно устанавливаем флаг найдено
-                cuda.atomic.add(result, 0, 1)
+            result[0] = 1
+        
+        return kernel
+    
+    @cuda.jit
+    def _pfac_kernel_impl(text, table, final, result, num_positions, text_len):
+        """
+        PFAC ядро: каждый поток идет по бору литералов от своей позиции
+        и останавливается на первом отсутствующем переходе
+        """
+        pos = cuda.grid(1)
+        
+        if pos < num_positions and result[0] == 0:
+            state = 0
+            i = pos
+            while i < text_len:
+                state = table[state, text[i]]
+                if state < 0:
+                    break
+                if final[state]:
+                    result[0] = 1
+                    break
+                i += 1
     
     # Присваиваем метод классу
     GPUPatternMatcher._cuda_search_kernel = staticmethod(_cuda_search_kernel_impl)
+    GPUPatternMatcher._pfac_kernel = staticmethod(_pfac_kernel_impl)
+    GPUPatternMatcher._make_fixed_length_kernel = staticmethod(_make_fixed_length_kernel_impl)
 else:
     GPUPatternMatcher._cuda_search_kernel = GPUPatternMatcher._cuda_search_kernel_stub
+    GPUPatternMatcher._pfac_kernel = GPUPatternMatcher._cuda_search_kernel_stub
+    GPUPatternMatcher._make_fixed_length_kernel = None
 
 
 class HybridSearchEngine:
@@ -338,9 +748,16 @@ class HybridSearchEngine:
     Автоматически выбирает лучший метод для каждого файла
     """
     
-    def __init__(self, use_gpu: bool = True):
-        self.config = GPUSearchConfig(use_gpu=use_gpu)
+    def __init__(self, use_gpu: bool = True, process_workers: int = 0):
+        self.config = GPUSearchConfig(use_gpu=use_gpu, process_workers=process_workers)
         self.gpu_matcher = GPUPatternMatcher(self.config)
+        # Перекрытие окон для паттерна (по максимальной длине совпадения)
+        self._overlap_cache = {}
+        # bytes копии паттернов re: (паттерн, флаги) -> bytes паттерн или None
+        self._bytes_patterns = {}
+        # Пул процессов для CPU поиска регулярок (создается при первом обращении)
+        self._process_pool = None
+        self._process_pool_lock = threading.Lock()
         self.stats = {
             'gpu_searches': 0,
             'cpu_searches': 0,
@@ -348,44 +765,69 @@ class HybridSearchEngine:
             'cpu_hits': 0
         }
     
-    def search_in_file(self, file_path: str, pattern: re.Pattern) -> bool:
+    def search_in_file(self, file_path: str, pattern: re.Pattern,
+                       file_size: Optional[int] = None) -> bool:
         """
         Поиск паттерна в файле с автоматическим выбором CPU/GPU
         
         Args:
             file_path: Путь к файлу
             pattern: Скомпилированный regex паттерн
+            file_size: Размер файла, если уже известен из stat при обходе (иначе fstat)
             
         Returns:
             True если найдено совпадение
         """
         try:
-            file_size = os.path.getsize(file_path)
+            # Литералы (и их альтернативы) ищутся на CPU по байтам, без декодирования и regex -
+            # копирование на GPU дороже самого поиска
+            literals = self.gpu_matcher.literal_alternatives(pattern)
+            # Для регулярок - литерал, без которого совпадения нет: файл без него отсекается
+            # одним find до декодирования и regex / GPU
+            prefilter = None if literals is not None else self.gpu_matcher.extract_literal_prefilter(pattern)
             
-            # Проверка размера файла
-            if file_size > 100 * 1024 * 1024:  # > 100 МБ
-                return False  # Слишком большой
-            
-            # Выбор стратегии
-            use_gpu = (
-                self.config.use_gpu and 
-                file_size >= self.config.min_file_size_for_gpu and
-                self.gpu_matcher.gpu_available
-            )
-            
-            # Читаем файл
-            with open(file_path, 'rb') as f:
-                # Проверка на бинарный файл
-                chunk = f.read(8192)
-                if b'\x00' in chunk:
-                    return False
+            # Файл открывается одним системным вызовом, без файлового объекта Python
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                if file_size is None:
+                    file_size = os.fstat(fd).st_size
+                
+                # Проверка размера файла (литералы ищутся линейно по mmap - для них без ограничения)
+                if literals is None and file_size > 100 * 1024 * 1024:  # > 100 МБ
+                    return False  # Слишком большой
+                
+                # Выбор стратегии
+                use_gpu = (
+                    self.config.use_gpu and 
+                    file_size >= self.config.min_file_size_for_gpu and
+                    self.gpu_matcher.gpu_available and
+                    (literals is None or self.config.literals_on_gpu)
+                )
+                
+                # Регулярки re по большим файлам - в пул процессов: в потоках их сериализует GIL
+                use_process = (literals is None and not use_gpu and self.config.process_workers > 0 and
+                               file_size >= self.config.min_file_size_for_process and
+                               isinstance(pattern, re.Pattern))
                 
-                # Для небольших файлов
+                # Регулярка, безопасная для байтов, на CPU применяется к ним без декодирования
+                bytes_pattern = None if use_gpu or literals is not None else self._bytes_pattern(pattern)
+                
+                # Для небольших файлов - одно чтение целиком
                 if file_size < 1024 * 1024:  # < 1 МБ
                     try:
-                        text = chunk if len(chunk) == file_size else f.read()
-                        text_str = text.decode('utf-8', errors='ignore')
-                        found = bool(pattern.search(text_str))
+                        text = os.read(fd, file_size)
+                        # Проверка на бинарный файл (memchr по первым 8 КБ)
+                        if text.find(b'\x00', 0, 8192) != -1:
+                            return False
+                        if literals is not None:
+                            found = self.gpu_matcher.search_literals_cpu(text, pattern, literals)
+                        elif prefilter is not None and text.find(prefilter) == -1:
+                            found = False
+                        elif bytes_pattern is not None:
+                            found = bytes_pattern.search(text) is not None
+                        else:
+                            text_str = text.decode('utf-8', errors='ignore')
+                            found = bool(pattern.search(text_str))
                         self.stats['cpu_searches'] += 1
                         if found:
                             self.stats['cpu_hits'] += 1
@@ -394,30 +836,188 @@ class HybridSearchEngine:
                         return False
                 
                 # Для больших файлов используем memory map
-                f.seek(0)
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped:
-                    data = mmapped.read()
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mmapped:
+                    # Проверка на бинарный файл
+                    if mmapped.find(b'\x00', 0, 8192) != -1:
+                        return False
+                    if prefilter is not None and mmapped.find(prefilter) == -1:
+                        self.stats['cpu_searches'] += 1
+                        return False
+                    # В процесс уходят только файлы, прошедшие проверки выше
+                    if use_process:
+                        self.stats['cpu_searches'] += 1
+                        found = self._search_in_process(file_path, pattern, file_size)
+                        if found:
+                            self.stats['cpu_hits'] += 1
+                        return found
+                    if literals is not None and not use_gpu:
+                        # Поиск идет прямо по mmap - файл не копируется в bytes
+                        self.stats['cpu_searches'] += 1
+                        found = self.gpu_matcher.search_literals_cpu(mmapped, pattern, literals)
+                        if found:
+                            self.stats['cpu_hits'] += 1
+                        return found
                     
                     if use_gpu:
                         self.stats['gpu_searches'] += 1
-                        found = self.gpu_matcher.search_in_text_gpu(data, pattern)
-                        if found:
-                            self.stats['gpu_hits'] += 1
-                        return found
                     else:
                         self.stats['cpu_searches'] += 1
-                        try:
-                            text_str = data.decode('utf-8', errors='ignore')
-                            found = bool(pattern.search(text_str))
-                            if found:
-                                self.stats['cpu_hits'] += 1
-                            return found
-                        except:
-                            return False
+                    try:
+                        found = self._search_windows(mmapped, bytes_pattern or pattern, use_gpu)
+                    except:
+                        return False
+                    if found:
+                        self.stats['gpu_hits' if use_gpu else 'cpu_hits'] += 1
+                    return found
+            finally:
+                os.close(fd)
                             
         except (PermissionError, OSError, UnicodeDecodeError, ValueError):
             return False
     
+    def _search_windows(self, mmapped, pattern: re.Pattern, use_gpu: bool) -> bool:
+        """
+        Ищет регулярку в mmap окнами по scan_window_size с перекрытием
+        
+        В памяти одновременно только одно окно (и его декодированный текст), а не весь файл;
+        bytes паттерн ищет прямо по mmap без копий. Перекрытие - максимальная длина
+        совпадения, не меньше 4 КБ. Паттерны с якорями и lookaround и паттерны, совпадение
+        которых не помещается в половину окна, ищутся одним проходом по всему файлу.
+        """
+        window = self.config.scan_window_size
+        overlap = self._window_overlap(pattern)
+        file_size = len(mmapped)
+        if overlap is None:
+            window, overlap = max(file_size, 1), 0
+        
+        with memoryview(mmapped) as view:
+            for offset in range(0, file_size, window):
+                start = max(0, offset - overlap)
+                end = min(file_size, offset + window)
+                if use_gpu:
+                    found = self.gpu_matcher.search_in_text_gpu(view[start:end].tobytes(), pattern)
+                elif isinstance(pattern.pattern, bytes):
+                    found = pattern.search(mmapped, start, end) is not None
+                else:
+                    found = bool(pattern.search(str(view[start:end], 'utf-8', 'ignore')))
+                if found:
+                    return True
+        return False
+    
+    def _search_in_process(self, file_path: str, pattern: re.Pattern, file_size: int) -> bool:
+        """
+        Ищет регулярку в файле процессом пула
+        
+        Передаются только путь и исходник паттерна: процесс сам открывает файл
+        и компилирует паттерн (re кэширует компиляцию).
+        """
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # spawn: fork процесса с потоками (GUI, обработчики) может зависнуть
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.config.process_workers,
+                    mp_context=multiprocessing.get_context('spawn'))
+            pool = self._process_pool
+        return pool.submit(_search_one, (file_path, pattern.pattern, pattern.flags, file_size)).result()
+    
+    def close(self):
+        """Останавливает пул процессов"""
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                if sys.version_info >= (3, 9):
+                    self._process_pool.shutdown(wait=False, cancel_futures=True)
+                else:
+                    self._process_pool.shutdown(wait=False)
+                self._process_pool = None
+    
+    def _bytes_pattern(self, pattern: re.Pattern) -> Optional[re.Pattern]:
+        """
+        bytes версия паттерна re (как в FileSearchEngine) или None
+        
+        Только для паттернов, которые на UTF-8 байтах находят то же, что на тексте
+        (utf8_bytes_compatible). Классы, \w, '.' и т.п., паттерны RE2 и модуля regex
+        ищутся по декодированному тексту.
+        """
+        if not isinstance(pattern, re.Pattern) or not isinstance(pattern.pattern, str):
+            return None
+        key = (pattern.pattern, pattern.flags)
+        if key not in self._bytes_patterns:
+            bytes_pattern = None
+            # re.UNICODE для bytes паттернов недопустим
+            flags = pattern.flags & ~re.UNICODE
+            pattern_bytes = utf8_pattern_bytes(pattern.pattern, flags)
+            if pattern_bytes is not None:
+                try:
+                    bytes_pattern = re.compile(pattern_bytes, flags)
+                except re.error:
+                    pass
+            self._bytes_patterns[key] = bytes_pattern
+        return self._bytes_patterns[key]
+    
+    def _window_overlap(self, pattern: re.Pattern) -> Optional[int]:
+        """
+        Перекрытие окон для паттерна: максимальная длина совпадения в байтах UTF-8
+        
+        None - окнами искать нельзя: в окне ^ \A совпадают в его начале, $ \Z \b
+        и lookahead - в конце, а длинное совпадение не помещается в перекрытие.
+        """
+        key = (pattern.pattern, type(pattern), self.config.scan_window_size)
+        if key not in self._overlap_cache:
+            overlap = None
+            flags = getattr(pattern, 'flags', 0)
+            try:
+                # Символ в UTF-8 - до 4 байт
+                width = sre_parse.parse(pattern.pattern, flags).getwidth()[1] * 4
+            except Exception:
+                width = None
+            if (width is not None and width <= self.config.scan_window_size // 2
+                    and not has_position_assertions(pattern.pattern, flags)):
+                overlap = max(4 * 1024, width)
+            self._overlap_cache[key] = overlap
+        return self._overlap_cache[key]
+    
+    def multi_literal_search(self, file_path: str, patterns: List[bytes]) -> bool:
+        """
+        Поиск любого из литералов в файле (паттерн вида alt1|alt2|...|altN)
+        
+        Большие файлы сканируются PFAC ядром на GPU, остальные - на CPU по mmap (find_any_literal).
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size == 0:
+                    return False
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped:
+                    # Проверка на бинарный файл
+                    if mmapped.find(b'\x00', 0, 8192) != -1:
+                        return False
+                    
+                    use_gpu = (
+                        self.gpu_matcher.gpu_available and
+                        file_size >= self.config.min_file_size_for_pfac
+                    )
+                    if use_gpu:
+                        self.stats['gpu_searches'] += 1
+                        found = self.gpu_matcher.multi_literal_search(mmapped, patterns)
+                        if found:
+                            self.stats['gpu_hits'] += 1
+                        return found
+                    
+                    self.stats['cpu_searches'] += 1
+                    found = self.gpu_matcher.find_any_literal(mmapped, patterns)
+                    if found:
+                        self.stats['cpu_hits'] += 1
+                    return found
+                    
+        except (PermissionError, OSError, ValueError):
+            return False
+    
+    def reset_stats(self):
+        """Обнуляет статистику (движок переиспользуется между поисками)"""
+        for key in self.stats:
+            self.stats[key] = 0
+    
     def get_stats(self) -> dict:
         """Возвращает статистику использования GPU/CPU"""
         total = self.stats['gpu_searches'] + self.stats['cpu_searches']
@@ -445,6 +1045,19 @@ class HybridSearchEngine:
         print("="*60)
 
 
+# Движок процесса пула HybridSearchEngine (создается при первой задаче)
+_process_engine = None
+
+
+def _search_one(args: Tuple[str, str, int, int]) -> bool:
+    """Задача пула процессов: поиск регулярки (исходник, флаги) в файле на CPU"""
+    global _process_engine
+    file_path, pattern_src, flags, file_size = args
+    if _process_engine is None:
+        _process_engine = HybridSearchEngine(use_gpu=False)
+    return _process_engine.search_in_file(file_path, re.compile(pattern_src, flags), file_size)
+
+
 # Тестирование
 if __name__ == "__main__":
     print("🧪 Тестирование GPU Search Engine")
@@ -0,0 +1,32 @@
+"""
+Тесты структурной проверки регулярок на катастрофический backtracking
+"""
+
+import unittest
+
+from src.file_searcher import _is_catastrophic_regex
+
+
+class CatastrophicRegexTest(unittest.TestCase):
+
+    def test_nested_repeats(self):
+        for regex_str in (r'(a+)+b', r'(\w+\s?)*$', r'(x+x+)+y', r'((x+)(x+))+y'):
+            with self.subTest(regex_str=regex_str):
+                self.assertTrue(_is_catastrophic_regex(regex_str))
+
+    def test_ambiguous_alternatives(self):
+        # sre_parse выносит общий префикс: (a|a) -> a(?:|), (a|aa) -> a(?:|a)
+        for regex_str in ('(a|a)*b', '(ab|ab)*c', '(foo|foo)*x', '(?:a|a)+b',
+                          '(a|aa)*c', '(xy|z|xy)*q'):
+            with self.subTest(regex_str=regex_str):
+                self.assertTrue(_is_catastrophic_regex(regex_str))
+
+    def test_safe_patterns(self):
+        for regex_str in ('(a|ab)*c', '(ab|a)*c', '(abcx|abdy)*z', '(foo|bar)+',
+                          r'import\s+\w+', r'\d+-\d+', '(a|b)*c'):
+            with self.subTest(regex_str=regex_str):
+                self.assertFalse(_is_catastrophic_regex(regex_str))
+
+
+if __name__ == '__main__':
+    unittest.main()
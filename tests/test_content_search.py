@@ -0,0 +1,319 @@
+"""
+Тесты поиска в содержимом: паттерны на байтах должны находить то же, что и на тексте
+"""
+
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+from src import file_searcher
+from src.file_searcher import FileSearchEngine, FileSearcherApp
+from src.gpu_search_engine import HybridSearchEngine
+
+
+class ContentSearchTestCase(unittest.TestCase):
+    """Дерево с русским, английским текстом и знаком Кельвина"""
+
+    FILES = {
+        'a/ru.txt': 'Привет мир\n',
+        'b/en.txt': 'hello world\n',
+        'c/kelvin.txt': '300 K\n',
+    }
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        for rel_path, text in self.FILES.items():
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def search(self, content_regex: str, case_sensitive: bool = False) -> set:
+        """Относительные пути файлов, в которых найден паттерн"""
+        engine = FileSearchEngine(max_workers=2)
+        results = engine.search(self.root, content_regex=content_regex,
+                                case_sensitive=case_sensitive)
+        return {os.path.relpath(path, self.root).replace(os.sep, '/') for path in results.paths}
+
+
+class ReBytesPatternTest(ContentSearchTestCase):
+    """Путь re без Hyperscan и PCRE2"""
+
+    def setUp(self):
+        super().setUp()
+        for name in ('HYPERSCAN_AVAILABLE', 'PCRE2_AVAILABLE'):
+            patcher = mock.patch.object(file_searcher, name, False)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_word_class_matches_cyrillic(self):
+        self.assertEqual(self.search(r'\w+', case_sensitive=True),
+                         {'a/ru.txt', 'b/en.txt', 'c/kelvin.txt'})
+        self.assertIn('a/ru.txt', self.search(r'\w{5}'))
+
+    def test_ignore_case_unicode_folding(self):
+        self.assertEqual(self.search('k'), {'c/kelvin.txt'})
+
+    def test_unicode_escapes(self):
+        # В bytes паттерне \u, \U и \N{...} недопустимы, а \xNN - байт, а не символ
+        for content_regex in (r'\u043c\u0438\u0440', r'\U0000043c\U00000438\U00000440',
+                              r'\N{CYRILLIC SMALL LETTER EM}\N{CYRILLIC SMALL LETTER I}р',
+                              r'\x77\x6f\x72\x6cd\x20?$'):
+            with self.subTest(content_regex=content_regex):
+                expected = {'b/en.txt'} if content_regex.startswith(r'\x') else {'a/ru.txt'}
+                self.assertEqual(self.search(content_regex, case_sensitive=True), expected)
+        self.assertEqual(self.search(r'x\N{CYRILLIC SMALL LETTER EM}'), set())
+
+    def test_literal_patterns_use_bytes(self):
+        self.assertTrue(FileSearchEngine._utf8_bytes_compatible('hello|world'))
+        self.assertTrue(FileSearchEngine._utf8_bytes_compatible('Привет', False))
+        self.assertFalse(FileSearchEngine._utf8_bytes_compatible(r'\w+'))
+        self.assertFalse(FileSearchEngine._utf8_bytes_compatible('Привет', True))
+        self.assertFalse(FileSearchEngine._utf8_bytes_compatible('k', True))
+        self.assertTrue(FileSearchEngine._utf8_bytes_compatible('world', True))
+
+
+class FastEnginesTest(ContentSearchTestCase):
+    """Hyperscan и PCRE2 (если установлены) не меняют набор найденных файлов"""
+
+    def test_pcre2_without_hyperscan(self):
+        with mock.patch.object(file_searcher, 'HYPERSCAN_AVAILABLE', False):
+            self.test_word_class_matches_cyrillic()
+            self.test_ignore_case_unicode_folding()
+            self.test_alternatives()
+            self.test_unicode_escapes()
+            self.test_end_anchors()
+
+    def test_word_class_matches_cyrillic(self):
+        self.assertEqual(self.search(r'\w+', case_sensitive=True),
+                         {'a/ru.txt', 'b/en.txt', 'c/kelvin.txt'})
+        self.assertIn('a/ru.txt', self.search(r'\w{5}'))
+        self.assertEqual(self.search(r'и.\s'), {'a/ru.txt'})
+
+    def test_ignore_case_unicode_folding(self):
+        self.assertEqual(self.search('(k)+'), {'c/kelvin.txt'})
+
+    test_unicode_escapes = ReBytesPatternTest.test_unicode_escapes
+
+    def test_end_anchors(self):
+        # \Z - только конец файла, $ - еще и перед последним переводом строки
+        self.assertEqual(self.search(r'world\Z', case_sensitive=True), set())
+        self.assertEqual(self.search(r'world$', case_sensitive=True), {'b/en.txt'})
+        self.assertEqual(self.search(r'world\n\Z', case_sensitive=True), {'b/en.txt'})
+
+    def test_alternatives(self):
+        self.assertEqual(self.search('(мир|world)+', case_sensitive=True), {'a/ru.txt', 'b/en.txt'})
+        self.assertEqual(self.search('(HELLO|300)+'), {'b/en.txt', 'c/kelvin.txt'})
+
+    @unittest.skipUnless(file_searcher.HYPERSCAN_AVAILABLE, 'нужен python-hyperscan')
+    def test_hyperscan_only_for_byte_safe_patterns(self):
+        engine = FileSearchEngine()
+        self.assertIsNotNone(engine._compile_hyperscan('(мир|world)+', True))
+        self.assertIsNone(engine._compile_hyperscan(r'\w+', True))
+        self.assertIsNone(engine._compile_hyperscan('k+', False))
+        self.assertIsNone(engine._compile_hyperscan(r'abc\Z', True))
+
+    @unittest.skipUnless(file_searcher.PCRE2_AVAILABLE, 'нужен pcre2')
+    def test_pcre2_only_for_byte_safe_patterns(self):
+        self.assertIsNotNone(FileSearchEngine._compile_pcre2('(мир|world)+', True))
+        self.assertIsNone(FileSearchEngine._compile_pcre2(r'\w+', True))
+        self.assertIsNone(FileSearchEngine._compile_pcre2('k+', False))
+        # Паттерны с якорями ищет re: PCRE2 сканирует копии чанков mmap
+        self.assertIsNone(FileSearchEngine._compile_pcre2('^ab', True))
+        self.assertIsNone(FileSearchEngine._compile_pcre2(r'ab\Z', True))
+        pattern = FileSearchEngine._compile_pcre2('ab', True)
+        self.assertFalse(FileSearchEngine._search_buffer(pattern, b'xxab', 0, 3))
+        self.assertTrue(FileSearchEngine._search_buffer(pattern, b'xxab', 2))
+
+
+class ChunkOverlapTest(ContentSearchTestCase):
+    """Совпадения на границе чанков больших файлов"""
+
+    FILES = {}
+
+    def write(self, rel_path: str, *parts):
+        with open(os.path.join(self.root, rel_path), 'wb') as f:
+            for part in parts:
+                f.write(part)
+
+    def test_dangerous_pattern_overlap_is_half_chunk(self):
+        # 2 МБ без переводов строк: опасная регулярка идет чанками по 512 КБ
+        self.write('big.txt', b'a' * (500 * 1024), b'START', b'b' * (30 * 1024), b'END',
+                   b'a' * (1500 * 1024))
+        engine = FileSearchEngine(max_workers=1)
+        results = engine.search(self.root, content_regex='START.*?END', case_sensitive=True)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(engine._scan_overlap, engine._chunk_size // 2)
+
+    def test_unbounded_bytes_pattern_scans_whole_file(self):
+        # Совпадение длиной 2 МБ пересекает границу чанка в 16 МБ
+        self.write('big.txt', b'a' * (15 * 1024 * 1024), b'BEGIN', b'x' * (2 * 1024 * 1024),
+                   b'END', b'a' * (1024 * 1024))
+        engine = FileSearchEngine(max_workers=2)
+        with mock.patch.object(file_searcher, 'HYPERSCAN_AVAILABLE', False), \
+                mock.patch.object(file_searcher, 'PCRE2_AVAILABLE', False):
+            results = engine.search(self.root, content_regex='BEGIN(xx|yy)+END', case_sensitive=True)
+        self.assertEqual(len(results), 1)
+        self.assertIsNone(engine._scan_overlap)
+
+    def test_parallel_shards_overlap(self):
+        # 12 МБ на 4 шарда по 3 МБ: совпадение пересекает границу первого и второго шарда
+        mb = 1024 * 1024
+        self.write('big.txt', b'a' * (3 * mb - 5), b'NEEDLE_42ab', b'.' * (9 * mb))
+        for max_workers in (4, 1):
+            engine = FileSearchEngine(max_workers=max_workers)
+            engine.parallel_scan_threshold = 8 * mb
+            with self.subTest(max_workers=max_workers), \
+                    mock.patch.object(engine, '_search_mmap_parallel',
+                                      wraps=engine._search_mmap_parallel) as parallel:
+                results = engine.search(self.root, content_regex=r'NEEDLE_\w{4}', case_sensitive=True)
+                self.assertEqual(len(results), 1)
+                # Один поток - последовательный проход чанками, без шардов
+                self.assertEqual(parallel.called, max_workers > 1)
+                self.assertEqual(len(engine.search(self.root, content_regex=r'NEEDLE_\w{5}',
+                                                   case_sensitive=True)), 0)
+
+    def test_anchors_at_chunk_boundaries(self):
+        # Чанки PCRE2 - 5 МБ, re по bytes - 16 МБ: HEAD в начале перекрытия чанка, TAIL в конце
+        # чанка. Без переводов строк ^ \A совпадают только в начале файла, $ \Z - только в конце
+        mb = 1024 * 1024
+        self.write('big.txt', b'x' * (5 * mb - 1024), b'HEAD', b'x' * (1024 - 8), b'TAIL',
+                   b'x' * (11 * mb - 1024), b'HEAD', b'x' * (1024 - 8), b'TAIL', b'x' * mb)
+        for pcre2_enabled in (True, False):
+            with mock.patch.object(file_searcher, 'HYPERSCAN_AVAILABLE', False), \
+                    mock.patch.object(file_searcher, 'PCRE2_AVAILABLE',
+                                      pcre2_enabled and file_searcher.PCRE2_AVAILABLE):
+                for content_regex in ('^HEAD', r'\AHEAD', 'TAIL$', r'TAIL\Z'):
+                    with self.subTest(pcre2=pcre2_enabled, content_regex=content_regex):
+                        self.assertEqual(self.search(content_regex, case_sensitive=True), set())
+                self.assertEqual(self.search('xHEAD|TAILx', case_sensitive=True), {'big.txt'})
+
+
+@unittest.skipUnless(file_searcher.RE2_AVAILABLE, 'нужен google-re2')
+class Re2Test(ContentSearchTestCase):
+    """Паттерн RE2 (путь для регулярок с катастрофическим backtracking)"""
+
+    def search_re2(self, content_regex: str, case_sensitive: bool = False) -> set:
+        pattern = FileSearcherApp._compile_re2(content_regex, case_sensitive, use_gpu=False)
+        self.assertIsNotNone(pattern)
+        engine = FileSearchEngine(max_workers=2)
+        # Как в GUI: исходная строка паттерна передается вместе с объектом RE2
+        results = engine.search(self.root, content_regex=content_regex, content_regex_obj=pattern,
+                                case_sensitive=case_sensitive)
+        return {os.path.relpath(path, self.root).replace(os.sep, '/') for path in results.paths}
+
+    def test_word_class_matches_cyrillic(self):
+        self.assertEqual(self.search_re2(r'(\w+\s?)+$', case_sensitive=True),
+                         {'a/ru.txt', 'b/en.txt', 'c/kelvin.txt'})
+        self.assertEqual(self.search_re2(r'м.р\s'), {'a/ru.txt'})
+        self.assertEqual(self.search_re2(r'[\w]{5}'), {'a/ru.txt', 'b/en.txt'})
+
+    def test_ignore_case_unicode_folding(self):
+        self.assertEqual(self.search_re2('(k)+'), {'c/kelvin.txt'})
+        self.assertEqual(self.search_re2('ПРИВЕТ'), {'a/ru.txt'})
+
+    def test_word_boundary_not_compiled(self):
+        self.assertIsNone(FileSearcherApp._compile_re2(r'\bмир', True, False))
+
+
+class HybridBytesPatternTest(ContentSearchTestCase):
+    """CPU путь HybridSearchEngine (GPU режим без видеокарты)"""
+
+    def setUp(self):
+        super().setUp()
+        # Большой файл ищется окнами по mmap, а не одним чтением
+        with open(os.path.join(self.root, 'a/ru_big.txt'), 'w', encoding='utf-8') as f:
+            f.write('Привет мир\n' * 200_000)
+        self.engine = HybridSearchEngine(use_gpu=False)
+        self.engine.config.process_workers = 0
+
+    def found(self, rel_path: str, pattern) -> bool:
+        return self.engine.search_in_file(os.path.join(self.root, rel_path), pattern)
+
+    def test_word_class_matches_cyrillic(self):
+        pattern = re.compile(r'\w{5}')
+        self.assertTrue(self.found('a/ru.txt', pattern))
+        self.assertTrue(self.found('a/ru_big.txt', pattern))
+        self.assertIsNone(self.engine._bytes_pattern(pattern))
+
+    def test_ignore_case_unicode_folding(self):
+        pattern = re.compile('k', re.IGNORECASE)
+        self.assertTrue(self.found('c/kelvin.txt', pattern))
+        self.assertIsNone(self.engine.gpu_matcher.literal_alternatives(pattern))
+
+    def test_unicode_escapes(self):
+        pattern = re.compile(r'\u043c\U00000438\N{CYRILLIC SMALL LETTER ER}')
+        self.assertIsNotNone(self.engine._bytes_pattern(pattern))
+        self.assertTrue(self.found('a/ru.txt', pattern))
+
+    def test_literal_patterns_use_bytes(self):
+        self.assertIsNotNone(self.engine._bytes_pattern(re.compile('мир|world')))
+        self.assertIsNone(self.engine._bytes_pattern(re.compile('мир', re.IGNORECASE)))
+
+
+class HybridWindowTest(ContentSearchTestCase):
+    """Окна mmap в HybridSearchEngine: совпадения и якоря на границе окон"""
+
+    FILES = {}
+    MB = 1024 * 1024
+
+    def setUp(self):
+        super().setUp()
+        self.engine = HybridSearchEngine(use_gpu=False)
+        self.engine.config.scan_window_size = self.MB
+
+    write = ChunkOverlapTest.write
+
+    def found(self, rel_path: str, pattern) -> bool:
+        return self.engine.search_in_file(os.path.join(self.root, rel_path), pattern)
+
+    def test_anchors_at_window_boundaries(self):
+        # HEAD в начале второго окна (с перекрытием 4 КБ), TAIL в конце первого
+        self.write('big.txt', b'x' * (self.MB - 4096), b'HEAD', b'x' * (4096 - 8), b'TAIL',
+                   b'x' * (2 * self.MB))
+        for regex in (r'TAIL\Z', 'TAIL$', r'TAI\w\Z', r'\AHEA\w', r'^HEA\w', r'TAIL\b'):
+            with self.subTest(regex=regex):
+                self.assertFalse(self.found('big.txt', re.compile(regex)))
+        self.assertTrue(self.found('big.txt', re.compile(r'xHEA\w')))
+
+    def test_match_longer_than_window(self):
+        # Совпадение в 1.5 МБ пересекает две границы окон по 1 МБ
+        self.write('big.txt', b'a' * (self.MB // 2), b'BEGIN', b'x' * (3 * self.MB // 2), b'END',
+                   b'a' * self.MB)
+        for regex in (r'BEGIN(xx|yy)+END', r'BEGIN\w+?END'):
+            with self.subTest(regex=regex):
+                self.assertTrue(self.found('big.txt', re.compile(regex)))
+
+
+class HybridProcessPoolTest(ContentSearchTestCase):
+    """Регулярки по большим файлам в пуле процессов HybridSearchEngine"""
+
+    FILES = {}
+
+    def setUp(self):
+        super().setUp()
+        self.engine = HybridSearchEngine(use_gpu=False, process_workers=1)
+        self.addCleanup(self.engine.close)
+        self.path = os.path.join(self.root, 'big.txt')
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * (self.engine.config.min_file_size_for_process + 1024) + b' NEEDLE_42\n')
+
+    def test_prefilter_runs_before_pool(self):
+        # Обязательного литерала ERROR в файле нет - процесс не нужен
+        self.assertFalse(self.engine.search_in_file(self.path, re.compile(r'ERROR_\w+')))
+        self.assertIsNone(self.engine._process_pool)
+
+    def test_regex_searched_in_process(self):
+        self.assertTrue(self.engine.search_in_file(self.path, re.compile(r'NEEDLE_\d+')))
+        self.assertFalse(self.engine.search_in_file(self.path, re.compile(r'NEEDLE_\d+[a-z]')))
+        self.assertIsNotNone(self.engine._process_pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
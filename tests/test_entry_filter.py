@@ -0,0 +1,91 @@
+"""
+Тесты предикатов имени и метаданных: Cython версия (_entry_filter.pyx) и Python замена
+"""
+
+import os
+import re
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+from src import file_searcher
+from src.file_searcher import FileSearchEngine
+
+INF = float('inf')
+
+
+class EntryFilterMixin:
+    """Общие проверки; match_name и match_entry задает подкласс"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, 'report.TXT')
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 100)
+        mtime = time.time() - 3600
+        os.utime(self.path, (mtime, mtime))
+        self.mtime = os.stat(self.path).st_mtime
+
+    def dir_entry(self):
+        with os.scandir(self._tmp.name) as entries:
+            return next(entries)
+
+    def test_extension_like_splitext(self):
+        names = ['a.txt', 'a.TXT', 'a.b.c', 'noext', 'a.', '.bashrc', '..txt', '.a.txt', '...']
+        for name in names:
+            ext = os.path.splitext(name)[1][1:].lower()
+            with self.subTest(name=name):
+                self.assertTrue(self.match_name(name, None, None, frozenset((ext,))))
+                self.assertFalse(self.match_name(name, None, None, frozenset(('other',))))
+
+    def test_name_filters(self):
+        name_filter = FileSearchEngine._build_name_filter('rep*.txt', False)
+        name_regex = re.compile(r'\d')
+        self.assertTrue(self.match_name('Report.TXT', name_filter, None, None))
+        self.assertFalse(self.match_name('report.txt.bak', name_filter, None, None))
+        self.assertTrue(self.match_name('a1.log', None, name_regex, None))
+        self.assertFalse(self.match_name('a.log', None, name_regex, None))
+        self.assertFalse(self.match_name('rep1.txt', name_filter, name_regex, frozenset(('log',))))
+        self.assertTrue(self.match_name('anything', None, None, None))
+
+    def test_size_and_date_bounds(self):
+        entry = self.dir_entry()
+        mtime = self.mtime
+        self.assertEqual(self.match_entry(entry, None, None, None, 0, INF, -INF, INF), (100, mtime))
+        # Границы включительные
+        self.assertIsNotNone(self.match_entry(entry, None, None, None, 100, 100, mtime, mtime))
+        self.assertIsNone(self.match_entry(entry, None, None, None, 101, INF, -INF, INF))
+        self.assertIsNone(self.match_entry(entry, None, None, None, 0, 99, -INF, INF))
+        self.assertIsNone(self.match_entry(entry, None, None, None, 0, INF, mtime + 1, INF))
+        self.assertIsNone(self.match_entry(entry, None, None, None, 0, INF, -INF, mtime - 1))
+        self.assertIsNone(self.match_entry(entry, None, None, frozenset(('log',)), 0, INF, -INF, INF))
+
+    def test_entry_without_native_stat(self):
+        # Не DirEntry (запись с метаданными из io_uring) - используется ее stat()
+        entry = SimpleNamespace(name='a.txt', path='/nonexistent/a.txt',
+                                stat=lambda: os.stat_result((0,) * 6 + (42, 0, 7.5, 0)))
+        self.assertEqual(self.match_entry(entry, None, None, frozenset(('txt',)), 0, INF, -INF, INF),
+                         (42, 7.5))
+
+    def test_vanished_file_raises_oserror(self):
+        entry = self.dir_entry()
+        os.remove(self.path)
+        with self.assertRaises(OSError):
+            self.match_entry(entry, None, None, None, 0, INF, -INF, INF)
+
+
+class PythonEntryFilterTest(EntryFilterMixin, unittest.TestCase):
+    match_name = staticmethod(file_searcher._py_match_name)
+    match_entry = staticmethod(file_searcher._py_match_entry)
+
+
+@unittest.skipUnless(file_searcher.CYTHON_FILTER_AVAILABLE, 'нужен Cython')
+class CythonEntryFilterTest(EntryFilterMixin, unittest.TestCase):
+    match_name = staticmethod(file_searcher.match_name)
+    match_entry = staticmethod(file_searcher.match_entry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Тесты ядер поиска литералов Numba CUDA (используются только при literals_on_gpu=True)
+"""
+
+import re
+import unittest
+
+import numpy as np
+
+from src import gpu_search_engine
+from src.gpu_search_engine import GPUPatternMatcher, GPUSearchConfig, UNROLLED_PATTERN_MAX_LEN
+
+
+@unittest.skipUnless(gpu_search_engine.USE_NUMBA, 'нужна Numba с доступной CUDA')
+class FixedLengthKernelTest(unittest.TestCase):
+
+    def setUp(self):
+        # Маленький буфер: литералы попадают на границы батчей
+        config = GPUSearchConfig(use_gpu=True, literals_on_gpu=True, batch_size=4096,
+                                 min_file_size_for_gpu=0)
+        self.matcher = GPUPatternMatcher(config)
+        if not self.matcher.gpu_available:
+            self.skipTest('GPU не инициализирована')
+
+    def run_kernel(self, text: bytes, literal: bytes) -> bool:
+        return self.matcher._run_cuda_kernel(np.frombuffer(text, dtype=np.uint8),
+                                             np.frombuffer(literal, dtype=np.uint8))
+
+    def test_literal_lengths_around_unroll_limit(self):
+        for length in range(1, UNROLLED_PATTERN_MAX_LEN + 3):
+            literal = bytes(range(65, 65 + length))
+            for position in (0, 4096 - length // 2, 10_000 - length):
+                text = bytearray(b'.' * 10_000)
+                text[position:position + length] = literal
+                with self.subTest(length=length, position=position):
+                    self.assertTrue(self.run_kernel(bytes(text), literal))
+                    # Литерал без последнего байта совпадения не дает
+                    text[position + length - 1] = ord('.')
+                    self.assertFalse(self.run_kernel(bytes(text), literal))
+        # Ядро компилируется один раз на длину, длинные литералы - общим ядром
+        self.assertEqual(sorted(self.matcher._kernels), list(range(1, UNROLLED_PATTERN_MAX_LEN + 1)))
+
+    @unittest.skipIf(gpu_search_engine.USE_CUPY, 'с CuPy литералы ищет _search_cupy')
+    def test_search_in_text_gpu_uses_kernel_for_literals(self):
+        text = b'.' * 5000 + b'needle' + b'.' * 5000
+        self.assertTrue(self.matcher.search_in_text_gpu(text, re.compile('needle')))
+        self.assertFalse(self.matcher.search_in_text_gpu(text, re.compile('needles')))
+        self.assertIn(len(b'needle'), self.matcher._kernels)
+
+    def test_buffers_allocated_on_first_kernel_run(self):
+        self.assertIsNone(self.matcher._d_text)
+        self.assertTrue(self.run_kernel(b'abc', b'b'))
+        self.assertEqual(len(self.matcher._d_text), 4096)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+"""
+Тесты пакетного обхода через io_uring: без liburing поиск идет обычными системными вызовами
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import file_searcher, io_uring_backend
+from src.file_searcher import FileSearchEngine
+from src.io_uring_backend import IO_URING_AVAILABLE, IOUringBatcher, UringStat
+
+
+class FakeBatcher:
+    """IOUringBatcher без liburing: ответы через os.stat, запросы запоминаются"""
+
+    depth = 4
+    # Размеры, которые statx сообщает вместо настоящих (имя файла -> размер)
+    fake_sizes = {}
+    # Содержимое, которое read_many возвращает вместо настоящего (имя файла -> байты)
+    fake_contents = {}
+
+    def __init__(self):
+        self.statx_paths = []
+        self.read_paths = []
+
+    def statx_many(self, paths):
+        self.statx_paths.extend(paths)
+        stats = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stats.append(None)
+                continue
+            size = self.fake_sizes.get(os.path.basename(path), stat.st_size)
+            stats.append(UringStat(size, stat.st_mtime))
+        return stats
+
+    def read_many(self, paths, sizes):
+        self.read_paths.extend(paths)
+        contents = []
+        for path, size in zip(paths, sizes):
+            with open(path, 'rb') as f:
+                data = f.read(size)
+            contents.append(self.fake_contents.get(os.path.basename(path), data))
+        return contents
+
+    def close(self):
+        pass
+
+
+class IOUringTestCase(unittest.TestCase):
+    """Дерево из нескольких небольших файлов и одного больше uring_read_max_size"""
+
+    FILES = {
+        'a.txt': b'alpha needle\n',
+        'b.log': b'beta\n',
+        'sub/c.txt': b'needle ' * 20_000,
+        'sub/d.txt': b'delta\n',
+        'sub/e.txt': b'',
+    }
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = self._tmp.name
+        for rel_path, data in self.FILES.items():
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+    def search(self, batcher_class=None, **kwargs) -> set:
+        """Относительные пути найденных файлов; batcher_class подменяет IOUringBatcher"""
+        engine = FileSearchEngine(max_workers=2)
+        if batcher_class is not None:
+            engine.use_io_uring = True
+            with mock.patch.object(file_searcher, 'IOUringBatcher', batcher_class):
+                results = engine.search(self.root, **kwargs)
+        else:
+            results = engine.search(self.root, **kwargs)
+        return {os.path.relpath(path, self.root).replace(os.sep, '/') for path in results.paths}
+
+
+class StatxTest(IOUringTestCase):
+
+    def test_without_liburing_io_uring_is_off(self):
+        with mock.patch.object(file_searcher, 'IO_URING_AVAILABLE', False), \
+                mock.patch.object(io_uring_backend, 'IO_URING_AVAILABLE', False):
+            self.assertFalse(FileSearchEngine(use_io_uring=True).use_io_uring)
+            with self.assertRaises(OSError):
+                IOUringBatcher()
+            self.assertEqual(self.search(min_size=1), {'a.txt', 'b.log', 'sub/c.txt', 'sub/d.txt'})
+
+    def test_prefetched_stat_used_by_filters(self):
+        batchers = []
+
+        def make_batcher():
+            batcher = FakeBatcher()
+            batchers.append(batcher)
+            return batcher
+
+        # statx сообщает нулевой размер b.log - фильтр размера берет его, а не stat()
+        with mock.patch.object(FakeBatcher, 'fake_sizes', {'b.log': 0}):
+            found = self.search(make_batcher, min_size=1)
+        self.assertEqual(found, {'a.txt', 'sub/c.txt', 'sub/d.txt'})
+        self.assertEqual(len(batchers), 1)
+        self.assertEqual(len(batchers[0].statx_paths), len(self.FILES))
+
+    def test_io_uring_errors_fall_back_to_stat(self):
+        expected = {'a.txt', 'b.log', 'sub/c.txt', 'sub/d.txt'}
+        # Кольцо не создается (ядро без io_uring, запрет seccomp)
+        self.assertEqual(self.search(mock.Mock(side_effect=OSError), min_size=1), expected)
+        # Ошибка батча statx - файлы проверяются обычным stat
+        failing = mock.Mock(spec=FakeBatcher, depth=4)
+        failing.statx_many.side_effect = OSError
+        self.assertEqual(self.search(lambda: failing, min_size=1), expected)
+        failing.close.assert_called_once()
+
+    @unittest.skipUnless(IO_URING_AVAILABLE, 'нужен liburing')
+    def test_statx_many(self):
+        paths = [os.path.join(self.root, rel_path) for rel_path in self.FILES]
+        paths.append(os.path.join(self.root, 'missing.txt'))
+        with IOUringBatcher(depth=4) as uring:
+            stats = uring.statx_many(paths)
+        self.assertIsNone(stats[-1])
+        for path, stat in zip(paths, stats[:-1]):
+            self.assertEqual(stat.st_size, os.stat(path).st_size)
+            self.assertAlmostEqual(stat.st_mtime, os.stat(path).st_mtime, places=3)
+
+
+class PrefetchContentsTest(IOUringTestCase):
+    """Небольшие файлы для поиска в содержимом читаются через io_uring в потоке обхода"""
+
+    def setUp(self):
+        super().setUp()
+        self.batchers = []
+
+    def make_batcher(self):
+        batcher = FakeBatcher()
+        self.batchers.append(batcher)
+        return batcher
+
+    def read_names(self) -> set:
+        return {os.path.basename(path) for batcher in self.batchers for path in batcher.read_paths}
+
+    def test_small_candidates_read_in_batches(self):
+        self.assertEqual(self.search(self.make_batcher, content_regex='needle'), {'a.txt', 'sub/c.txt'})
+        # c.txt больше uring_read_max_size, пустой e.txt читать незачем
+        self.assertEqual(self.read_names(), {'a.txt', 'b.log', 'd.txt'})
+
+    def test_metadata_filter_before_read(self):
+        self.search(self.make_batcher, content_regex='needle', min_size=6)
+        self.assertEqual(self.read_names(), {'a.txt', 'd.txt'})
+
+    def test_prefetched_contents_searched(self):
+        # Файл не открывается повторно: ищется то, что вернул read_many
+        with mock.patch.object(FakeBatcher, 'fake_contents', {'d.txt': b'needle\n'}):
+            found = self.search(self.make_batcher, content_regex='needle')
+        self.assertEqual(found, {'a.txt', 'sub/c.txt', 'sub/d.txt'})
+
+    def test_read_errors_fall_back_to_mmap(self):
+        failing = FakeBatcher()
+        failing.read_many = mock.Mock(side_effect=OSError)
+        self.assertEqual(self.search(lambda: failing, content_regex='needle'), {'a.txt', 'sub/c.txt'})
+        failing.read_many.assert_called()
+
+    def test_failed_chain_file_opened_again(self):
+        # Цепочка open -> read -> close не удалась для a.txt (None) - файл читается обычным путем
+        with mock.patch.object(FakeBatcher, 'fake_contents', {'a.txt': None, 'd.txt': None}):
+            found = self.search(self.make_batcher, content_regex='needle')
+        self.assertEqual(found, {'a.txt', 'sub/c.txt'})
+        self.assertIn('a.txt', self.read_names())
+
+    @unittest.skipUnless(IO_URING_AVAILABLE, 'нужен liburing')
+    def test_read_many(self):
+        paths = [os.path.join(self.root, rel_path) for rel_path in self.FILES]
+        paths.insert(1, os.path.join(self.root, 'missing.txt'))
+        sizes = [len(data) for data in self.FILES.values()]
+        sizes.insert(1, 16)
+        expected = list(self.FILES.values())
+        expected.insert(1, None)
+        with IOUringBatcher(depth=6) as uring:
+            # Связанные цепочки на прямых дескрипторах (если ядро их поддерживает)
+            # и три фазы по отдельным системным вызовам
+            linked = uring.read_many(paths, sizes)
+            uring._direct_slots = 0
+            phased = uring.read_many(paths, sizes)
+        self.assertEqual(linked, expected)
+        self.assertEqual(phased, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Тесты поиска альтернатив литералов (alt1|alt2|...): таблица PFAC, Aho–Corasick и поиск на CPU без GPU
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src import gpu_search_engine
+from src.gpu_search_engine import (GPUPatternMatcher, GPUSearchConfig, HybridSearchEngine,
+                                   build_pfac_table)
+
+
+def pfac_scan(table, final, text: bytes) -> bool:
+    """То же, что PFAC ядро, последовательно: проход по бору от каждой позиции"""
+    for pos in range(len(text)):
+        state = 0
+        for byte in text[pos:]:
+            state = table[state, byte]
+            if state < 0:
+                break
+            if final[state]:
+                return True
+    return False
+
+
+class PFACTableTest(unittest.TestCase):
+
+    def test_trie_shape(self):
+        table, final = build_pfac_table([b'he', b'she', b'his', b'hers'])
+        # Корень + h, he, her, hers, s, sh, she, hi, his
+        self.assertEqual(table.shape, (10, 256))
+        self.assertEqual(int(final.sum()), 4)
+        state = table[0, ord('h')]
+        self.assertFalse(final[state])
+        self.assertTrue(final[table[state, ord('e')]])
+        self.assertEqual(table[0, ord('e')], -1)
+
+    def test_scan_matches_substring_search(self):
+        rng = random.Random(13)
+        for _ in range(200):
+            literals = [bytes(rng.choice(b'abc') for _ in range(rng.randint(1, 4)))
+                        for _ in range(rng.randint(1, 5))]
+            text = bytes(rng.choice(b'abcd') for _ in range(rng.randint(0, 12)))
+            table, final = build_pfac_table(literals)
+            with self.subTest(literals=literals, text=text):
+                self.assertEqual(pfac_scan(table, final, text),
+                                 any(literal in text for literal in literals))
+
+
+class MultiLiteralCPUTest(unittest.TestCase):
+    """Без CUDA (или с use_gpu=False) альтернативы ищутся на CPU"""
+
+    LITERALS = [b'error', b'warning', b'fatal']
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self._tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_matcher_falls_back_to_find_any_literal(self):
+        matcher = GPUPatternMatcher(GPUSearchConfig(use_gpu=False))
+        with mock.patch.object(matcher, 'find_any_literal', wraps=matcher.find_any_literal) as cpu:
+            self.assertTrue(matcher.multi_literal_search(b'a fatal b', self.LITERALS))
+            self.assertFalse(matcher.multi_literal_search(b'all fine', self.LITERALS))
+        self.assertEqual(cpu.call_count, 2)
+        self.assertFalse(matcher.multi_literal_search(b'all fine', []))
+
+    def test_engine_searches_file_on_cpu(self):
+        engine = HybridSearchEngine(use_gpu=False)
+        engine.config.min_file_size_for_pfac = 0
+        found = self.write('found.log', b'.' * 100_000 + b'warning' + b'.' * 100)
+        missing = self.write('missing.log', b'.' * 100_000 + b'warn')
+        binary = self.write('binary.log', b'\x00fatal')
+        empty = self.write('empty.log', b'')
+        self.assertTrue(engine.multi_literal_search(found, self.LITERALS))
+        self.assertFalse(engine.multi_literal_search(missing, self.LITERALS))
+        self.assertFalse(engine.multi_literal_search(binary, self.LITERALS))
+        self.assertFalse(engine.multi_literal_search(empty, self.LITERALS))
+        self.assertFalse(engine.multi_literal_search(os.path.join(self._tmp.name, 'nope'),
+                                                     self.LITERALS))
+        self.assertEqual(engine.stats['gpu_searches'], 0)
+        self.assertEqual(engine.stats['cpu_searches'], 2)
+        self.assertEqual(engine.stats['cpu_hits'], 1)
+
+
+class AhoCorasickTest(unittest.TestCase):
+    """Без Hyperscan много литералов ищутся автоматом Aho–Corasick, без него - find"""
+
+    LITERALS = [b'alpha', b'beta', b'gamma', b'delta', 'дельта'.encode()]
+
+    def setUp(self):
+        patcher = mock.patch.object(gpu_search_engine, 'HYPERSCAN_AVAILABLE', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Маленькие окна: литералы попадают на их границы
+        self.matcher = GPUPatternMatcher(GPUSearchConfig(use_gpu=False, scan_window_size=16))
+
+    def find(self, data: bytes, literals) -> bool:
+        with mock.patch.object(self.matcher, '_ahocorasick_match',
+                               wraps=self.matcher._ahocorasick_match) as automaton:
+            found = self.matcher.find_any_literal(data, literals)
+        self.used_automaton = automaton.called
+        return found
+
+    def check_literals_at_window_boundaries(self):
+        for literal in self.LITERALS:
+            for position in range(0, 64 - len(literal)):
+                text = bytearray(b'.' * 64)
+                text[position:position + len(literal)] = literal
+                with self.subTest(literal=literal, position=position):
+                    self.assertTrue(self.find(bytes(text), self.LITERALS))
+                    text[position] = ord('.')
+                    self.assertFalse(self.find(bytes(text), self.LITERALS))
+
+    @unittest.skipUnless(gpu_search_engine.AHOCORASICK_AVAILABLE, 'нужен pyahocorasick')
+    def test_automaton_for_many_literals(self):
+        self.check_literals_at_window_boundaries()
+        self.assertTrue(self.used_automaton)
+        self.assertEqual(list(self.matcher._ac_cache), [tuple(self.LITERALS)])
+
+    @unittest.skipUnless(gpu_search_engine.AHOCORASICK_AVAILABLE, 'нужен pyahocorasick')
+    def test_few_literals_use_find(self):
+        literals = self.LITERALS[:self.matcher.config.min_literals_for_ahocorasick - 1]
+        self.assertTrue(self.find(b'..beta..', literals))
+        self.assertFalse(self.used_automaton)
+
+    def test_without_pyahocorasick_find_is_used(self):
+        with mock.patch.object(gpu_search_engine, 'AHOCORASICK_AVAILABLE', False):
+            self.check_literals_at_window_boundaries()
+        self.assertFalse(self.used_automaton)
+        self.assertTrue(self.find(b'', [b'', b'x']))
+
+
+@unittest.skipUnless(gpu_search_engine.USE_NUMBA, 'нужна Numba с доступной CUDA')
+class PFACKernelTest(unittest.TestCase):
+
+    def setUp(self):
+        # Маленькие тайлы: литералы попадают на их границы
+        self.matcher = GPUPatternMatcher(GPUSearchConfig(use_gpu=True, pfac_tile_size=4096))
+        if not self.matcher.gpu_available:
+            self.skipTest('GPU не инициализирована')
+        # Ошибка ядра не должна прятаться за поиском на CPU
+        patcher = mock.patch.object(self.matcher, 'find_any_literal',
+                                    side_effect=AssertionError('поиск ушел на CPU'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_literals_across_tile_boundaries(self):
+        literals = [b'needle', b'pin', b'haystack_end']
+        for literal in literals:
+            for position in (0, 4096 - len(literal) // 2, 10_000 - len(literal)):
+                text = bytearray(b'.' * 10_000)
+                text[position:position + len(literal)] = literal
+                with self.subTest(literal=literal, position=position):
+                    self.assertTrue(self.matcher.multi_literal_search(bytes(text), literals))
+                    text[position + len(literal) - 1] = ord('.')
+                    self.assertFalse(self.matcher.multi_literal_search(bytes(text), literals))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+"""
+Тесты таблицы результатов: окно строк в Treeview, прокрутка, фильтр и удаление выбранных строк
+"""
+
+import queue
+import unittest
+from unittest import mock
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from src import file_searcher
+from src.file_searcher import FileSearcherApp, SearchResult, SearchResults
+
+
+class FakeTree:
+    """Treeview без Tk: порядок строк, выделение и видимая часть из height строк"""
+
+    height = 20
+
+    def __init__(self):
+        self.rows = []
+        self.values = {}
+        self.selected = ()
+        self.top = 0
+
+    def insert(self, parent, index, iid=None, values=()):
+        iid = str(iid)
+        self.rows.append(iid)
+        self.values[iid] = values
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.rows.remove(str(iid))
+            del self.values[str(iid)]
+        self.selected = tuple(iid for iid in self.selected if iid in self.values)
+
+    def get_children(self, item=''):
+        return tuple(self.rows)
+
+    def index(self, iid):
+        return self.rows.index(str(iid))
+
+    def exists(self, iid):
+        return str(iid) in self.values
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iid):
+        self.selected = (str(iid),)
+
+    def focus(self, iid):
+        pass
+
+    def yview(self, *args):
+        count = len(self.rows)
+        if not count:
+            return 0.0, 1.0
+        return self.top / count, min(count, self.top + self.height) / count
+
+    def yview_moveto(self, fraction):
+        self.top = max(0, min(int(round(fraction * len(self.rows))), len(self.rows) - self.height))
+
+
+class FakeWidget:
+    """Метка / скроллбар / прогресс: запоминает последнее значение"""
+
+    def configure(self, **kwargs):
+        self.kwargs = kwargs
+
+    def set(self, *args):
+        self.args = args
+
+
+class ResultsViewTestCase(unittest.TestCase):
+    """Состояние таблицы FileSearcherApp без окна Tk"""
+
+    RENDER_WINDOW = 50
+
+    def setUp(self):
+        app = FileSearcherApp.__new__(FileSearcherApp)
+        app.RENDER_WINDOW = self.RENDER_WINDOW
+        app.results_tree = FakeTree()
+        app._scrollbar_y = FakeWidget()
+        app.results_count_label = FakeWidget()
+        app.status_label = FakeWidget()
+        app.progress_bar = FakeWidget()
+        app._results = SearchResults()
+        app._result_names = []
+        app._row_by_path = {}
+        app._visible_rows = set()
+        app._view_rows = []
+        app._window_start = 0
+        app._name_trigrams = defaultdict(set)
+        app._pending_results = queue.SimpleQueue()
+        app._pending_progress = None
+        app._last_found_name = ''
+        app._results_flush_id = None
+        app.is_searching = False
+        app._ui_exec = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(app._ui_exec.shutdown)
+        self.app = app
+
+    def add_results(self, names):
+        for index, name in enumerate(names):
+            result = SearchResult(f'/data/{index}/{name}', index, 1000.0 + index,
+                                  file_searcher.MATCH_REASONS[0])
+            self.app._search_callback(result, index + 1, len(names))
+        self.app._flush_pending_results(limit=None)
+
+    def assert_window_rendered(self):
+        """В таблице ровно окно RENDER_WINDOW строк списка, начиная с _window_start"""
+        app = self.app
+        start = app._window_start
+        expected = [str(row) for row in app._view_rows[start:start + app.RENDER_WINDOW]]
+        self.assertEqual(app.results_tree.rows, expected)
+
+
+class RenderWindowTest(ResultsViewTestCase):
+    """В Treeview только окно из RENDER_WINDOW строк, прокрутка переносит окно по списку"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_results([f'file{index}.txt' for index in range(120)])
+
+    def first_visible(self):
+        """Номер строки списка, которая видна первой"""
+        tree = self.app.results_tree
+        return int(tree.rows[tree.top])
+
+    def scroll_tree_to(self, top):
+        """Колесо мыши / клавиши: таблица сдвигается в пределах окна и сообщает yview"""
+        tree = self.app.results_tree
+        tree.top = top
+        self.app._on_tree_yscroll(*tree.yview())
+
+    def test_flush_inserts_only_window(self):
+        self.assertEqual(len(self.app._view_rows), 120)
+        self.assert_window_rendered()
+        self.assertEqual(len(self.app.results_tree.rows), self.RENDER_WINDOW)
+        # Ползунок - по положению во всем списке, а не в окне
+        self.assertEqual(self.app._scrollbar_y.args, (0, 20 / 120))
+
+    def test_render_view_clamps_start(self):
+        self.app._render_view(1000)
+        self.assertEqual(self.app._window_start, 70)
+        self.assert_window_rendered()
+        self.app._render_view(-5)
+        self.assertEqual(self.app._window_start, 0)
+        self.assert_window_rendered()
+
+    def test_render_view_keeps_selection(self):
+        tree = self.app.results_tree
+        tree.selection_set(tree.rows[30])
+        self.app._render_view(20)
+        self.assertEqual(tree.selection(), ('30',))
+        # Строка ушла из окна - выделение снимается вместе с ней
+        self.app._render_view(70)
+        self.assertEqual(tree.selection(), ())
+
+    def test_scrollbar_moveto(self):
+        self.app._on_scrollbar_y('moveto', '0.5')
+        self.assertEqual(self.app._window_start, 35)
+        self.assert_window_rendered()
+        self.assertEqual(self.first_visible(), 60)
+        self.app._on_scrollbar_y('moveto', '1.5')
+        self.assertEqual(self.app._window_start, 70)
+        self.assertEqual(int(self.app.results_tree.rows[-1]), 119)
+        self.app._on_scrollbar_y('moveto', '0')
+        self.assertEqual(self.app._window_start, 0)
+        self.assertEqual(self.first_visible(), 0)
+
+    def test_window_recentered_at_edge(self):
+        self.scroll_tree_to(28)
+        self.assertEqual(self.app._window_start, 13)
+        self.assert_window_rendered()
+        self.assertEqual(self.first_visible(), 28)
+        # Вдали от края окно не перерисовывается
+        self.scroll_tree_to(20)
+        self.assertEqual(self.app._window_start, 13)
+        self.assertEqual(self.app._scrollbar_y.args, (33 / 120, 53 / 120))
+
+    def test_end_of_list_not_recentered(self):
+        self.app._render_view(70)
+        self.scroll_tree_to(30)
+        self.assertEqual(self.app._window_start, 70)
+        self.assertEqual(self.app._scrollbar_y.args, (100 / 120, 1.0))
+
+
+class FakeEntry:
+    """Поле фильтра: только текст"""
+
+    text = ''
+
+    def get(self):
+        return self.text
+
+
+class FilterTest(ResultsViewTestCase):
+    """Фильтр по подстроке имени: кандидаты по триграммам, вычисление в потоке _ui_exec"""
+
+    NAMES = ['report.txt', 'Report_2023.pdf', 'notes.md', 'rep.log', 'preport.doc',
+             'data.csv', 'REPORT.TXT', 'image.png']
+
+    def setUp(self):
+        super().setUp()
+        app = self.app
+        app.filter_entry = FakeEntry()
+        app._filter_after_id = None
+        app._filter_generation = 0
+        app._sort_generation = 0
+        app._last_filter = ("", None, None)
+        # after из потока _ui_exec выполняется сразу
+        app.after = lambda ms, func, *args: func(*args)
+        app.after_cancel = lambda after_id: None
+        self.add_results(self.NAMES)
+
+    def apply_filter(self, text):
+        self.app.filter_entry.text = text
+        self.app._apply_filter()
+        # Колбэк фильтра выполняется в потоке _ui_exec до следующей задачи
+        self.app._ui_exec.submit(int).result()
+
+    def shown_names(self):
+        return [self.app._result_names[row] for row in self.app._view_rows]
+
+    def test_trigrams(self):
+        self.assertEqual(FileSearcherApp._trigrams('abcd'), {'abc', 'bcd'})
+        self.assertEqual(FileSearcherApp._trigrams('ab'), set())
+
+    def test_compute_filter_matches_substring_search(self):
+        names = self.app._result_names
+        rows = set(range(len(names)))
+        for text in ['', 'r', 're', 'rep', 'port', 'report.', '.txt', 'xyz', 'data.csv']:
+            with self.subTest(text=text):
+                visible, known = FileSearcherApp._compute_filter(
+                    text, rows, names, self.app._name_trigrams)
+                self.assertEqual(visible, {row for row in rows if text in names[row]})
+                self.assertEqual(known, rows)
+
+    def test_filter_hides_and_restores_rows(self):
+        self.apply_filter('Report')
+        self.assertEqual(self.shown_names(),
+                         ['report.txt', 'report_2023.pdf', 'preport.doc', 'report.txt'])
+        self.assert_window_rendered()
+        self.assertEqual(self.app.results_count_label.kwargs['text'], 'Найдено: 8 (показано: 4)')
+        self.apply_filter('')
+        self.assertEqual(sorted(self.shown_names()), sorted(name.lower() for name in self.NAMES))
+        self.assertEqual(self.app.results_count_label.kwargs['text'], 'Найдено: 8')
+
+    def test_narrowed_filter_checks_new_rows(self):
+        self.apply_filter('rep')
+        self.assertEqual(len(self.app._view_rows), 5)
+        # Строки, найденные после фильтра, видны до следующего применения
+        self.add_results(['zzz.txt', 'report_new.txt'])
+        self.assertEqual(len(self.app._view_rows), 7)
+        compute = FileSearcherApp._compute_filter
+        with mock.patch.object(FileSearcherApp, '_compute_filter', wraps=compute) as spy:
+            self.apply_filter('repo')
+        narrow = spy.call_args[0][-1]
+        self.assertIsNotNone(narrow)
+        self.assertEqual(len(narrow[0]), 5)
+        self.assertEqual(sorted(self.shown_names()),
+                         ['preport.doc', 'report.txt', 'report.txt', 'report_2023.pdf',
+                          'report_new.txt'])
+
+    def test_stale_result_ignored(self):
+        self.app.after = lambda ms, func, *args: None
+        self.apply_filter('notes')
+        self.app.after = lambda ms, func, *args: func(*args)
+        self.apply_filter('data')
+        # Результат устаревшего поколения не применяется
+        self.app._apply_filter_result(1, 'notes', ({2}, set(range(len(self.NAMES)))))
+        self.assertEqual(self.shown_names(), ['data.csv'])
+
+
+class RemoveSelectedTest(ResultsViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.add_results([f'file{index}.txt' for index in range(120)])
+
+    def remove(self, *positions):
+        """Удаляет строки таблицы по их позициям в окне, возвращает номера удаленных строк"""
+        tree = self.app.results_tree
+        tree.selected = tuple(tree.rows[position] for position in positions)
+        removed = [int(iid) for iid in tree.selected]
+        before = list(self.app._view_rows)
+        self.app._remove_selected()
+        self.assertEqual(self.app._view_rows, [row for row in before if row not in removed])
+        self.assert_window_rendered()
+        return removed
+
+    def test_following_rows_move_into_window(self):
+        removed = self.remove(0, 7, 49)
+        paths = self.app._results.paths
+        self.assertTrue(all(paths[row] not in self.app._row_by_path for row in removed))
+        self.assertFalse(set(removed) & self.app._visible_rows)
+        self.assertEqual(self.app.results_count_label.kwargs['text'], 'Найдено: 117')
+
+    def test_window_at_end_moves_back(self):
+        self.app._render_view(len(self.app._view_rows))
+        self.assertEqual(self.app._window_start, 70)
+        self.remove(10, 49)
+        self.assertEqual(self.app._window_start, 68)
+
+
+if __name__ == '__main__':
+    unittest.main()